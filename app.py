@@ -6,41 +6,40 @@ Clean architecture with separated backend modules
 import streamlit as st
 from streamlit_option_menu import option_menu
 from modules import license_checker
+from modules import profiler
 import datetime
+import importlib.util
+import os
 
 # Backend imports
 from modules.session_manager import init_session_state 
-from modules.styles import get_css
+from modules.styles import inject_styles
 
 # UI Modules Imports (New Modular Structure)
+# Only the modules every rerun needs are imported here. Tab and dialog modules
+# (and their heavy dependencies such as pandas / bs4) are imported where they
+# are first rendered, so the first page does not wait for all of them;
+# `python -m benchmarks.bench_imports` reports the import cost of each.
 from modules.ui_components import render_header
 from modules.ui_sidebar import render_sidebar
-from modules.ui_assets import render_resources_view_new, html_editor_dialog
-from modules.ui_test_data import render_test_data_tab, csv_creator_dialog
-
-# Existing Modules
-from modules.crud_generator import manager as crud_manager
-from modules.crud_generator.ui_crud import (
-    render_crud_generator_tab, render_fill_form_dialog, render_verify_detail_dialog, 
-    render_api_csv_step_dialog, render_kw_factory_import_dialog
-)
-from modules import kw_manager
-from modules.ui_keyword_factory import (
-    render_keyword_factory_tab, render_kw_factory_fill_form_dialog, 
-    render_kw_factory_verify_detail_dialog, render_kw_factory_api_csv_step_dialog
-)
-from modules.dialog_commonkw import render_add_step_dialog_base
 
-# HTML Parser Check
-try:
-    from modules.html_parser import HTMLLocatorParser
-    PARSER_AVAILABLE = True
-except ImportError:
-    PARSER_AVAILABLE = False
+# HTML Parser Check (bs4 is only looked up here, it is imported with the Assets tab)
+PARSER_AVAILABLE = importlib.util.find_spec('bs4') is not None
+
+### Rerun Profiling (toggled from the sidebar panel) ###
+PROFILE_DUMP_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+_profiling_settings = st.session_state.get('profiling_settings', {})
+profiler.begin_rerun(
+    _profiling_settings.get('enabled', False) or st.session_state.get('profiling_dump_next', False),
+    track_memory=_profiling_settings.get('track_memory', False),
+    use_cprofile=st.session_state.pop('profiling_dump_next', False)
+)
 
 ### Check License Key ###
 # รับค่า 3 ตัว: สถานะ, ข้อความ, และ วันที่หมดอายุ
-is_valid, msg, exp_date = license_checker.check_license_file()
+# (cached per process; re-verified only when license.key changes or the day rolls over)
+with profiler.section('license_check'):
+    is_valid, msg, exp_date = license_checker.get_license_status()
 
 if not is_valid:
     st.error(f"⛔ ACCESS DENIED: {msg}")
@@ -79,7 +78,9 @@ st.set_page_config(
 )
 
 # Apply styles
-st.markdown(get_css(), unsafe_allow_html=True)
+# (minified bundle, built once per process)
+with profiler.section('inject_styles'):
+    inject_styles('app')
 
 # ============================================================================
 # RENDER STUDIO TAB (Orchestrator with Original Design)
@@ -173,17 +174,22 @@ def render_studio_tab():
     except ValueError:
         st.session_state.main_studio_tab_index = 0
     
-    if selected_tab_name == "Assets":
-        render_resources_view_new()
+    with profiler.section(f"render_studio_tab.{selected_tab_name}"):
+        if selected_tab_name == "Assets":
+            from modules.ui_assets import render_resources_view_new
+            render_resources_view_new()
 
-    elif selected_tab_name == "Test Data":
-        render_test_data_tab()
+        elif selected_tab_name == "Test Data":
+            from modules.ui_test_data import render_test_data_tab
+            render_test_data_tab()
 
-    elif selected_tab_name == "Keyword Factory":
-        render_keyword_factory_tab()
+        elif selected_tab_name == "Keyword Factory":
+            from modules.ui_keyword_factory import render_keyword_factory_tab
+            render_keyword_factory_tab()
 
-    elif selected_tab_name == "CRUD Generator":
-        render_crud_generator_tab()
+        elif selected_tab_name == "CRUD Generator":
+            from modules.crud_generator.ui_crud import render_crud_generator_tab
+            render_crud_generator_tab()
 
 # ============================================================================
 # MAIN APPLICATION
@@ -191,18 +197,14 @@ def render_studio_tab():
 
 def main():
     """Main application entry point"""
-    init_session_state()
+    with profiler.section('init_session_state'):
+        init_session_state()
     
-    # Inject Bootstrap Icons
-    st.markdown(
-        '<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.css">',
-        unsafe_allow_html=True
-    )
-
     ws_state = st.session_state.studio_workspace
 
     # --- Callback Functions ---
     def add_step_to_crud(context_dict, new_step):
+        from modules.crud_generator import manager as crud_manager
         section_key = context_dict.get("key")
         if section_key:
             crud_manager.add_step(section_key, new_step)
@@ -212,6 +214,7 @@ def main():
         return not (kw_name.startswith('import datasource') or kw_name.startswith('request service'))
 
     def add_step_to_kw(context_dict, new_step):
+        from modules import kw_manager
         kw_id = context_dict.get("key")
         if kw_id:
             # Handle control flow args defaults
@@ -222,6 +225,7 @@ def main():
             kw_manager.add_step(kw_id, new_step)
 
     def kw_factory_filter(keyword):
+        from modules import kw_manager
         all_generated_kw_names = [kw['name'] for kw in kw_manager.get_all_keywords()]
         kw_name = keyword.get('name', '')
         if kw_name.lower().startswith(('import datasource', 'request service')): return False
@@ -235,98 +239,124 @@ def main():
 
 
     # --- Dialog Routing (Controller Logic) ---
+    # (the whole routing is one profiled section; a rendered dialog ends the rerun here)
+    with profiler.section('main.dialog_routing'):
     
-    # 1. CRUD Generator Dialogs
-    if st.session_state.get('show_crud_add_dialog'):
-        render_add_step_dialog_base(
-            dialog_state_key='show_crud_add_dialog',
-            context_state_key='crud_add_dialog_context',
-            selected_kw_state_key='selected_kw_crud',
-            add_step_callback=add_step_to_crud,
-            ws_state=ws_state,
-            title=f"Add New Step to CRUD Flow",
-            keyword_filter_func=crud_keyword_filter,
-            search_state_key="kw_search_dialog_crud",
-            recently_used_state_key="recently_used_keywords_crud"
-        )
-        return
-
-    elif st.session_state.get('show_api_csv_dialog'):
-        render_api_csv_step_dialog()
-        return
+        # 1. CRUD Generator Dialogs
+        if st.session_state.get('show_crud_add_dialog'):
+            from modules.dialog_commonkw import render_add_step_dialog_base
+            render_add_step_dialog_base(
+                dialog_state_key='show_crud_add_dialog',
+                context_state_key='crud_add_dialog_context',
+                selected_kw_state_key='selected_kw_crud',
+                add_step_callback=add_step_to_crud,
+                ws_state=ws_state,
+                title=f"Add New Step to CRUD Flow",
+                keyword_filter_func=crud_keyword_filter,
+                search_state_key="kw_search_dialog_crud",
+                recently_used_state_key="recently_used_keywords_crud"
+            )
+            return
+
+        elif st.session_state.get('show_api_csv_dialog'):
+            from modules.crud_generator.ui_crud import render_api_csv_step_dialog
+            render_api_csv_step_dialog()
+            return
         
-    elif st.session_state.get('show_fill_form_dialog'):
-        render_fill_form_dialog()
-        return
+        elif st.session_state.get('show_fill_form_dialog'):
+            from modules.crud_generator.ui_crud import render_fill_form_dialog
+            render_fill_form_dialog()
+            return
         
-    elif st.session_state.get('show_verify_detail_dialog'):
-        render_verify_detail_dialog()
-        return
-
-    elif st.session_state.get('show_kw_factory_dialog'):
-        render_kw_factory_import_dialog()
-        return
-
-    # 2. Keyword Factory Dialogs
-    elif st.session_state.get('show_kw_factory_add_dialog'):
-        render_add_step_dialog_base(
-            dialog_state_key='show_kw_factory_add_dialog',
-            context_state_key='kw_factory_add_dialog_context',
-            selected_kw_state_key='selected_kw_kw_factory',
-            add_step_callback=add_step_to_kw,
-            ws_state=ws_state,
-            title=f"Add Step to Keyword",
-            keyword_filter_func=kw_factory_filter,
-            search_state_key="kw_search_dialog_kw_factory",
-            recently_used_state_key="recently_used_keywords_kw_factory",
-        )
-        return
+        elif st.session_state.get('show_verify_detail_dialog'):
+            from modules.crud_generator.ui_crud import render_verify_detail_dialog
+            render_verify_detail_dialog()
+            return
+
+        elif st.session_state.get('show_kw_factory_dialog'):
+            from modules.crud_generator.ui_crud import render_kw_factory_import_dialog
+            render_kw_factory_import_dialog()
+            return
+
+        # 2. Keyword Factory Dialogs
+        elif st.session_state.get('show_kw_factory_add_dialog'):
+            from modules.dialog_commonkw import render_add_step_dialog_base
+            render_add_step_dialog_base(
+                dialog_state_key='show_kw_factory_add_dialog',
+                context_state_key='kw_factory_add_dialog_context',
+                selected_kw_state_key='selected_kw_kw_factory',
+                add_step_callback=add_step_to_kw,
+                ws_state=ws_state,
+                title=f"Add Step to Keyword",
+                keyword_filter_func=kw_factory_filter,
+                search_state_key="kw_search_dialog_kw_factory",
+                recently_used_state_key="recently_used_keywords_kw_factory",
+            )
+            return
         
-    elif st.session_state.get('show_kw_factory_fill_form_dialog'):
-        render_kw_factory_fill_form_dialog()
-        return
+        elif st.session_state.get('show_kw_factory_fill_form_dialog'):
+            from modules.ui_keyword_factory import render_kw_factory_fill_form_dialog
+            render_kw_factory_fill_form_dialog()
+            return
         
-    elif st.session_state.get('show_kw_factory_verify_dialog'):
-        render_kw_factory_verify_detail_dialog()
-        return
+        elif st.session_state.get('show_kw_factory_verify_dialog'):
+            from modules.ui_keyword_factory import render_kw_factory_verify_detail_dialog
+            render_kw_factory_verify_detail_dialog()
+            return
         
-    elif st.session_state.get('show_kw_factory_api_csv_dialog'):
-        render_kw_factory_api_csv_step_dialog()
-        return
-
-    # 3. Test Flow / Timeline Dialogs (Future Use)
-    elif st.session_state.get('show_add_dialog'):
-        render_add_step_dialog_base(
-            dialog_state_key='show_add_dialog',
-            context_state_key='add_dialog_timeline',
-            selected_kw_state_key='selected_kw',
-            add_step_callback=add_step_to_timeline,
-            ws_state=ws_state,
-            title=f"Add New Step to Timeline",
-            search_state_key="kw_search_dialog_testflow",
-            recently_used_state_key="recently_used_keywords"
-        )
-        return
-
-    # 4. CSV Creator Dialog (Global)
-    elif ws_state.get('show_csv_creator'):
-        csv_creator_dialog()
-        return
+        elif st.session_state.get('show_kw_factory_api_csv_dialog'):
+            from modules.ui_keyword_factory import render_kw_factory_api_csv_step_dialog
+            render_kw_factory_api_csv_step_dialog()
+            return
+
+        # 3. Test Flow / Timeline Dialogs (Future Use)
+        elif st.session_state.get('show_add_dialog'):
+            from modules.dialog_commonkw import render_add_step_dialog_base
+            render_add_step_dialog_base(
+                dialog_state_key='show_add_dialog',
+                context_state_key='add_dialog_timeline',
+                selected_kw_state_key='selected_kw',
+                add_step_callback=add_step_to_timeline,
+                ws_state=ws_state,
+                title=f"Add New Step to Timeline",
+                search_state_key="kw_search_dialog_testflow",
+                recently_used_state_key="recently_used_keywords"
+            )
+            return
+
+        # 4. CSV Creator Dialog (Global)
+        elif ws_state.get('show_csv_creator'):
+            from modules.ui_test_data import csv_creator_dialog
+            csv_creator_dialog()
+            return
     
-    # 5. HTML Editor Dialog (Modal Check)
-    if ws_state.get('editing_html_index') is not None:
-        if ws_state['editing_html_index'] < len(ws_state['html_pages']):
-            html_editor_dialog()
+        # 5. HTML Editor Dialog (Modal Check)
+        if ws_state.get('editing_html_index') is not None:
+            if ws_state['editing_html_index'] < len(ws_state['html_pages']):
+                from modules.ui_assets import html_editor_dialog
+                html_editor_dialog()
 
     # --- Main Render Sequence ---
-    render_sidebar()
-    render_header()
+    with profiler.section('render_sidebar'):
+        render_sidebar()
+    with profiler.section('render_header'):
+        render_header()
     
     if not PARSER_AVAILABLE:
         st.error("HTML Parser module not available. Please check installation.")
         return
 
-    render_studio_tab()
+    with profiler.section('render_studio_tab'):
+        render_studio_tab()
+
+def _finish_rerun_profile():
+    report = profiler.end_rerun(dump_dir=PROFILE_DUMP_DIR)
+    if report is not None:
+        st.session_state.profiling_last_report = report
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        # Also runs when the rerun ends early (st.rerun / st.stop)
+        _finish_rerun_profile()
\ No newline at end of file
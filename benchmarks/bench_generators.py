@@ -0,0 +1,244 @@
+"""
+Script Generation Benchmarks
+Measures how the Robot Framework generators scale with workspace size.
+
+Generators covered:
+    - crud_generator.engine.generate_robot_script      (CRUD Generator)
+    - kw_manager.format_keyword_script                 (Keyword Factory)
+    - test_flow_manager.generate_robot_script_from_timeline (Test Flow)
+    - utils.format_robot_step_line                     (single-step formatter)
+
+Usage:
+    python -m benchmarks.bench_generators
+    python -m benchmarks.bench_generators --sizes 10 100 1000 --columns 50
+    python -m benchmarks.bench_generators --output report.json --compare previous.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from modules.crud_generator import engine as crud_engine
+from modules import kw_manager, test_flow_manager
+from modules.utils import format_robot_step_line
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_COLUMNS = 40
+
+# ===================================================================
+# ===== 1. Synthetic Workspaces
+# ===================================================================
+
+def _make_step(i, columns):
+    """Cycles through the step shapes the generators special-case."""
+    kind = i % 5
+    if kind == 0:
+        return {'id': f's{i}', 'keyword': 'Fill in data form', 'args': {
+            'locator_field': f'LOCATOR_FIELD_{i}_INPUT', 'value': f'${{value_{i}}}',
+            'sel_attr': 'label', 'is_checkboxtype': False, 'is_antdesign': i % 2 == 0,
+            'is_switchtype': False, 'locator_switch_checked': '${EMPTY}'}}
+    if kind == 1:
+        return {'id': f's{i}', 'keyword': 'Verify data form', 'args': {
+            'locator_field': f'LOCATOR_FIELD_{i}_INPUT', 'assertion': 'should be',
+            'exp_value': f'${{expected_{i}}}', 'ignorcase': True}}
+    if kind == 2:
+        return {'id': f's{i}', 'keyword': 'Verify Result of data table', 'args': {
+            'locator_thead': 'LOCATOR_TABLE_THEAD', 'locator_tbody': 'LOCATOR_TABLE_TBODY',
+            'rowdata': '1', 'ignorcase': False,
+            'assertion_columns': [
+                {'header_name': f'Column {c}', 'expected_value': f'${{col_{c}}}' if c % 3 else ''}
+                for c in range(columns)
+            ]}}
+    if kind == 3:
+        return {'id': f's{i}', 'keyword': 'Click button on page', 'args': {
+            'button_name': f'Save {i}', 'locator_button': f'LOCATOR_BTN_{i}', 'timeout': '10s'}}
+    return {'id': f's{i}', 'keyword': 'Go to SUBMENU name', 'args': {
+        'main_menu': '${mainmenu}[setting]', 'submenu': f'${{submenu}}[item_{i}]'}}
+
+def make_steps(count, columns=DEFAULT_COLUMNS):
+    return [_make_step(i, columns) for i in range(count)]
+
+def make_crud_workspace(count, columns=DEFAULT_COLUMNS):
+    steps = make_steps(count, columns)
+    sections = crud_engine.TEST_CASE_SECTIONS
+    ws_steps = {key: [] for key in sections + ['suite_setup', 'test_setup', 'test_teardown', 'suite_teardown']}
+    for i, step in enumerate(steps):
+        ws_steps[sections[i % len(sections)]].append(step)
+    ws_steps['suite_setup'] = make_steps(2, columns)
+    ws_steps['test_teardown'] = make_steps(1, columns)
+    return {'test_case_name': f'TC_Benchmark_{count}', 'tags': ['Benchmark'], 'steps': ws_steps}
+
+def make_factory_keyword(count, columns=DEFAULT_COLUMNS):
+    """Keyword with nested IF blocks every 20 steps plus output variables."""
+    steps = []
+    for i, step in enumerate(make_steps(count, columns)):
+        if i % 20 == 0:
+            steps.append({'id': f'if{i}', 'keyword': 'IF Condition', 'args': {'condition': f'${{flag_{i}}}'}})
+        if i % 7 == 0:
+            step['output_variable'] = {'enabled': True, 'name': f'out_{i}', 'scope': 'test',
+                                       'value_source': "API Response JSON Path", 'source_detail': f'data.items[{i}].id'}
+        steps.append(step)
+        if i % 20 == 19:
+            steps.append({'id': f'end{i}', 'keyword': 'END', 'args': {}})
+    return {
+        'id': 'bench', 'name': f'Benchmark Keyword {count}', 'doc': 'Synthetic benchmark keyword.',
+        'args': [{'name': f'${{value_{i}}}', 'default': ''} for i in range(0, min(count, 200), 5)],
+        'steps': steps, 'tags': ['Generated']
+    }
+
+def make_timeline_state(count, columns=DEFAULT_COLUMNS):
+    steps = make_steps(count, columns)
+    locators = [{'name': f'LOCATOR_FIELD_{i}_INPUT', 'value': f'xpath=//input[@id="f{i}"]'} for i in range(count)]
+    return {
+        'keywords': [{'name': 'Fill in data form'}], 'locators': locators,
+        'suite_setup': make_steps(2, columns), 'timeline': steps, 'suite_teardown': make_steps(1, columns)
+    }
+
+# ===================================================================
+# ===== 2. Generator Cases
+# ===================================================================
+
+def _case_crud(count, columns):
+    ws = make_crud_workspace(count, columns)
+    assets = crud_engine.build_asset_snapshot()
+    return lambda: crud_engine.generate_robot_script(ws, assets)
+
+def _case_keyword(count, columns):
+    kw = make_factory_keyword(count, columns)
+    return lambda: kw_manager.format_keyword_script(kw)
+
+def _case_timeline(count, columns):
+    ws_state = make_timeline_state(count, columns)
+    return lambda: test_flow_manager.generate_robot_script_from_timeline(ws_state)
+
+def _case_step_line(count, columns):
+    steps = make_steps(count, columns)
+    return lambda: [format_robot_step_line(step) for step in steps]
+
+GENERATORS = {
+    'crud.generate_robot_script': _case_crud,
+    'kw_manager.generate_robot_script_for_keyword': _case_keyword,
+    'test_flow_manager.generate_robot_script_from_timeline': _case_timeline,
+    'utils.format_robot_step_line': _case_step_line,
+}
+
+# ===================================================================
+# ===== 3. Measurement
+# ===================================================================
+
+def measure(func, repeat=3):
+    """
+    Returns (best wall time in seconds, peak traced memory in bytes).
+    Timing runs are done without tracemalloc so its overhead does not skew them.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(timings), peak
+
+def run_benchmarks(sizes=None, columns=DEFAULT_COLUMNS, generators=None, repeat=3):
+    sizes = sizes or DEFAULT_SIZES
+    results = []
+    for name, case in GENERATORS.items():
+        if generators and name not in generators:
+            continue
+        for count in sizes:
+            func = case(count, columns)
+            # Larger workspaces are measured once to keep the suite bounded
+            seconds, peak = measure(func, repeat=repeat if count < 10000 else 1)
+            results.append({'generator': name, 'steps': count, 'columns': columns,
+                            'seconds': round(seconds, 6), 'peak_kb': round(peak / 1024, 1)})
+            print(f"  {name:<56} {count:>6} steps  {seconds * 1000:>10.2f} ms  {peak / 1024:>10.1f} KB")
+    return results
+
+def _git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def build_report(results):
+    return {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'revision': _git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'results': results,
+    }
+
+# ===================================================================
+# ===== 4. Comparison Report
+# ===================================================================
+
+def compare_reports(baseline, current):
+    """Returns a Markdown table comparing two reports (ratios are current / baseline)."""
+    base_map = {(r['generator'], r['steps']): r for r in baseline.get('results', [])}
+    lines = [
+        f"Baseline: {baseline.get('meta', {}).get('revision') or '?'}  ->  "
+        f"Current: {current.get('meta', {}).get('revision') or '?'}",
+        "",
+        "| Generator | Steps | Time (ms) | Base (ms) | Time x | Peak (KB) | Base (KB) | Mem x |",
+        "|---|---:|---:|---:|---:|---:|---:|---:|",
+    ]
+    for r in current.get('results', []):
+        b = base_map.get((r['generator'], r['steps']))
+        if not b:
+            lines.append(f"| {r['generator']} | {r['steps']} | {r['seconds'] * 1000:.2f} | - | - | {r['peak_kb']:.1f} | - | - |")
+            continue
+        time_ratio = r['seconds'] / b['seconds'] if b['seconds'] else 0
+        mem_ratio = r['peak_kb'] / b['peak_kb'] if b['peak_kb'] else 0
+        lines.append(
+            f"| {r['generator']} | {r['steps']} | {r['seconds'] * 1000:.2f} | {b['seconds'] * 1000:.2f} | "
+            f"{time_ratio:.2f} | {r['peak_kb']:.1f} | {b['peak_kb']:.1f} | {mem_ratio:.2f} |"
+        )
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Robot Framework script generators.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="Step counts to generate")
+    parser.add_argument('--columns', type=int, default=DEFAULT_COLUMNS,
+                        help="Column assertions per 'Verify Result of data table' step")
+    parser.add_argument('--generator', action='append', choices=list(GENERATORS), help="Only run these generators")
+    parser.add_argument('--repeat', type=int, default=3, help="Timing repeats (best is kept)")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    print(f"Running generator benchmarks (columns={args.columns})")
+    report = build_report(run_benchmarks(args.sizes, args.columns, args.generator, args.repeat))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        print(compare_reports(baseline, report))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Import-Time Benchmarks
+Measures the cold import cost of the app's startup path and of each tab/dialog
+module, every case in a fresh interpreter with `python -X importtime`.
+
+Cases covered:
+    - app.startup          modules app.py imports at top level (first page)
+    - tab.*                modules imported when a tab is first opened
+    - dialog.*             modules imported when a dialog is first opened
+    - streamlit            the framework itself, as a floor for the cases above
+
+Usage:
+    python -m benchmarks.bench_imports
+    python -m benchmarks.bench_imports --case app.startup --repeat 5
+    python -m benchmarks.bench_imports --output imports.json --compare previous.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from benchmarks.bench_generators import build_report
+
+IMPORT_CASES = {
+    'streamlit': ['streamlit'],
+    'app.startup': ['modules.session_manager', 'modules.styles', 'modules.ui_components', 'modules.ui_sidebar'],
+    'tab.assets': ['modules.ui_assets'],
+    'tab.test_data': ['modules.ui_test_data'],
+    'tab.keyword_factory': ['modules.ui_keyword_factory'],
+    'tab.crud_generator': ['modules.crud_generator.ui_crud'],
+    'dialog.add_step': ['modules.dialog_commonkw'],
+}
+
+# Dependencies whose presence on a path is worth calling out
+HEAVY_PACKAGES = ('pandas', 'numpy', 'bs4', 'streamlit_sortables', 'msgpack')
+
+TOP_IMPORTS = 5
+
+# Prefix of the child's stdout line listing the loaded HEAVY_PACKAGES (modules may print too)
+_HEAVY_MARKER = 'heavy-packages:'
+
+# ===================================================================
+# ===== 1. Measurement
+# ===================================================================
+
+def parse_importtime(stderr):
+    """Parses `-X importtime` output into (name, self_us, cumulative_us, depth) tuples."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+def _importtime(code):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT_DIR,
+                          capture_output=True, text=True)
+    return proc.returncode, proc.stdout, proc.stderr
+
+def interpreter_modules():
+    """Modules every interpreter imports before running code (excluded from the cases)."""
+    return {row[0] for row in parse_importtime(_importtime('pass')[2])}
+
+def measure_case(modules, preloaded=frozenset()):
+    """
+    Imports `modules` in a fresh interpreter.
+
+    Returns:
+        dict: total_ms (sum of the top-level imports), top (heaviest imports one
+              level below the case modules), heavy (HEAVY_PACKAGES that got imported), or error.
+    """
+    # -X importtime also logs failed attempts (optional dependencies that are not
+    # installed), so the child reports what actually ended up in sys.modules
+    code = '; '.join(f'import {name}' for name in modules)
+    code += f"; import sys; print({_HEAVY_MARKER!r}, *(n for n in {HEAVY_PACKAGES!r} if n in sys.modules))"
+    returncode, stdout, stderr = _importtime(code)
+    if returncode != 0:
+        return {'error': stderr.strip().splitlines()[-1] if stderr.strip() else 'import failed'}
+    rows = [row for row in parse_importtime(stderr) if row[0] not in preloaded]
+    children = [row for row in rows if row[3] == 1 or (row[3] == 0 and row[0] not in modules)]
+    return {
+        'total_ms': round(sum(row[2] for row in rows if row[3] == 0) / 1000, 2),
+        'top': [{'module': name, 'ms': round(cumulative / 1000, 2)}
+                for name, _, cumulative, _ in sorted(children, key=lambda row: row[2], reverse=True)[:TOP_IMPORTS]],
+        'heavy': next((line.split()[1:] for line in reversed(stdout.splitlines())
+                       if line.startswith(_HEAVY_MARKER)), []),
+    }
+
+def run_benchmarks(cases=None, repeat=3):
+    results = []
+    preloaded = interpreter_modules()
+    for name, modules in IMPORT_CASES.items():
+        if cases and name not in cases:
+            continue
+        runs = [measure_case(modules, preloaded) for _ in range(repeat)]
+        failed = next((run for run in runs if 'error' in run), None)
+        if failed:
+            results.append({'case': name, 'modules': modules, 'error': failed['error']})
+            print(f"  {name:<24} ERROR  {failed['error']}")
+            continue
+        best = min(runs, key=lambda run: run['total_ms'])
+        results.append({'case': name, 'modules': modules, 'seconds': round(best['total_ms'] / 1000, 6),
+                        'top': best['top'], 'heavy': best['heavy']})
+        heavy = ', '.join(best['heavy']) or '-'
+        print(f"  {name:<24} {best['total_ms']:>10.2f} ms   heavy: {heavy}")
+        for entry in best['top']:
+            print(f"      {entry['module']:<40} {entry['ms']:>10.2f} ms")
+    return results
+
+# ===================================================================
+# ===== 2. Comparison Report
+# ===================================================================
+
+def compare_reports(baseline, current):
+    """Returns a Markdown table comparing two reports (ratios are current / baseline)."""
+    base_map = {r['case']: r for r in baseline.get('results', []) if 'seconds' in r}
+    lines = [
+        f"Baseline: {baseline.get('meta', {}).get('revision') or '?'}  ->  "
+        f"Current: {current.get('meta', {}).get('revision') or '?'}",
+        "",
+        "| Case | Import (ms) | Base (ms) | Time x | Heavy packages |",
+        "|---|---:|---:|---:|---|",
+    ]
+    for r in current.get('results', []):
+        if 'seconds' not in r:
+            lines.append(f"| {r['case']} | error | - | - | - |")
+            continue
+        heavy = ', '.join(r['heavy']) or '-'
+        b = base_map.get(r['case'])
+        if not b:
+            lines.append(f"| {r['case']} | {r['seconds'] * 1000:.2f} | - | - | {heavy} |")
+            continue
+        time_ratio = r['seconds'] / b['seconds'] if b['seconds'] else 0
+        lines.append(f"| {r['case']} | {r['seconds'] * 1000:.2f} | {b['seconds'] * 1000:.2f} | {time_ratio:.2f} | {heavy} |")
+    return "\n".join(lines)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cold import times of the app's modules.")
+    parser.add_argument('--case', action='append', choices=list(IMPORT_CASES), help="Only run these cases")
+    parser.add_argument('--repeat', type=int, default=3, help="Fresh-interpreter runs per case (best is kept)")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    print("Running import-time benchmarks")
+    report = build_report(run_benchmarks(args.case, args.repeat))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print()
+        print(compare_reports(baseline, report))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
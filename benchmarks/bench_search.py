@@ -0,0 +1,86 @@
+"""
+Keyword Search Benchmarks
+Times KeywordSearchIndex queries on a synthetic keyword library and checks that the
+unlimited results still contain every keyword the plain name substring filter finds.
+
+Usage:
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --keywords 5000 --query "click" --query "a f"
+"""
+import argparse
+import random
+import sys
+import os
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from modules.keyword_categorizer import KeywordSearchIndex
+
+DEFAULT_KEYWORDS = 2000
+DEFAULT_QUERIES = ['e', 'll', 'ta', 'a f', 'click', 'verify data', 'fil in', 'timeout', 'xyzzy']
+
+_VERBS = ['Click', 'Fill', 'Verify', 'Select', 'Open', 'Close', 'Wait For', 'Upload', 'Go To', 'Get']
+_OBJECTS = ['Button', 'Data Form', 'Table Row', 'Modal', 'Menu', 'Tab', 'File', 'Alert', 'Field', 'Value']
+_SUFFIXES = ['', 'On Page', 'If Visible', 'By Label', 'And Save', 'In Table', 'All']
+_ARGS = ['locator', 'value', 'timeout', 'button_name', 'row', 'expected', 'file_path', 'menu']
+
+# ===================================================================
+# ===== 1. Synthetic Library
+# ===================================================================
+
+def make_keywords(count, seed=1):
+    rng = random.Random(seed)
+    keywords = []
+    for i in range(count):
+        name = " ".join(part for part in (rng.choice(_VERBS), rng.choice(_OBJECTS), rng.choice(_SUFFIXES)) if part)
+        keywords.append({
+            'name': f"{name} {i}",
+            'args': [{'name': f"${{{arg}}}", 'default': ''} for arg in rng.sample(_ARGS, 3)],
+            'doc': f"{name} using the given {rng.choice(_ARGS)}.",
+        })
+    return keywords
+
+# ===================================================================
+# ===== 2. Measurement
+# ===================================================================
+
+def substring_matches(keywords, query):
+    """The plain name filter the index replaced (every hit must stay findable)."""
+    query = query.strip().lower()
+    return [kw for kw in keywords if query in kw['name'].lower()]
+
+def run(keyword_count, queries):
+    keywords = make_keywords(keyword_count)
+    start = time.perf_counter()
+    index = KeywordSearchIndex(keywords)
+    print(f"Index of {keyword_count} keywords built in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    failures = 0
+    for query in queries:
+        start = time.perf_counter()
+        limited = index.search(query)
+        limited_ms = (time.perf_counter() - start) * 1000
+        found = {id(kw) for kw in index.search(query, limit=None)}
+        expected = substring_matches(keywords, query)
+        missing = [kw['name'] for kw in expected if id(kw) not in found]
+        status = "ok" if not missing else f"MISSING {len(missing)} (e.g. {missing[0]!r})"
+        print(f"  {query!r:<16} {limited_ms:>8.2f} ms  {len(found):>6} found  {len(expected):>6} substring  {status}")
+        failures += bool(missing)
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark and check the keyword search index.")
+    parser.add_argument('--keywords', type=int, default=DEFAULT_KEYWORDS, help="Synthetic library size")
+    parser.add_argument('--query', action='append', help="Queries to run (default: a built-in mix)")
+    args = parser.parse_args(argv)
+    failures = run(args.keywords, args.query or DEFAULT_QUERIES)
+    if failures:
+        print(f"{failures} queries lost substring matches")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# modules/argument_presets.py
+"""
+Argument Preset Registry
+Process-wide registry of assets/argument_presets.json, shared by every argument
+renderer. Presets match an argument name exactly; patterns match when their key
+occurs in the lower-cased name. Each name is resolved once into an ArgumentSpec
+and the lookup is rebuilt only when the JSON file changes.
+This module should NOT import streamlit.
+"""
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+DEFAULT_PRESET_PATH = Path(__file__).parent.parent / "assets" / "argument_presets.json"
+
+# Seconds between checks of the JSON file's mtime (the check is a stat call)
+RELOAD_CHECK_INTERVAL = 1.0
+
+# Presets the app adds on top of the JSON file
+BUILTIN_PRESETS = {
+    'button_name': {
+        "type": "select_or_input",
+        "options": ["OK", "Yes", "No", "Cancel", "Save", "Confirm", "Close", "Submit", "Back", "Next"],
+        "label": "🔘 Button Name (Text)",
+        "placeholder": "Enter button text (e.g., OK)"
+    },
+}
+
+# kind is 'preset' or 'pattern'; key is the preset name or the matched pattern key
+ArgumentSpec = namedtuple('ArgumentSpec', ['kind', 'key', 'config'])
+
+
+class PresetRegistry:
+    """
+    Presets / patterns of one JSON file with a memoized name -> ArgumentSpec lookup.
+
+    version is bumped on every (re)load; error is None, 'missing' or 'invalid'.
+    """
+
+    def __init__(self, path=DEFAULT_PRESET_PATH):
+        self.path = path
+        self.presets = {}
+        self.patterns = {}
+        self.error = None
+        self.version = 0
+        self._file_stamp = None
+        self._checked_at = None
+        self._pattern_keys = ()
+        self._specs = {}
+        self._lock = threading.Lock()
+
+    # --- Loading ---
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def refresh(self, force=False):
+        """Reloads the JSON file if it changed (checked at most every RELOAD_CHECK_INTERVAL)."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return self
+        self._checked_at = now
+        stamp = self._stat()
+        if force or self.version == 0 or stamp != self._file_stamp:
+            with self._lock:
+                self._load(stamp)
+        return self
+
+    def _load(self, stamp):
+        presets, patterns, error = {}, {}, None
+        if stamp is None:
+            error = 'missing'
+        else:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                presets, patterns = data.get('presets', {}), data.get('patterns', {})
+            except (OSError, json.JSONDecodeError, AttributeError):
+                error = 'invalid'
+        self.presets = {**presets, **BUILTIN_PRESETS}
+        self.patterns = patterns
+        self._pattern_keys = tuple(patterns.items())
+        self._specs = {}
+        self.error = error
+        self._file_stamp = stamp
+        self.version += 1
+
+    # --- Lookups ---
+    def resolve(self, arg_name):
+        """ArgumentSpec for an argument name, or None when it renders as plain text."""
+        specs = self._specs
+        if arg_name in specs:
+            return specs[arg_name]
+        spec = None
+        if arg_name in self.presets:
+            spec = ArgumentSpec('preset', arg_name, self.presets[arg_name])
+        else:
+            name_lower = arg_name.lower()
+            # First pattern (in file order) whose key occurs in the name
+            for pattern_key, config in self._pattern_keys:
+                if pattern_key in name_lower:
+                    spec = ArgumentSpec('pattern', pattern_key, config)
+                    break
+        specs[arg_name] = spec
+        return spec
+
+    def preset(self, arg_name):
+        """Preset config for an exact argument name (None if there is none)."""
+        return self.presets.get(arg_name)
+
+    def is_preset(self, arg_name):
+        return arg_name in self.presets
+
+
+PRESET_REGISTRY = PresetRegistry()
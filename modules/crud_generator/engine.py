@@ -0,0 +1,416 @@
+"""
+CRUD Generator Engine
+Pure script-generation logic for the CRUD Generator tab.
+Takes an explicit workspace dict and asset snapshot, so it can run outside a
+Streamlit rerun (workers, benchmarks, profiling).
+This module should NOT import streamlit.
+"""
+import re
+from ..profiler import profiled
+from ..utils import util_get_csv_headers, util_iter_csv_rows, get_clean_locator_name, build_table_assertion_args
+
+# ===================================================================
+# ===== 1. Asset Snapshot =====
+# ===================================================================
+
+def build_asset_snapshot(keywords=None, locators=None, factory_keywords=None, project_path='',
+                         factory_keyword_map=None):
+    """
+    Builds an immutable-by-convention snapshot of everything the generator reads.
+
+    Args:
+        keywords (list): Common keywords (studio_workspace['keywords'])
+        locators (list): Locators (studio_workspace['locators'])
+        factory_keywords (list): Keyword Factory keywords (from the shared keyword registry)
+        project_path (str): Project root, used for CSV header lookups
+        factory_keyword_map (Mapping): Prebuilt name -> keyword map for factory_keywords
+
+    Returns:
+        dict: Snapshot with lists plus a name -> keyword map for factory keywords
+    """
+    keywords = list(keywords or [])
+    factory_keywords = list(factory_keywords or [])
+    return {
+        'keywords': keywords,
+        'locators': list(locators or []),
+        'factory_keywords': factory_keywords,
+        'factory_keyword_map': factory_keyword_map if factory_keyword_map is not None
+                               else {kw['name']: kw for kw in factory_keywords},
+        'project_path': project_path or '',
+    }
+
+def _is_true(value):
+    """Helper to check boolean values from string or bool"""
+    if isinstance(value, str):
+        return value.lower() in ('true', 'yes', 'on', '1')
+    return bool(value)
+
+def get_csv_headers(assets, csv_filename):
+    project_path = assets.get('project_path', '')
+    if not project_path:
+        return []
+    return util_get_csv_headers(project_path, csv_filename)
+
+def resolve_arg_name(assets, keyword_name, internal_name, default_name):
+    all_kws = assets.get('keywords', []) + assets.get('factory_keywords', [])
+    target_kw = next((k for k in all_kws if k['name'] == keyword_name), None)
+    if not target_kw: return default_name
+    defined_args = []
+    if target_kw.get('args'):
+        for arg in target_kw['args']:
+            name = arg.get('name', '')
+            clean = name.replace('${', '').replace('}', '').replace('@{', '').replace('&{', '')
+            defined_args.append(clean.lower())
+    if internal_name.lower() in defined_args: return internal_name
+    return default_name
+
+# ===================================================================
+# ===== 2. Argument & Step Formatting =====
+# ===================================================================
+
+def _format_locator_arg(arg_name, locator_obj, required=False):
+    """Formats a locator argument given as a locator dict or a plain name."""
+    if isinstance(locator_obj, dict) and locator_obj.get('name'):
+        return f"{arg_name}=${{{get_clean_locator_name(locator_obj['name'])}}}"
+    if isinstance(locator_obj, str) and locator_obj.strip():
+        return f"{arg_name}=${{{get_clean_locator_name(locator_obj)}}}"
+    return f"{arg_name}=${{EMPTY}}" if required else None
+
+def format_arguments_for_script(keyword, args, assets):
+    """
+    แปลง dict ของ arguments เป็น list ของ string ที่พร้อมใช้งาน
+    (Strict mapping to commonkeywords)
+    """
+    args_list = []
+
+    # ✅ Keyword: Fill in data form
+    if keyword.lower() == 'fill in data form':
+        # 1. locator_field
+        args_list.append(_format_locator_arg('locator_field', args.get('locator_field'), required=True))
+
+        # 2. value
+        val = args.get('value', '')
+        args_list.append(f"value={val if val else '${EMPTY}'}")
+
+        # 3. sel_attr
+        sel_attr = args.get('select_attribute') or args.get('sel_attr') or 'label'
+        args_list.append(f"sel_attr={sel_attr}")
+
+        # 4. is_checkboxtype
+        if _is_true(args.get('is_checkbox_type') or args.get('is_checkboxtype')):
+            args_list.append(f"is_checkboxtype=${{True}}")
+
+        # 5. is_antdesign
+        if _is_true(args.get('is_ant_design') or args.get('is_antdesign')):
+            args_list.append(f"is_antdesign=${{True}}")
+
+        # 6. is_switchtype
+        if _is_true(args.get('is_switch_type') or args.get('is_switchtype')):
+            args_list.append(f"is_switchtype=${{True}}")
+            # 7. locator_switch_checked
+            switch_arg = _format_locator_arg('locator_switch_checked', args.get('locator_switch_checked'))
+            if switch_arg:
+                args_list.append(switch_arg)
+
+        return args_list
+
+    # ✅ Keyword: Verify data form
+    if keyword.lower() == 'verify data form':
+        # 1. locator_field
+        args_list.append(_format_locator_arg('locator_field', args.get('locator_field'), required=True))
+
+        # 2. assertion
+        assertion = args.get('assertion', 'should be')
+        args_list.append(f"assertion={assertion}")
+
+        # 3. exp_value
+        expected_val = args.get('expected_value') or args.get('exp_value') or ''
+        args_list.append(f"exp_value={expected_val if expected_val else '${EMPTY}'}")
+
+        # 4. sel_attr
+        sel_attr = args.get('select_attribute') or args.get('sel_attr')
+        if sel_attr and sel_attr != 'label':
+            args_list.append(f"sel_attr={sel_attr}")
+
+        # 5. ignorcase
+        if _is_true(args.get('ignore_case') or args.get('ignorcase')):
+            args_list.append(f"ignorcase=${{True}}")
+
+        # 6. antdesign
+        if _is_true(args.get('is_ant_design') or args.get('antdesign')):
+            args_list.append(f"antdesign=${{True}}")
+
+        # 7. is_switchtype
+        if _is_true(args.get('is_switch_type') or args.get('is_switchtype')):
+            args_list.append(f"is_switchtype=${{True}}")
+            # 8. locator_switch_checked
+            switch_arg = _format_locator_arg('locator_switch_checked', args.get('locator_switch_checked'))
+            if switch_arg:
+                args_list.append(switch_arg)
+
+        return args_list
+
+    # --- Logic สำหรับ 'Verify Result of data table' ---
+    if keyword == 'Verify Result of data table':
+        if args.get('locator_thead'): args_list.append(f"locator_thead=${{{args['locator_thead']}}}")
+        if args.get('locator_tbody'): args_list.append(f"locator_tbody=${{{args['locator_tbody']}}}")
+        if args.get('rowdata'): args_list.append(f"rowdata={args['rowdata']}")
+
+        if _is_true(args.get('ignore_case') or args.get('ignorcase')):
+            args_list.append(f"ignorcase=${{True}}")
+        else:
+            args_list.append(f"ignorcase=${{False}}")
+
+        args_list.extend(build_table_assertion_args(args.get('assertion_columns', [])))
+        return args_list
+
+    if keyword == 'Go to MENU name':
+        val = args.get('name') or args.get('menu_name') or args.get('locator') or args.get('main_menu')
+        if not val and args: val = next((v for v in args.values() if v), '')
+        return [f"${{mainmenu}}[{val}]"]
+
+    if keyword == 'Go to SUBMENU name':
+        main_val = args.get('main_menu') or args.get('menu_name')
+        sub_val = args.get('submenu') or args.get('submenu_name') or args.get('name')
+        if main_val is None: main_val = ''
+        if sub_val is None: sub_val = ''
+        return [f"${{mainmenu}}[{main_val}]", f"${{submenu}}[{sub_val}]"]
+
+    # --- Logic สำหรับ Keyword Factory ---
+    factory_kw = assets.get('factory_keyword_map', {}).get(keyword)
+    if factory_kw:
+        for arg_def in factory_kw.get('args', []):
+            arg_name = arg_def.get('name', '')
+            clean_name = arg_name.replace('${', '').replace('}', '')
+            if clean_name in args:
+                value = args[clean_name]
+                formatted_value = "${EMPTY}" if str(value).strip() == "" else value
+                args_list.append(f"{formatted_value}")
+        return args_list
+
+    # --- Logic ทั่วไป ---
+    for name, value in args.items():
+        if value or value is False or value == "":
+            if isinstance(value, dict) and value.get('name'):
+                formatted_value = f"${{{get_clean_locator_name(value['name'])}}}"
+            elif str(value).strip() == "":
+                formatted_value = "${EMPTY}"
+            elif str(value).startswith('${'):
+                formatted_value = value
+            else:
+                keywords_check = ['locator', 'menu', 'header', 'body']
+                is_loc_arg = any(s in name.lower() for s in keywords_check)
+                if name in ['button_name', 'timeout', 'pagename']: is_loc_arg = False
+                formatted_value = f"${{{value}}}" if is_loc_arg else value
+
+            args_list.append(f"{name}={formatted_value}")
+
+    return args_list
+
+def format_step_for_script(step, assets, indent=4):
+    keyword = step.get('keyword', 'N/A')
+    args = step.get('args', {})
+
+    formatted_args = format_arguments_for_script(keyword, args, assets)
+    separator = "    "
+
+    if keyword == 'Verify Result of data table' and args.get('assertion_columns'):
+        fixed_args = [a for a in formatted_args if not a.startswith(('col.', 'assert.', 'expected.'))]
+        col_args = [a for a in formatted_args if a.startswith(('col.', 'assert.', 'expected.'))]
+
+        lines = [f"{' ' * indent}{keyword}{separator if fixed_args else ''}{separator.join(fixed_args)}"]
+        for i in range(0, len(col_args), 3):
+            lines.append(f"{' ' * indent}...{separator}{separator.join(col_args[i:i + 3])}")
+        return "\n".join(lines)
+
+    return f"{' ' * indent}{keyword}{separator if formatted_args else ''}{separator.join(formatted_args)}"
+
+# ===================================================================
+# ===== 3. Script Generation =====
+# ===================================================================
+
+# Sections ที่รวมกันเป็น body ของ Test Case (เรียงตามลำดับการรัน)
+TEST_CASE_SECTIONS = [
+    'action_list', 'action_form', 'action_detail',
+    'verify_list_search', 'verify_list_table', 'verify_list_nav',
+    'verify_detail_page', 'verify_detail_back',
+]
+
+def format_run_keywords(setting_name, steps, assets):
+    """Formats a Setup/Teardown setting, wrapping multiple steps in Run Keywords."""
+    if not steps: return ""
+    if len(steps) == 1:
+        step_lines = format_step_for_script(steps[0], assets, indent=0).split('\n')
+        other_lines = [f"    ...    {line}" for line in step_lines[1:]]
+        return f"{setting_name}    {step_lines[0]}\n" + "\n".join(other_lines)
+
+    lines = [f"{setting_name}    Run Keywords"]
+    for i, step in enumerate(steps):
+        prefix = "    ..." if i == 0 else "    ...    AND"
+        step_lines = format_step_for_script(step, assets, indent=0).split('\n')
+        lines.append(f"{prefix}    {step_lines[0]}")
+        for line in step_lines[1:]:
+            lines.append(f"{prefix}    ...    {line}")
+    return "\n".join(lines)
+
+def iter_settings_lines(ws, assets):
+    """Yields the *** Settings *** section line by line."""
+    steps = ws.get('steps', {})
+    yield "*** Settings ***"
+    yield "Resource    ../resources/commonkeywords.resource"
+    for setting_name, section_key in [("Suite Setup", 'suite_setup'), ("Test Setup", 'test_setup'),
+                                      ("Test Teardown", 'test_teardown'), ("Suite Teardown", 'suite_teardown')]:
+        setting_str = format_run_keywords(setting_name, steps.get(section_key, []), assets)
+        if setting_str:
+            yield ""
+            yield from setting_str.split("\n")
+
+def iter_test_step_lines(ws, assets, indent=4):
+    """Yields the formatted test body steps (a step may span '...' continuation lines)."""
+    steps = ws.get('steps', {})
+    for section_key in TEST_CASE_SECTIONS:
+        for step in steps.get(section_key, []):
+            yield format_step_for_script(step, assets, indent=indent)
+
+def iter_test_case_lines(ws, assets):
+    """Yields one test case block (name, [Tags], steps) line by line."""
+    yield f"{ws.get('test_case_name', 'TC_Placeholder')}"
+    if ws.get('tags'):
+        yield f"    [Tags]    {'    '.join(ws.get('tags'))}"
+    yield from iter_test_step_lines(ws, assets)
+
+# ===================================================================
+# ===== 4. Data-Driven Expansion (CSV rows -> test cases) =====
+# ===================================================================
+
+# 'template'   -> Test Template + one data row per CSV row
+# 'test_cases' -> one generated test case per CSV row calling the flow keyword
+DATA_DRIVEN_MODES = ['template', 'test_cases']
+
+def is_data_driven(ws):
+    config = ws.get('data_driven') or {}
+    return bool(config.get('enabled') and config.get('csv_file'))
+
+def csv_header_to_arg_name(header, index=0):
+    """'First Name' -> 'first_name' (used as ${first_name} in the flow keyword)."""
+    name = re.sub(r'\W+', '_', str(header).strip()).strip('_').lower()
+    return name or f"col_{index + 1}"
+
+def escape_robot_cell(value):
+    """Escapes a raw CSV cell so Robot reads it back as the same literal value."""
+    value = str(value)
+    if value == '':
+        return '${EMPTY}'
+    value = value.replace('\\', '\\\\').replace('\t', '\\t').replace('\r', '\\r').replace('\n', '\\n')
+    # 2+ spaces is a Robot separator; leading/trailing spaces are stripped
+    value = re.sub(r'(?<= ) ', '\\ ', value)
+    if value.startswith((' ', '#')):
+        value = '\\' + value
+    if value.endswith(' '):
+        value = value[:-1] + '\\ '
+    return value
+
+def get_data_flow_keyword_name(ws):
+    config = ws.get('data_driven') or {}
+    return config.get('keyword_name') or f"{ws.get('test_case_name', 'TC_Placeholder')} Flow"
+
+def iter_data_driven_script_lines(ws, assets, max_rows=None):
+    """
+    Yields a data-driven suite: one test (or template row) per CSV row.
+    Rows are streamed from resources/datatest/<csv_file> and formatted one at a time,
+    so memory stays bounded and time is linear in the number of rows.
+
+    Args:
+        ws (dict): CRUD workspace with ws['data_driven'] = {'enabled', 'csv_file', 'mode', 'name_column'}
+        assets (dict): Snapshot from build_asset_snapshot() (project_path locates the CSV)
+        max_rows (int): Stop after this many rows (used by the live preview)
+    """
+    config = ws.get('data_driven') or {}
+    mode = config.get('mode') if config.get('mode') in DATA_DRIVEN_MODES else 'template'
+    tc_name = ws.get('test_case_name', 'TC_Placeholder')
+    tags = ws.get('tags') or []
+    flow_keyword = get_data_flow_keyword_name(ws)
+
+    rows = util_iter_csv_rows(assets.get('project_path', ''), config.get('csv_file'))
+    header = [h.strip() for h in next(rows, [])]
+    arg_names = [csv_header_to_arg_name(h, i) for i, h in enumerate(header)]
+    name_index = header.index(config['name_column']) if config.get('name_column') in header else None
+
+    yield from iter_settings_lines(ws, assets)
+    if mode == 'template':
+        yield ""
+        yield f"Test Template    {flow_keyword}"
+        if tags:
+            # Force Tags works on every Robot Framework version ('Test Tags' needs 6+)
+            yield f"Force Tags    {'    '.join(tags)}"
+    yield ""
+    yield ""
+    yield "*** Test Cases ***"
+    yield ""
+
+    if not header:
+        yield f"# CSV file '{config.get('csv_file')}' not found or empty in resources/datatest"
+
+    row_no = 0
+    for row in rows:
+        if not any(cell.strip() for cell in row):
+            continue
+        if max_rows is not None and row_no >= max_rows:
+            yield f"# ... (preview truncated after {max_rows} rows)"
+            break
+        row_no += 1
+        cells = (row + [''] * len(header))[:len(header)]
+        values = '    '.join(escape_robot_cell(cell) for cell in cells)
+        row_name = cells[name_index].strip() if name_index is not None and cells[name_index].strip() else str(row_no)
+        test_name = f"{tc_name} {escape_robot_cell(row_name)}"
+
+        if mode == 'template':
+            yield f"{test_name}    {values}" if values else test_name
+        else:
+            yield test_name
+            if tags:
+                yield f"    [Tags]    {'    '.join(tags)}"
+            yield f"    {flow_keyword}    {values}" if values else f"    {flow_keyword}"
+            yield ""
+
+    yield ""
+    yield "*** Keywords ***"
+    yield flow_keyword
+    if arg_names:
+        yield f"    [Arguments]    {'    '.join(f'${{{name}}}' for name in arg_names)}"
+    yield from iter_test_step_lines(ws, assets)
+
+# ===================================================================
+# ===== 5. Script Entry Points =====
+# ===================================================================
+
+def iter_robot_script_lines(ws, assets, max_rows=None):
+    """
+    Yields the complete .robot script section by section.
+    Joining the yielded lines with "\n" gives exactly generate_robot_script().
+    """
+    if is_data_driven(ws):
+        yield from iter_data_driven_script_lines(ws, assets, max_rows=max_rows)
+        return
+
+    yield from iter_settings_lines(ws, assets)
+    yield ""
+    yield ""
+    yield "*** Test Cases ***"
+    yield ""
+    yield from iter_test_case_lines(ws, assets)
+
+@profiled('crud_engine.generate_robot_script')
+def generate_robot_script(ws, assets, max_rows=None):
+    """
+    Generates the complete .robot script for a CRUD workspace.
+
+    Args:
+        ws (dict): CRUD workspace (crud_generator_workspace)
+        assets (dict): Snapshot from build_asset_snapshot()
+        max_rows (int): Row limit for data-driven workspaces (None = all rows)
+
+    Returns:
+        str: The generated Robot Framework script
+    """
+    return "\n".join(iter_robot_script_lines(ws, assets, max_rows=max_rows))
@@ -683,21 +683,14 @@
 
 import streamlit as st
 import uuid
-from ..session_manager import get_clean_locator_name
+from ..session_manager import get_clean_locator_name, get_workspace_history, get_keyword_registry
+from ..history import insert_op, pop_op, set_op, move_ops
 import os
 import csv
-import pandas as pd
-from ..utils import util_get_csv_headers
-
-# ===================================================================
-# ===== HELPER FUNCTIONS =====
-# ===================================================================
-
-def _is_true(value):
-    """Helper to check boolean values from string or bool"""
-    if isinstance(value, str):
-        return value.lower() in ('true', 'yes', 'on', '1')
-    return bool(value)
+import pickle
+from . import engine
+from ..preview_service import snapshot
+from ..workspace_store import TRANSIENT_KEYS
 
 # ===================================================================
 # ===== 1. LOGIC สำหรับจัดการ WORKSPACE STATE =====
@@ -743,34 +736,74 @@ def _get_assets():
     return st.session_state.studio_workspace.get('keywords', []), st.session_state.studio_workspace.get('locators', [])
 
 def sync_keyword_factory_keywords():
+    """Points the shared keyword registry at the Keyword Factory list (no copy); returns the keyword count."""
     from .. import kw_manager
-    factory_keywords = kw_manager.get_all_keywords()
+    registry = get_keyword_registry()
+    registry.publish(kw_manager.get_all_keywords())
     ws = _get_workspace()
-    ws['keyword_factory_keywords'] = factory_keywords
-    _save_workspace()
-    return len(factory_keywords)
+    # Workspaces from older sessions carried their own copy of the keyword list;
+    # a replaced workspace (restore / import) still holds the previous one's ref counts
+    legacy = ws.pop('keyword_factory_keywords', None) is not None
+    if legacy or 'keyword_factory_ids' not in ws or st.session_state.get('crud_factory_refs_workspace') is not ws:
+        _retain_factory_keywords()
+    return len(registry)
 
 def get_keyword_factory_keywords():
+    return get_keyword_registry().keywords()
+
+def _retain_factory_keywords():
+    """Records the ids of the factory keywords used by CRUD steps (workspace + registry ref counts)."""
     ws = _get_workspace()
-    return ws.get('keyword_factory_keywords', [])
+    registry = get_keyword_registry()
+    ids = []
+    for steps_list in ws.get('steps', {}).values():
+        for step in steps_list:
+            if step.get('type') != 'keyword_factory':
+                continue
+            keyword_id = step.get('keyword_id')
+            if keyword_id is None:
+                # Steps added before ids were stored
+                kw = registry.find_by_name(step.get('keyword'))
+                keyword_id = kw['id'] if kw else None
+            if keyword_id:
+                ids.append(keyword_id)
+    ws['keyword_factory_ids'] = list(dict.fromkeys(ids))
+    registry.retain('crud_generator_workspace', ws['keyword_factory_ids'])
+    st.session_state['crud_factory_refs_workspace'] = ws
 
 def get_csv_headers(csv_filename):
-    project_path = st.session_state.get('project_path', '')
-    if not project_path:
-        return []
-    return util_get_csv_headers(project_path, csv_filename)
+    return engine.get_csv_headers({'project_path': st.session_state.get('project_path', '')}, csv_filename)
 
 def _find_step_index(steps_list, step_id):
     return next((i for i, step in enumerate(steps_list) if step.get('id') == step_id), -1)
 
+# --- Undo / Redo (edits below go through the workspace history) ---
+
+def _apply_edit(label, ops):
+    get_workspace_history('crud_generator_workspace').apply(_get_workspace(), label, ops)
+    _retain_factory_keywords()
+    _save_workspace()
+
+def undo():
+    label = get_workspace_history('crud_generator_workspace').undo(_get_workspace())
+    _retain_factory_keywords()
+    _save_workspace()
+    return label
+
+def redo():
+    label = get_workspace_history('crud_generator_workspace').redo(_get_workspace())
+    _retain_factory_keywords()
+    _save_workspace()
+    return label
+
 # ===================================================================
 # ===== 2. ฟังก์ชันจัดการ STEPS (CRUD) =====
 # ===================================================================
 
 def add_step(section_key, new_step_data):
     if 'id' not in new_step_data: new_step_data['id'] = str(uuid.uuid4())
-    _get_workspace()['steps'][section_key].append(new_step_data)
-    _save_workspace()
+    steps_list = _get_workspace()['steps'][section_key]
+    _apply_edit("Add step", [insert_op(('steps', section_key), len(steps_list), new_step_data)])
 
 def add_fill_form_step(section_key):
     ws = _get_workspace()
@@ -788,25 +821,23 @@ def add_fill_form_step(section_key):
             "locator_switch_checked": ""
         }
     }
-    ws['steps'][section_key].insert(0, new_step)
-    _save_workspace()
+    _apply_edit("Add fill form step", [insert_op(('steps', section_key), 0, new_step)])
 
 def delete_step(section_key, step_id):
-    steps_list = _get_workspace()['steps'][section_key]
-    index = _find_step_index(steps_list, step_id)
+    ws = _get_workspace()
+    index = _find_step_index(ws['steps'][section_key], step_id)
     if index != -1:
-        steps_list.pop(index)
-        _save_workspace()
+        _apply_edit("Delete step", [pop_op(ws, ('steps', section_key), index)])
 
 def move_step(section_key, step_id, direction):
-    steps_list = _get_workspace()['steps'][section_key]
+    ws = _get_workspace()
+    steps_list = ws['steps'][section_key]
     index = _find_step_index(steps_list, step_id)
     if index != -1:
         if direction == 'up' and index > 0:
-            steps_list.insert(index - 1, steps_list.pop(index))
+            _apply_edit("Move step", move_ops(ws, ('steps', section_key), index, index - 1))
         elif direction == 'down' and index < len(steps_list) - 1:
-            steps_list.insert(index + 1, steps_list.pop(index))
-        _save_workspace()
+            _apply_edit("Move step", move_ops(ws, ('steps', section_key), index, index + 1))
 
 def duplicate_step(section_key, step_id):
     steps_list = _get_workspace()['steps'][section_key]
@@ -815,36 +846,39 @@ def duplicate_step(section_key, step_id):
         import copy
         new_step = copy.deepcopy(steps_list[index])
         new_step['id'] = str(uuid.uuid4())
-        steps_list.insert(index + 1, new_step)
-        _save_workspace()
+        _apply_edit("Duplicate step", [insert_op(('steps', section_key), index + 1, new_step)])
 
 def update_step_args(section_key, step_id, new_args):
-    steps_list = _get_workspace()['steps'][section_key]
-    index = _find_step_index(steps_list, step_id)
-    if index != -1:
-        steps_list[index]['args'] = new_args
-        _save_workspace()
+    ws = _get_workspace()
+    if _find_step_index(ws['steps'][section_key], step_id) != -1:
+        _apply_edit("Edit step", [set_op(ws, ('steps', section_key, step_id), 'args', new_args)])
 
 def batch_update_step_args(section_key, updates_dict):
     ws = _get_workspace()
     steps_map = {s['id']: s for s in ws['steps'][section_key]}
-    for step_id, new_args in updates_dict.items():
-        if step_id in steps_map:
-            steps_map[step_id]['args'].update(new_args)
-    _save_workspace()
+    # New args dicts (not in-place updates) so the previous values stay available for undo
+    ops = [
+        set_op(ws, ('steps', section_key, step_id), 'args', {**steps_map[step_id].get('args', {}), **new_args})
+        for step_id, new_args in updates_dict.items() if step_id in steps_map
+    ]
+    _apply_edit("Edit steps", ops)
 
 # ===================================================================
 # ===== 3. ฟังก์ชันสร้าง Template =====
 # ===================================================================
 
+def _apply_template(label, generator, ws, all_keywords, all_locators):
+    """Replaces every section with the generated steps as one undoable edit."""
+    new_steps = {section: [] for section in ws['steps']}
+    # Generators see the cleared sections, as before
+    new_steps.update(generator({**ws, 'steps': dict(new_steps)}, all_keywords, all_locators))
+    _apply_edit(label, [set_op(ws, ('steps',), section, steps_list) for section, steps_list in new_steps.items()])
+
 def generate_create_template():
     from .template_create import generate_create_template as gen_create
     ws = _get_workspace()
     all_keywords, all_locators = _get_assets()
-    for section in ws['steps']: ws['steps'][section] = []
-    generated_steps = gen_create(ws, all_keywords, all_locators)
-    for section_key, steps_list in generated_steps.items(): ws['steps'][section_key] = steps_list
-    _save_workspace()
+    _apply_template("Generate 'Create' template", gen_create, ws, all_keywords, all_locators)
     import streamlit as st
     st.toast("🤖 'Create' template generated successfully!", icon="✨")
 
@@ -852,10 +886,7 @@ def generate_update_template():
     from .template_update import generate_update_template as gen_update
     ws = _get_workspace()
     all_keywords, all_locators = _get_assets()
-    for section in ws['steps']: ws['steps'][section] = []
-    generated_steps = gen_update(ws, all_keywords, all_locators)
-    for section_key, steps_list in generated_steps.items(): ws['steps'][section_key] = steps_list
-    _save_workspace()
+    _apply_template("Generate 'Update' template", gen_update, ws, all_keywords, all_locators)
     import streamlit as st
     st.toast("🔄 'Update' template generated successfully!", icon="✨")
 
@@ -863,10 +894,7 @@ def generate_delete_template():
     from .template_delete import generate_delete_template as gen_delete
     ws = _get_workspace()
     all_keywords, all_locators = _get_assets()
-    for section in ws['steps']: ws['steps'][section] = []
-    generated_steps = gen_delete(ws, all_keywords, all_locators)
-    for section_key, steps_list in generated_steps.items(): ws['steps'][section_key] = steps_list
-    _save_workspace()
+    _apply_template("Generate 'Delete' template", gen_delete, ws, all_keywords, all_locators)
     import streamlit as st
     st.toast("🗑️ 'Delete' template generated successfully!", icon="✨")
 
@@ -877,290 +905,85 @@ def auto_detect_and_generate_form_steps(add_to_section):
     input_suffixes = ['_INPUT', '_SELECT', '_TEXTAREA', '_DATE', '_FILE']
     if not all_locators: return 0 
     form_locators = [loc for loc in all_locators if any(loc['name'].upper().endswith(suffix) for suffix in input_suffixes) and 'SEARCH' not in loc['name'].upper()]
-    steps_added = 0
+    ops = []
+    section_len = len(ws['steps'][add_to_section])
     existing_loc_names = {s['args'].get('locator_field', {}).get('name') for s in ws['steps'][add_to_section]}
     for locator_obj in form_locators:
         if locator_obj['name'] not in existing_loc_names:
             new_step = {"keyword": fill_keyword['name'], "args": {"locator_field": locator_obj, "value": "", "select_attribute": "label", "is_checkbox_type": False, "is_ant_design": False, "is_switch_type": False, "locator_switch_checked": ""}}
-            insert_pos = max(0, len(ws['steps'][add_to_section]) - 2)
-            ws['steps'][add_to_section].insert(insert_pos, {**new_step, 'id': str(uuid.uuid4())})
-            steps_added += 1
-    if steps_added > 0: _save_workspace()
-    return steps_added
+            insert_pos = max(0, section_len + len(ops) - 2)
+            ops.append(insert_op(('steps', add_to_section), insert_pos, {**new_step, 'id': str(uuid.uuid4())}))
+    if ops: _apply_edit("Auto-detect form steps", ops)
+    return len(ops)
 
 # ===================================================================
 # ===== ส่วนที่แก้ไข: Logic การแปลง Argument ให้ตรงกับ Common Keywords =====
 # ===================================================================
+# (Logic จริงอยู่ใน engine.py - ฟังก์ชันด้านล่างเป็น adapter ที่อ่านจาก session_state)
+
+def _get_asset_snapshot():
+    """Builds an engine asset snapshot from the current session state."""
+    all_keywords, all_locators = _get_assets()
+    return engine.build_asset_snapshot(
+        keywords=all_keywords,
+        locators=all_locators,
+        factory_keywords=get_keyword_factory_keywords(),
+        factory_keyword_map=get_keyword_registry().name_map(),
+        project_path=st.session_state.get('project_path', '')
+    )
 
 def _resolve_arg_name(keyword_name, internal_name, default_name):
-    ws_studio = st.session_state.get('studio_workspace', {})
-    common_kws = ws_studio.get('keywords', [])
-    factory_kws = get_keyword_factory_keywords()
-    all_kws = common_kws + factory_kws
-    target_kw = next((k for k in all_kws if k['name'] == keyword_name), None)
-    if not target_kw: return default_name
-    defined_args = []
-    if target_kw.get('args'):
-        for arg in target_kw['args']:
-            name = arg.get('name', '')
-            clean = name.replace('${', '').replace('}', '').replace('@{', '').replace('&{', '')
-            defined_args.append(clean.lower())
-    if internal_name.lower() in defined_args: return internal_name
-    return default_name
+    return engine.resolve_arg_name(_get_asset_snapshot(), keyword_name, internal_name, default_name)
 
 def _format_arguments_for_script(keyword, args):
-    """
-    ฟังก์ชัน Helper ใหม่: แปลง dict ของ arguments เป็น list ของ string ที่พร้อมใช้งาน
-    (REVISED: Strict mapping to commonkeywords)
-    """
-    args_list = []
-    
-    # ✅ Keyword: Fill in data form
-    if keyword.lower() == 'fill in data form':
-        
-        # 1. locator_field
-        locator_obj = args.get('locator_field')
-        if isinstance(locator_obj, dict) and locator_obj.get('name'):
-            args_list.append(f"locator_field=${{{get_clean_locator_name(locator_obj['name'])}}}")
-        elif isinstance(locator_obj, str) and locator_obj.strip():
-            args_list.append(f"locator_field=${{{get_clean_locator_name(locator_obj)}}}")
-        else:
-            args_list.append(f"locator_field=${{EMPTY}}")
-
-        # 2. value
-        val = args.get('value', '')
-        args_list.append(f"value={val if val else '${EMPTY}'}")
-
-        # 3. sel_attr
-        sel_attr = args.get('select_attribute') or args.get('sel_attr') or 'label'
-        args_list.append(f"sel_attr={sel_attr}")
-        
-        # 4. is_checkboxtype
-        is_checkbox = _is_true(args.get('is_checkbox_type') or args.get('is_checkboxtype'))
-        if is_checkbox:
-            args_list.append(f"is_checkboxtype=${{True}}")
-            
-        # 5. is_antdesign
-        is_ant = _is_true(args.get('is_ant_design') or args.get('is_antdesign'))
-        if is_ant:
-            args_list.append(f"is_antdesign=${{True}}")
-
-        # 6. is_switchtype
-        is_switch = _is_true(args.get('is_switch_type') or args.get('is_switchtype'))
-        if is_switch:
-            args_list.append(f"is_switchtype=${{True}}")
-            # 7. locator_switch_checked
-            switch_loc_obj = args.get('locator_switch_checked')
-            if isinstance(switch_loc_obj, dict) and switch_loc_obj.get('name'):
-                args_list.append(f"locator_switch_checked=${{{get_clean_locator_name(switch_loc_obj['name'])}}}")
-            elif isinstance(switch_loc_obj, str) and switch_loc_obj.strip():
-                clean_switch = get_clean_locator_name(switch_loc_obj)
-                args_list.append(f"locator_switch_checked=${{{clean_switch}}}")
-                
-        return args_list
-
-    # ✅ Keyword: Verify data form
-    if keyword.lower() == 'verify data form':
-        
-        # 1. locator_field
-        locator_obj = args.get('locator_field')
-        if isinstance(locator_obj, dict) and locator_obj.get('name'):
-            args_list.append(f"locator_field=${{{get_clean_locator_name(locator_obj['name'])}}}")
-        elif isinstance(locator_obj, str) and locator_obj.strip():
-            args_list.append(f"locator_field=${{{get_clean_locator_name(locator_obj)}}}")
-        else:
-            args_list.append(f"locator_field=${{EMPTY}}")
-            
-        # 2. assertion
-        assertion = args.get('assertion', 'should be')
-        args_list.append(f"assertion={assertion}")
-
-        # 3. exp_value
-        expected_val = args.get('expected_value') or args.get('exp_value') or ''
-        args_list.append(f"exp_value={expected_val if expected_val else '${EMPTY}'}")
-        
-        # 4. sel_attr
-        sel_attr = args.get('select_attribute') or args.get('sel_attr')
-        if sel_attr and sel_attr != 'label':
-             args_list.append(f"sel_attr={sel_attr}")
-
-        # 5. ignorcase
-        if _is_true(args.get('ignore_case') or args.get('ignorcase')):
-             args_list.append(f"ignorcase=${{True}}")
-
-        # 6. antdesign
-        if _is_true(args.get('is_ant_design') or args.get('antdesign')):
-             args_list.append(f"antdesign=${{True}}")
-
-        # 7. is_switchtype
-        if _is_true(args.get('is_switch_type') or args.get('is_switchtype')):
-             args_list.append(f"is_switchtype=${{True}}")
-             # 8. locator_switch_checked
-             switch_loc_obj = args.get('locator_switch_checked')
-             if isinstance(switch_loc_obj, dict) and switch_loc_obj.get('name'):
-                args_list.append(f"locator_switch_checked=${{{get_clean_locator_name(switch_loc_obj['name'])}}}")
-             elif isinstance(switch_loc_obj, str) and switch_loc_obj.strip():
-                clean_switch = get_clean_locator_name(switch_loc_obj)
-                args_list.append(f"locator_switch_checked=${{{clean_switch}}}")
-
-        return args_list
-
-    # --- Logic สำหรับ 'Verify Result of data table' ---
-    if keyword == 'Verify Result of data table':
-        if args.get('locator_thead'): args_list.append(f"locator_thead=${{{args['locator_thead']}}}")
-        if args.get('locator_tbody'): args_list.append(f"locator_tbody=${{{args['locator_tbody']}}}")
-        if args.get('rowdata'): args_list.append(f"rowdata={args['rowdata']}")
-        
-        if _is_true(args.get('ignore_case') or args.get('ignorcase')): 
-            args_list.append(f"ignorcase=${{True}}")
-        else:
-            args_list.append(f"ignorcase=${{False}}")
-        
-        assertion_columns = args.get('assertion_columns', [])
-        for assertion in assertion_columns:
-            header = assertion.get('header_name')
-            expected = assertion.get('expected_value')
-            if header:
-                args_list.append(f"col.{header}={header}")
-                args_list.append(f"assert.{header}=equal")
-                args_list.append(f"expected.{header}={expected or '${EMPTY}'}")
-        return args_list
-
-    # --- Logic สำหรับ Keyword Factory ---
-    factory_keywords = get_keyword_factory_keywords()
-    is_factory_keyword = any(kw['name'] == keyword for kw in factory_keywords)
-    
-    if keyword == 'Go to MENU name':
-        val = args.get('name') or args.get('menu_name') or args.get('locator') or args.get('main_menu')
-        if not val and args: val = next((v for v in args.values() if v), '')
-        return [f"${{mainmenu}}[{val}]"]
-
-    if keyword == 'Go to SUBMENU name':
-        main_val = args.get('main_menu') or args.get('menu_name')
-        sub_val = args.get('submenu') or args.get('submenu_name') or args.get('name')
-        if main_val is None: main_val = ''
-        if sub_val is None: sub_val = ''
-        return [f"${{mainmenu}}[{main_val}]", f"${{submenu}}[{sub_val}]"]
-
-    if is_factory_keyword:
-        factory_kw = next((kw for kw in factory_keywords if kw['name'] == keyword), None)
-        if factory_kw:
-            for arg_def in factory_kw.get('args', []):
-                arg_name = arg_def.get('name', '')
-                clean_name = arg_name.replace('${', '').replace('}', '')
-                if clean_name in args:
-                    value = args[clean_name]
-                    if str(value).strip() == "": formatted_value = "${EMPTY}"
-                    elif str(value).startswith('${'): formatted_value = value
-                    else: formatted_value = value
-                    args_list.append(f"{formatted_value}") 
-            return args_list
-
-    # --- Logic ทั่วไป ---
-    for name, value in args.items():
-        if value or value is False or value == "":
-            if isinstance(value, dict) and value.get('name'):
-                formatted_value = f"${{{get_clean_locator_name(value['name'])}}}"
-            elif str(value).strip() == "":
-                formatted_value = "${EMPTY}"
-            elif str(value).startswith('${'):
-                formatted_value = value
-            else:
-                keywords_check = ['locator', 'menu', 'header', 'body']
-                is_loc_arg = any(s in name.lower() for s in keywords_check)
-                if name in ['button_name', 'timeout','pagename']: is_loc_arg = False
-                formatted_value = f"${{{value}}}" if is_loc_arg else value
-            
-            args_list.append(f"{name}={formatted_value}")
-            
-    return args_list
+    return engine.format_arguments_for_script(keyword, args, _get_asset_snapshot())
 
 def _format_step_for_script(step, indent=4):
-    keyword = step.get('keyword', 'N/A')
-    args = step.get('args', {})
-    
-    formatted_args = _format_arguments_for_script(keyword, args)
-    separator = "    " 
-    
-    if keyword == 'Verify Result of data table' and 'assertion_columns' in args and args['assertion_columns']:
-        fixed_args = [a for a in formatted_args if not a.startswith(('col.', 'assert.', 'expected.'))]
-        col_args = [a for a in formatted_args if a.startswith(('col.', 'assert.', 'expected.'))]
-
-        lines = []
-        lines.append(f"{' ' * indent}{keyword}{separator if fixed_args else ''}{separator.join(fixed_args)}")
-        if col_args:
-            grouped_col_args = [col_args[i:i + 3] for i in range(0, len(col_args), 3)]
-            for group in grouped_col_args:
-                lines.append(f"{' ' * indent}...{separator}{separator.join(group)}")
-        return "\n".join(lines)
-    
-    return f"{' ' * indent}{keyword}{separator if formatted_args else ''}{separator.join(formatted_args)}"
+    return engine.format_step_for_script(step, _get_asset_snapshot(), indent=indent)
+
+def generate_robot_script(max_rows=None):
+    return engine.generate_robot_script(_get_workspace(), _get_asset_snapshot(), max_rows=max_rows)
 
-def generate_robot_script():
+def preview_snapshot():
+    """(version, payload) of everything the script preview reads; see render_preview_script."""
     ws = _get_workspace()
-    
-    def _format_run_keywords(keyword, steps):
-        if not steps: return ""
-        if len(steps) == 1:
-            step_lines = _format_step_for_script(steps[0], indent=0).split('\n')
-            first_line = step_lines[0]
-            other_lines = [f"    ...    {line}" for line in step_lines[1:]]
-            return f"{keyword}    {first_line}\n" + "\n".join(other_lines)
-        
-        lines = [f"{keyword}    Run Keywords"]
-        for i, step in enumerate(steps):
-            prefix = "    ..." if i == 0 else "    ...    AND"
-            step_lines = _format_step_for_script(step, indent=0).split('\n')
-            lines.append(f"{prefix}    {step_lines[0]}")
-            if len(step_lines) > 1:
-                for line in step_lines[1:]:
-                    lines.append(f"{prefix}    ...    {line}")
-        return "\n".join(lines)
-
-    suite_setup_str = _format_run_keywords("Suite Setup", ws['steps']['suite_setup'])
-    test_setup_str = _format_run_keywords("Test Setup", ws['steps']['test_setup'])
-    test_teardown_str = _format_run_keywords("Test Teardown", ws['steps']['test_teardown'])
-    suite_teardown_str = _format_run_keywords("Suite Teardown", ws['steps']['suite_teardown'])
-
-    if suite_teardown_str: suite_teardown_str = "\n" + suite_teardown_str
-    if test_setup_str: test_setup_str = "\n" + test_setup_str
-    if test_teardown_str: test_teardown_str = "\n" + test_teardown_str
-    if suite_setup_str: suite_setup_str = "\n" + suite_setup_str
-
-    settings_lines = [
-        "*** Settings ***",
-        "Resource    ../resources/commonkeywords.resource",
-        suite_setup_str,
-        test_setup_str,
-        test_teardown_str,
-        suite_teardown_str 
-    ]
-    
-    all_test_steps = (
-        ws['steps'].get('action_list', []) + 
-        ws['steps'].get('action_form', []) +         
-        ws['steps'].get('action_detail', []) + 
-        ws['steps'].get('verify_list_search', []) + 
-        ws['steps'].get('verify_list_table', []) +   
-        ws['steps'].get('verify_list_nav', []) +     
-        ws['steps'].get('verify_detail_page', []) +  
-        ws['steps'].get('verify_detail_back', [])    
+    all_keywords, all_locators = _get_assets()
+    project_path = st.session_state.get('project_path', '')
+    csv_stamp = None
+    if engine.is_data_driven(ws):
+        # Data rows come from the CSV file, so its mtime is part of the version
+        try:
+            csv_stamp = os.stat(os.path.join(project_path, 'resources', 'datatest', ws['data_driven']['csv_file'])).st_mtime_ns
+        except (OSError, TypeError):
+            pass
+    return snapshot({
+        'ws': {k: v for k, v in ws.items() if k not in TRANSIENT_KEYS},
+        'keywords': all_keywords,
+        'locators': all_locators,
+        'factory_keywords': get_keyword_factory_keywords(),
+        'project_path': project_path,
+        'csv_stamp': csv_stamp,
+    })
+
+def render_preview_script(payload, max_rows=None):
+    """Renders a preview_snapshot() payload (runs on the preview worker thread)."""
+    inputs = pickle.loads(payload)
+    assets = engine.build_asset_snapshot(
+        keywords=inputs['keywords'],
+        locators=inputs['locators'],
+        factory_keywords=inputs['factory_keywords'],
+        project_path=inputs['project_path']
     )
-    
-    test_case_lines = [f"{ws.get('test_case_name', 'TC_Placeholder')}"]
-    if ws.get('tags'):
-        test_case_lines.append(f"    [Tags]    {'    '.join(ws.get('tags'))}")
-    
-    for step in all_test_steps:
-        test_case_lines.append(_format_step_for_script(step, indent=4))
+    return engine.generate_robot_script(inputs['ws'], assets, max_rows=max_rows)
+
+def iter_robot_script_lines(max_rows=None):
+    return engine.iter_robot_script_lines(_get_workspace(), _get_asset_snapshot(), max_rows=max_rows)
+
+def write_robot_script(file_path):
+    """Streams the generated script straight to file_path (no full-text copy)."""
+    from ..file_manager import stream_robot_file
+    return stream_robot_file(file_path, iter_robot_script_lines())
 
-    script_parts = [
-        "\n".join(filter(None, settings_lines)),
-        "\n*** Test Cases ***",
-        "\n".join(test_case_lines)
-    ]
-    
-    return "\n\n".join(filter(None, script_parts))
 
 def update_step(section_key, step_id, updated_data):
     ws = _get_workspace()
@@ -1170,6 +993,8 @@ def update_step(section_key, step_id, updated_data):
     steps_list = ws['steps'][section_key]
     index = _find_step_index(steps_list, step_id)
     if index != -1:
-        steps_list[index]['keyword'] = updated_data.get('keyword', steps_list[index]['keyword'])
-        steps_list[index]['args'] = updated_data.get('args', steps_list[index]['args'])
-        _save_workspace()
\ No newline at end of file
+        step_path = ('steps', section_key, step_id)
+        _apply_edit("Edit step", [
+            set_op(ws, step_path, 'keyword', updated_data.get('keyword', steps_list[index]['keyword'])),
+            set_op(ws, step_path, 'args', updated_data.get('args', steps_list[index]['args'])),
+        ])
\ No newline at end of file
@@ -10,19 +10,23 @@ import json
 import os 
 import re
 import uuid
-from . import manager
-from ..session_manager import get_clean_locator_name
-from ..ui_common import render_argument_input, render_step_card_compact, extract_csv_datasource_keywords, ARGUMENT_PRESETS
+import hashlib
+from . import manager, engine
+from ..session_manager import get_clean_locator_name, get_workspace_history
+from ..ui_common import render_undo_redo_controls, render_argument_input, render_step_card_compact, render_step_cards_compact, render_step_window, extract_csv_datasource_keywords, get_preset_registry, render_code_preview
 from ..dialog_commonkw import render_add_step_dialog_base
-from modules.utils import format_args_as_string, util_get_csv_first_column_values
+import pandas as pd
+from modules.utils import format_args_as_string, util_get_csv_first_column_values, parse_table_header_row, TABLE_ASSERTION_OPERATORS
 from ..file_manager import create_new_robot_file, scan_robot_project
+from ..profiler import profiled
+from ..styles import inject_styles
 
 # ======= ENTRY POINT FUNCTION =======
 def render_crud_generator_tab():
     """
     Main entry point สำหรับ CRUD Generator Tab
     """
-    inject_hybrid_css()
+    inject_styles('steps')
     render_crud_generator_tab_improved()
 
 # ======= NEW HELPER FUNCTION (V3.7) =======
@@ -114,6 +118,7 @@ def render_crud_generator_tab_improved():
     with header_left:
         st.markdown("#### 🎯 CRUD Test Generator", unsafe_allow_html=True)
         st.caption("Organize your test by phases: Setup → Actions → Verification → Teardown")
+        render_undo_redo_controls(get_workspace_history('crud_generator_workspace'), manager.undo, manager.redo, "crud")
     
     with header_right:
         st.markdown("<h3 style='font-size: 1.6rem;'>🚀 Live Code Preview</h3>", unsafe_allow_html=True)
@@ -371,10 +376,57 @@ def render_config_section_v3_8(ws, ws_state):
         value=", ".join(ws.get('tags', default_tags))
     )
     ws['tags'] = [tag.strip() for tag in tags_input.split(',') if tag.strip()]
-    num_factory_kw = len(ws.get('keyword_factory_keywords', []))
+    num_factory_kw = len(manager.get_keyword_factory_keywords())
     if num_factory_kw > 0:
         st.info(f"🏭 {num_factory_kw} custom keyword(s) available from Keyword Factory")
 
+    render_data_driven_config(ws, ws_state)
+
+def render_data_driven_config(ws, ws_state):
+    """Data-Driven mode: expand CSV rows into test cases / [Template] rows"""
+    config = ws.setdefault('data_driven', {'enabled': False, 'csv_file': '', 'mode': 'template', 'name_column': ''})
+
+    config['enabled'] = st.toggle(
+        "📊 Data-Driven from CSV",
+        value=config.get('enabled', False),
+        key="crud_data_driven_toggle",
+        help="สร้าง 1 Test Case ต่อ 1 แถวใน CSV (อ่านแบบ stream ไม่โหลดทั้งไฟล์)"
+    )
+    if not config['enabled']:
+        return
+
+    csv_files = sorted({ds.get('file_name') for ds in ws_state.get('data_sources', [])
+                        if ds.get('file_name') and ds.get('file_name') != 'NOT_FOUND'})
+    if not csv_files:
+        st.warning("No CSV data sources found. Import `datasources.resource` in the Test Data tab first.")
+        return
+
+    col1, col2 = st.columns(2)
+    with col1:
+        try: csv_index = csv_files.index(config.get('csv_file'))
+        except ValueError: csv_index = 0
+        config['csv_file'] = st.selectbox("CSV File", csv_files, index=csv_index, key="crud_data_driven_csv")
+    with col2:
+        mode_labels = {'template': "Test Template (1 row = 1 data line)", 'test_cases': "Generated Test Cases"}
+        config['mode'] = st.radio(
+            "Mode", engine.DATA_DRIVEN_MODES,
+            index=engine.DATA_DRIVEN_MODES.index(config.get('mode', 'template')),
+            format_func=mode_labels.get, key="crud_data_driven_mode"
+        )
+
+    headers = manager.get_csv_headers(config['csv_file'])
+    name_options = [''] + headers
+    try: name_index = name_options.index(config.get('name_column', ''))
+    except ValueError: name_index = 0
+    config['name_column'] = st.selectbox(
+        "Test Name Column", name_options, index=name_index,
+        format_func=lambda h: h or "(row number)", key="crud_data_driven_name_col"
+    )
+
+    if headers:
+        arg_vars = ", ".join(f"`${{{engine.csv_header_to_arg_name(h, i)}}}`" for i, h in enumerate(headers))
+        st.caption(f"Use these variables in your steps: {arg_vars}")
+
 # --- Sections updated to include the "Add API/CSV Step" button ---
 def render_suite_setup_section(ws):
     """Suite Setup Section"""
@@ -386,8 +438,7 @@ def render_suite_setup_section(ws):
     if not steps:
         st.info("No steps yet. Click 'Add Step' below or use Generate Template.")
     else:
-        for i, step in enumerate(steps):
-            render_step_card_compact(step, i, 'suite_setup', ws, manager, card_prefix="crud")
+        render_step_cards_compact(steps, 'suite_setup', ws, manager, card_prefix="crud")
 
     # --- (MODIFIED) Add buttons in columns ---
     col1, col2, col3 = st.columns(3)
@@ -413,8 +464,7 @@ def render_test_setup_section(ws):
     if not steps:
         st.info("No test setup steps defined. This is optional.")
     else:
-        for i, step in enumerate(steps):
-            render_step_card_compact(step, i, 'test_setup', ws, manager, card_prefix="crud")
+        render_step_cards_compact(steps, 'test_setup', ws, manager, card_prefix="crud")
 
     # --- (MODIFIED) Add buttons in columns ---
     col1, col2, col3 = st.columns(3)
@@ -440,8 +490,7 @@ def render_list_actions_section(ws):
     if not steps:
         st.info("No actions yet. Typically: Search, Click 'New' button")
     else:
-        for i, step in enumerate(steps):
-            render_step_card_compact(step, i, 'action_list', ws, manager, card_prefix="crud")
+        render_step_cards_compact(steps, 'action_list', ws, manager, card_prefix="crud")
 
     # --- (MODIFIED) Add buttons in columns ---
     col1, col2 = st.columns(2)
@@ -468,8 +517,7 @@ def render_fill_form_section(ws):
         st.info("No fill steps yet. Click 'Add Fill Step' or 'Import from Keyword Factory' below.")
     else:
         # (แสดง steps)
-        for i, step in enumerate(fill_steps):
-            render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_form") # (ใช้ section_key)
+        render_step_cards_compact(fill_steps, section_key, ws, manager, card_prefix="crud_form") # (ใช้ section_key)
 
     # --- (แก้ไข) Buttons ชี้ไปที่ action_form ---
     col1, col2 = st.columns(2)
@@ -497,8 +545,7 @@ def render_detail_actions_section(ws):
     if not other_steps:
         st.info("No other actions. Typically: Click Save, Click Modal OK")
     else:
-        for i, step in enumerate(other_steps):
-            render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_detail_actions") # (ใช้ section_key)
+        render_step_cards_compact(other_steps, section_key, ws, manager, card_prefix="crud_detail_actions") # (ใช้ section_key)
 
     # --- (Buttons ชี้ไปที่ action_detail - ถูกต้องอยู่แล้ว) ---
     col1, col2 = st.columns(2)
@@ -527,8 +574,7 @@ def render_verify_list_actions_search(ws):
     if not search_steps:
         st.info("ไม่พบขั้นตอนการค้นหา (Search, Wait).")
     else:
-        for i, step in enumerate(search_steps):
-            render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_vlist_search") # (ใช้ section_key)
+        render_step_cards_compact(search_steps, section_key, ws, manager, card_prefix="crud_vlist_search") # (ใช้ section_key)
 
     st.markdown("---")
     col1, col2 = st.columns(2)
@@ -557,16 +603,18 @@ def render_verify_list_verification_table(ws):
         st.warning("ไม่พบขั้นตอนการตรวจสอบตาราง.") 
     else:
         # (แสดงผลทุก Step ที่อยู่ใน List นี้)
-        for i, step in enumerate(all_table_steps):
+        def render_table_step(step, i):
             if step['keyword'] == 'Verify Result of data table':
                 with st.expander(f"🔧 Edit Table Verification (Step {i+1})", expanded=True):
                     # Pass the correct section_key
-                    render_step_toolbar(step, i, section_key, len(all_table_steps)) 
-                    render_table_verification_ui(step, ws)
+                    render_step_toolbar(step, i, section_key, len(all_table_steps))
+                    render_table_verification_ui(step, ws, section_key)
             else:
                 # (เผื่อผู้ใช้ Add Step อื่นเข้ามา)
                 render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_vlist_table")
 
+        render_step_window(all_table_steps, render_table_step, f"crud_vlist_table_{section_key}")
+
     st.markdown("---")
     col1, col2 = st.columns(2)
     with col1:
@@ -592,8 +640,7 @@ def render_verify_list_actions_navigate(ws):
     if not nav_steps:
         st.info("ไม่พบขั้นตอนการคลิกปุ่ม View/Edit.")
     else:
-        for i, step in enumerate(nav_steps):
-            render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_vlist_nav") # (ใช้ section_key)
+        render_step_cards_compact(nav_steps, section_key, ws, manager, card_prefix="crud_vlist_nav") # (ใช้ section_key)
 
     st.markdown("---")
     col1, col2 = st.columns(2)
@@ -620,8 +667,7 @@ def render_verify_detail_page(ws):
     if not verify_steps:
         st.info("No verify steps yet. Click 'Add Verify Step' or 'Import from Keyword Factory' below.")
     else:
-        for i, step in enumerate(verify_steps):
-            render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_vdetail_page") # (ใช้ section_key)
+        render_step_cards_compact(verify_steps, section_key, ws, manager, card_prefix="crud_vdetail_page") # (ใช้ section_key)
 
     # --- Buttons ---
     st.markdown("---")
@@ -649,8 +695,7 @@ def render_verify_detail_actions_back(ws):
     if not back_steps:
         st.info("ไม่พบขั้นตอนการคลิกปุ่ม Back.")
     else:
-        for i, step in enumerate(back_steps):
-            render_step_card_compact(step, i, section_key, ws, manager, card_prefix="crud_vdetail_back") # (ใช้ section_key)
+        render_step_cards_compact(back_steps, section_key, ws, manager, card_prefix="crud_vdetail_back") # (ใช้ section_key)
 
     st.markdown("---")
     col1, col2 = st.columns(2)
@@ -673,8 +718,7 @@ def render_suite_teardown_section(ws):
     if not steps:
         st.info("No teardown steps. Typically: Logout, Close All Browsers")
     else:
-        for i, step in enumerate(steps):
-            render_step_card_compact(step, i, 'suite_teardown', ws, manager, card_prefix="crud")
+        render_step_cards_compact(steps, 'suite_teardown', ws, manager, card_prefix="crud")
 
     # --- (มาจากโค้ดเดิม) 3 ปุ่มสำหรับ 'suite_teardown' ---
     col1, col2, col3 = st.columns(3)
@@ -699,8 +743,7 @@ def render_test_teardown_section(ws):
     if not test_td_steps:
         st.info("No test teardown steps defined.")
     else:
-        for i, step in enumerate(test_td_steps):
-            render_step_card_compact(step, i, 'test_teardown', ws, manager, card_prefix="crud")
+        render_step_cards_compact(test_td_steps, 'test_teardown', ws, manager, card_prefix="crud")
 
     # --- (มาจากโค้ดเดิม) 3 ปุ่มสำหรับ 'test_teardown' ---
     col_td1, col_td2, col_td3 = st.columns(3)
@@ -744,7 +787,17 @@ def render_step_toolbar(step, index, section_key, total_steps):
             st.rerun()
     st.markdown("</div>", unsafe_allow_html=True)
 
-def render_table_verification_ui(step, ws):
+def _assertion_rows(assertion_columns):
+    return [(a.get('header_name', ''), a.get('assertion') or 'equal', a.get('expected_value', '')) for a in assertion_columns]
+
+def _assertion_digest(assertion_columns):
+    return hashlib.blake2b(repr(_assertion_rows(assertion_columns)).encode('utf-8'), digest_size=8).hexdigest()
+
+def _editor_has_edits(editor_key):
+    edits = st.session_state.get(editor_key) or {}
+    return bool(edits.get('edited_rows') or edits.get('added_rows') or edits.get('deleted_rows'))
+
+def render_table_verification_ui(step, ws, section_key='verify_list_table'):
     """Simplified UI for table verification config (Updated with Dropdowns)"""
     step_id = step['id']
     
@@ -756,16 +809,8 @@ def render_table_verification_ui(step, ws):
     HEADER_KEYWORDS = ['THEADER', 'TABLE_HEADER', 'THEAD']
     BODY_KEYWORDS = ['TBODY', 'TABLE_BODY']
     
-    # 3. ฟังก์ชันช่วยกรอง
-    def get_filtered_locator_names(keywords):
-        filtered = [
-            loc['name'] for loc in all_locators 
-            if any(k in loc.get('name', '').upper() for k in keywords)
-        ]
-        return sorted(list(set(filtered))) # เรียงลำดับและตัดตัวซ้ำ
-
-    header_options = get_filtered_locator_names(HEADER_KEYWORDS)
-    body_options = get_filtered_locator_names(BODY_KEYWORDS)
+    # 3. กรอง Locators (cache ไว้จนกว่ารายการ locators จะเปลี่ยน)
+    header_options, body_options = _get_table_locator_options(all_locators, HEADER_KEYWORDS, BODY_KEYWORDS)
 
     # 4. จัดการค่าปัจจุบัน (Current Value)
     # ถ้าค่าเดิมที่มีอยู่ ไม่ตรงกับ Filter (เช่น พิมพ์มาเอง) ให้เพิ่มเข้าไปใน list ด้วย เพื่อไม่ให้ค่าหาย
@@ -786,72 +831,127 @@ def render_table_verification_ui(step, ws):
     st.markdown("**Table Locators**")
     col1, col2 = st.columns(2)
     
+    # Selections are re-synced from the step on every render and written back only from
+    # on_change, so a stale widget value never re-applies an undone edit
+    th_key, tb_key = f"th_{step_id}", f"tb_{step_id}"
+    st.session_state[th_key] = current_th if current_th in header_options else ''
+    st.session_state[tb_key] = current_tb if current_tb in body_options else ''
+
+    def _save_table_locators():
+        manager.update_step_args(section_key, step_id, {
+            **step['args'], 'theader': st.session_state[th_key], 'tbody': st.session_state[tb_key]
+        })
+
     with col1:
-        # หา Index ของค่าปัจจุบัน
-        try: th_index = header_options.index(current_th)
-        except ValueError: th_index = 0
-            
-        step['args']['theader'] = st.selectbox(
+        st.selectbox(
             "Header Locator",
             options=header_options,
-            index=th_index,
             format_func=get_clean_locator_name, # แสดงชื่อสวยๆ ตัด ${} ออก
-            key=f"th_{step_id}",
+            key=th_key,
+            on_change=_save_table_locators,
             help=f"Filter: {', '.join(HEADER_KEYWORDS)}"
         )
         
     with col2:
-        try: tb_index = body_options.index(current_tb)
-        except ValueError: tb_index = 0
-            
-        step['args']['tbody'] = st.selectbox(
+        st.selectbox(
             "Body Locator",
             options=body_options,
-            index=tb_index,
             format_func=get_clean_locator_name,
-            key=f"tb_{step_id}",
+            key=tb_key,
+            on_change=_save_table_locators,
             help=f"Filter: {', '.join(BODY_KEYWORDS)}"
         )
 
-    # --- ส่วน Assertion Columns (คงเดิม) ---
+    # --- ส่วน Assertion Columns (ตารางเดียว แก้ได้ทีละหลายคอลัมน์) ---
     st.markdown("---")
     st.markdown("**Column Assertions**")
 
-    if 'assertion_columns' not in step['args']:
-        step['args']['assertion_columns'] = []
+    assertions = step['args'].get('assertion_columns') or []
 
-    assertions = step['args']['assertion_columns']
+    # 1. Paste CSV header row -> เพิ่มหลายคอลัมน์พร้อมกัน
+    with st.expander("📋 Paste columns from CSV header row", expanded=not assertions):
+        pasted = st.text_area(
+            "Header row", key=f"tpaste_{step_id}", height=80, label_visibility="collapsed",
+            placeholder="Name,Status,Amount,Created Date"
+        )
+        if st.button("➕ Add Columns", use_container_width=True, key=f"tpaste_btn_{step_id}"):
+            existing = {a.get('header_name') for a in assertions}
+            new_headers = [h for h in parse_table_header_row(pasted) if h not in existing]
+            if new_headers:
+                manager.update_step_args(section_key, step_id, {
+                    **step['args'],
+                    'assertion_columns': assertions + [{'header_name': h, 'assertion': 'equal', 'expected_value': ''} for h in new_headers]
+                })
+            st.toast(f"Added {len(new_headers)} column(s)", icon="📋")
+            st.rerun()
 
-    if not assertions:
-        st.info("No column assertions yet. Click 'Add Column' below.")
+    # 2. Column table (header, assertion, expected)
+    # (data_editor ต้องได้ DataFrame ตั้งต้นตัวเดิมทุก rerun ไม่งั้น edits จะถูก apply ซ้ำ)
+    # Base and editor are keyed on a digest of the columns: after undo / restore / import
+    # (or our own write-back) they are rebuilt from the workspace, never from stale state.
+    digest = _assertion_digest(assertions)
+    digest_key = f"tcols_digest_{step_id}"
+    if st.session_state.get(digest_key) != digest:
+        st.session_state.pop(f"tcols_base_{step_id}_{st.session_state.get(digest_key)}", None)
+        st.session_state[digest_key] = digest
+    base_key = f"tcols_base_{step_id}_{digest}"
+    editor_key = f"tcols_{step_id}_{digest}"
+    if base_key not in st.session_state:
+        st.session_state[base_key] = pd.DataFrame(
+            _assertion_rows(assertions), columns=['header_name', 'assertion', 'expected_value']
+        )
+    edited_df = st.data_editor(
+        st.session_state[base_key],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key=editor_key,
+        column_config={
+            'header_name': st.column_config.TextColumn("Column", required=True),
+            'assertion': st.column_config.SelectboxColumn(
+                "Assertion", options=TABLE_ASSERTION_OPERATORS, default='equal', required=True),
+            'expected_value': st.column_config.TextColumn("Expected"),
+        }
+    )
+    if _editor_has_edits(editor_key):
+        new_assertions = [
+            {'header_name': str(h).strip(), 'assertion': a or 'equal', 'expected_value': '' if e is None else str(e)}
+            for h, a, e in edited_df.fillna('').itertuples(index=False, name=None)
+            if str(h).strip()
+        ]
+        if new_assertions != assertions:
+            manager.update_step_args(section_key, step_id, {**step['args'], 'assertion_columns': new_assertions})
+            st.rerun()
+    st.caption(f"{len(assertions)} column assertion(s)")
+
+def _get_table_locator_options(all_locators, header_keywords, body_keywords):
+    """Filtered header/body locator names, recomputed only when the locator list changes."""
+    cache_key = (id(all_locators), len(all_locators))
+    cached = st.session_state.get('_table_locator_options')
+    if not cached or cached['key'] != cache_key:
+        names = {loc.get('name', '') for loc in all_locators}
+        cached = {
+            'key': cache_key,
+            'header': sorted(n for n in names if any(k in n.upper() for k in header_keywords)),
+            'body': sorted(n for n in names if any(k in n.upper() for k in body_keywords)),
+        }
+        st.session_state['_table_locator_options'] = cached
+    # คืนค่าเป็น list ใหม่ เพราะ caller จะ insert ค่าปัจจุบันเพิ่ม
+    return list(cached['header']), list(cached['body'])
 
-    for i, assertion in enumerate(assertions):
-        with st.container(border=True):
-            col1, col2, col3 = st.columns([0.4, 0.5, 0.1])
-            with col1:
-                assertion['header_name'] = st.text_input("Column",
-                    value=assertion.get('header_name', ''), key=f"tcol_{step_id}_{i}", label_visibility="collapsed")
-            with col2:
-                assertion['expected_value'] = st.text_input("Expected",
-                    value=assertion.get('expected_value', ''), key=f"texp_{step_id}_{i}", label_visibility="collapsed")
-            with col3:
-                if st.button("🗑️", key=f"tdel_{step_id}_{i}", help="Remove"):
-                    assertions.pop(i)
-                    st.rerun()
+# ======= STICKY PREVIEW =======
+# Data-driven suites are truncated in the preview; 'Create File' streams every row
+PREVIEW_MAX_ROWS = 50
 
-    if st.button("➕ Add Column Assertion", use_container_width=True, key=f"tadd_{step_id}"):
-        assertions.append({'header_name': '', 'expected_value': ''})
-        st.rerun()
+def _render_preview_script(payload):
+    return manager.render_preview_script(payload, max_rows=PREVIEW_MAX_ROWS)
 
-# ======= STICKY PREVIEW =======
+@profiled()
 def render_sticky_preview(ws):
     """Live Preview & Export Options (Updated)"""
     
-    script_code = manager.generate_robot_script()
-
-    st.markdown('<div class="code-preview-container">', unsafe_allow_html=True)
-    st.code(script_code, language="robotframework", line_numbers=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    version, payload = manager.preview_snapshot()
+    render_code_preview('crud_script', version, payload, _render_preview_script)
 
     # --- ส่วน Export Options ใหม่ (แทน Download & Stats) ---
     st.markdown("#### 💾 Export Options")
@@ -890,7 +990,7 @@ def render_sticky_preview(ws):
                 full_path = os.path.join(save_dir, new_file_name)
                 
                 # บันทึกไฟล์
-                success = create_new_robot_file(full_path, script_code)
+                success = manager.write_robot_script(full_path)
                 
                 if success:
                     st.success(f"✅ Successfully created file at: `testsuite/{new_file_name}`")
@@ -1113,7 +1213,7 @@ def render_kw_factory_import_dialog():
     # Get Keyword Factory keywords and workspace
     ws = st.session_state.crud_generator_workspace
     ws_state = st.session_state.studio_workspace
-    factory_keywords = ws.get('keyword_factory_keywords', [])
+    factory_keywords = manager.get_keyword_factory_keywords()
 
     # Initialize selection state
     if 'selected_factory_kw' not in st.session_state:
@@ -1343,7 +1443,7 @@ def render_kw_factory_import_dialog():
                             for arg in kw_args:
                                 arg_name = arg.get('name', '').strip('${}')
                                 is_locator = any(s in arg_name.lower() for s in ['locator', 'field', 'button', 'element', 'menu'])
-                                is_preset = arg_name in ARGUMENT_PRESETS
+                                is_preset = get_preset_registry().is_preset(arg_name)
                                 if not is_locator and not is_preset:
                                     text_args.append(arg_name)
                             
@@ -1454,6 +1554,7 @@ def render_kw_factory_import_dialog():
                 new_step = {
                     "id": str(uuid.uuid4()),
                     "keyword": selected_kw.get('name'),
+                    "keyword_id": selected_kw.get('id'),
                     "args": args_dict,
                     "type": "keyword_factory"
                 }
@@ -2075,217 +2176,6 @@ def render_verify_detail_dialog():
             st.rerun()
 
 
-# ======= CSS =======
-def inject_hybrid_css():
-    """เพิ่ม CSS (V3.7)
-    - Updated .code-preview-container
-    - Removed custom green button override
-    """
-    st.markdown("""
-    <style>
-
-        /* --- 1. Live Code Preview --- */
-        .code-preview-container {
-            max-height: 800px; /* (V3.7) Increased height */
-            overflow-y: auto;
-            border: 1px solid #30363d;
-            border-radius: 8px;
-            margin-bottom: 1rem;
-            background: #0d1117;
-            /* (V3.7) Added sticky position */
-            position: sticky;
-            top: 60px; /* Adjust this value based on your header height */
-        }
-        .code-preview-container .stCodeBlock { height: 100%; margin-bottom: 0; }
-
-        /* --- 2. Dialog Button Left-Align --- */
-        div[data-testid="stDialog"] div[data-testid="stExpander"] div[data-testid="stButton"] > button { justify-content: flex-start !important; text-align: left; padding-left: 1rem; }
-
-        /* --- 3. Top Tabs --- */
-        .stTabs [data-baseweb="tab-list"] { gap: 8px; background: rgba(30, 41, 59, 0.5); padding: 8px; border-radius: 12px; margin-bottom: 1rem; }
-        .stTabs [data-baseweb="tab"] { background: transparent; border-radius: 8px; padding: 10px 18px; font-weight: 600; transition: all 0.3s ease; }
-        .stTabs [data-baseweb="tab"]:hover { background: rgba(88, 166, 255, 0.1); }
-        .stTabs [data-baseweb="tab"][aria-selected="true"] { background: linear-gradient(135deg, rgba(88, 166, 255, 0.2), rgba(88, 166, 255, 0.1)); border-bottom: 3px solid #58a6ff; color: #c9d1d9; }
-
-        /* --- 4. Step Card --- */
-        .step-card {
-            width: 100%;
-            margin-bottom: 0.75rem;
-            position: relative;
-            background: #161b22;
-            border: 1px solid #30363d;
-            border-radius: 8px;
-            transition: all 0.3s ease;
-        }
-        .step-card:hover { border-color: #8b949e; }
-
-        /* Header Container */
-        .step-card > div > div > div > .stColumns {
-            border-bottom: 1px solid #30363d;
-            padding: 0.5rem 0.75rem;
-            align-items: center;
-        }
-        /* Header Content Wrapper */
-        .step-header-content { display: flex; align-items: center; gap: 0.75rem; }
-        /* Inline Step Number */
-        .step-number-inline {
-            font-size: 1.2rem;
-            font-weight: 700;
-            color: #ffffff;
-            background: linear-gradient(135deg, #1f4788 0%, #0d2d5e 100%);
-            border: 1px solid #2d5a9e;
-            border-radius: 8px;
-            padding: 0.4rem 0.6rem;
-            min-width: 37px;
-            height: 37px;
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            line-height: 1;
-            box-shadow: 0 2px 8px rgba(15, 45, 94, 0.4),
-                        0 0 0 1px rgba(45, 90, 158, 0.5),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.1);
-            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.6);
-        }
-        /* Keyword Display */
-        .step-keyword { display: flex; flex-direction: column; justify-content: center; gap: 0rem; }
-        .step-keyword-label { font-size: 0.7rem; font-weight: 600; text-transform: uppercase; color: #8b949e; }
-        .step-keyword-name { font-size: 1.1rem; font-weight: 600; color: #58a6ff; line-height: 1.3; }
-
-
-        /* === REVISED TOOLBAR (IMPROVED) === */
-        /* Wrapper container - compact alignment */
-        .step-card-toolbar-wrapper {
-            display: flex;
-            justify-content: flex-end;
-            align-items: center;
-            gap: 0.2rem !important;
-            padding: 0 !important;
-            margin: 0 !important;
-        }
-
-        /* Hide Column wrapper styling completely */
-        .step-card-toolbar-wrapper > div[data-testid="column"] {
-            padding: 0 !important;
-            margin: 0 !important;
-            background: transparent !important;
-            border: none !important;
-            box-shadow: none !important;
-            min-width: auto !important;
-            width: auto !important;
-            flex: 0 0 auto !important;
-        }
-
-        .step-card-toolbar-wrapper > div[data-testid="column"]:hover {
-            transform: none !important;
-            box-shadow: none !important;
-            background: transparent !important;
-        }
-
-        /* Hide inner div that wraps the button */
-        .step-card-toolbar-wrapper div[data-testid="column"] > div {
-            padding: 0 !important;
-            margin: 0 !important;
-            width: 20px !important;
-            height: 20px !important;
-        }
-
-        /* Button styling - clean and minimal */
-        .step-card-toolbar-wrapper .stButton {
-            width: 20px !important;
-            height: 20px !important;
-            margin: 0 !important;
-            padding: 0 !important;
-        }
-
-        .step-card-toolbar-wrapper .stButton button {
-            width: 20px !important;
-            height: 20px !important;
-            min-width: 20px !important;
-            min-height: 20px !important;
-            padding: 0 !important;
-            margin: 0 !important;
-            font-size: 0.8rem !important;
-            line-height: 1 !important;
-            border-radius: 5px !important;
-            background: transparent !important;
-            border: 1px solid transparent !important;
-            box-shadow: none !important;
-            display: flex !important;
-            justify-content: center !important;
-            align-items: center !important;
-            overflow: hidden;
-            color: var(--text-tertiary) !important;
-            transition: all 0.15s ease !important;
-        }
-
-        /* Hover effects */
-        .step-card-toolbar-wrapper .stButton button:hover {
-            background: var(--bg-subtle) !important;
-            border-color: var(--border-default) !important;
-            color: var(--text-primary) !important;
-            transform: scale(1.08);
-            box-shadow: var(--shadow-sm) !important;
-        }
-
-        /* Active state */
-        .step-card-toolbar-wrapper .stButton button:active {
-            transform: scale(0.95);
-            filter: brightness(0.9);
-        }
-
-        /* Icon sizing */
-        .step-card-toolbar-wrapper .stButton button i,
-        .step-card-toolbar-wrapper .stButton button svg {
-            font-size: inherit !important;
-            width: 1em;
-            height: 1em;
-        }
-        /* === END REVISED TOOLBAR === */
-
-
-        /* Caption (Argument) Styling */
-
-        /* Caption (Argument) Styling */
-        .step-card .stCaption { 
-            padding: 0.1rem 1rem 0.6rem 1rem; 
-            color: #58a6ff !important;; /* เปลี่ยนเป็นสีฟ้าเหมือน keyword */
-            font-size: 0.8rem; 
-            font-family: 'SF Mono', 'Monaco', 'Courier New', monospace; 
-            line-height: 1.4; 
-            margin-top: -0.2rem; 
-            display: block; 
-            width: 100%; 
-            word-wrap: break-word; 
-            white-space: normal; /* แสดงหลายบรรทัดได้ */
-            overflow-wrap: break-word; /* แบ่งคำยาวๆ */
-        }
-
-        /* --- NEW: Inline Edit Section Styling --- */
-        .crud-edit-section {
-            padding: 1rem 1.25rem;
-            background: rgba(30, 41, 59, 0.3); /* Slightly different background */
-            border-top: 1px solid #30363d;
-            border-radius: 0 0 7px 7px; /* Match card rounding */
-        }
-        .crud-edit-section h5 { /* Style the 'Edit Step' title */
-            margin-top: 0;
-            margin-bottom: 1rem;
-            color: #c9d1d9;
-        }
-        .crud-edit-section .stSelectbox, .crud-edit-section .stTextInput {
-            margin-bottom: 0.75rem; /* Space between inputs */
-        }
-
-        /* --- Existing Styles --- */
-        button[kind="secondary"] { background: #21262d; border: 1px solid #30363d; }
-        button[kind="secondary"]:hover { background: #30363d; border-color: #8b949e; }
-        h4, h3 { color: #58a6ff; border-bottom: 2px solid #30363d; padding-bottom: 0.5rem; margin-bottom: 1rem; }
-        .stMetric { background: #161b22; padding: 0.75rem; border-radius: 8px; border: 1px solid #30363d; }
-        .stAlert { border-radius: 8px; border-left: 4px solid; }
-    </style>
-    """, unsafe_allow_html=True)
-
 def _save_current_tab_state():
     """บันทึก tab และ sub-section state ปัจจุบัน"""
     # บันทึก sub-sections ทุก phase
@@ -6,180 +6,12 @@ FIXED VERSION: ลบ Magic Trick ออกหมด, ใช้ Stable Key + Sim
 import streamlit as st
 import uuid
 import streamlit.components.v1 as components
-from .ui_common import ARGUMENT_PRESETS, ARGUMENT_PATTERNS
+from .ui_common import get_preset_registry
+from .styles import inject_styles
 
 # *** ลบ import ทั้งหมดที่ทำให้เกิด circular dependency ออก ***
 # *** จะ import ภายในฟังก์ชันแทน ***
 
-# --- Enhanced CSS for Better Visual Design ---
-def inject_add_dialog_css():
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-        
-        .stApp { 
-            font-family: 'Inter', sans-serif; 
-        }
-        
-        /* ✅ FIX: เร่ง Dialog Animation */
-        div[data-testid="stDialog"] {
-            animation: fadeIn 0.15s ease-in !important;  /* เร็วขึ้นจาก 0.3s */
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: scale(0.98); }
-            to { opacity: 1; transform: scale(1); }
-        }
-        
-        /* Dialog container adjustments */
-        div[data-testid="stDialog"] > div > div[data-testid="stVerticalBlock"] > div:first-child {
-            padding-top: 0.5rem !important;
-        }
-        
-        /* ✅ FIX: ลด blur effect เพื่อความเร็ว */
-        div[data-testid="stDialog"] > div {
-            background-color: rgba(15, 23, 42, 0.40) !important;  /* สีน้ำเงินเข้ม + โปร่ง */
-            backdrop-filter: blur(8px) saturate(1.2) !important;  /* Blur + เพิ่มสีสัน */
-            border: 1px solid rgba(255, 255, 255, 0.1) !important; /* ขอบโปร่งใส */
-            transition: opacity 0.1s ease-in !important;  /* เร็วขึ้น */
-        }
-        
-        /* Back button styling */
-        .back-button-container {
-            margin-bottom: 1rem;
-        }
-        
-        /* Column layout improvements with clear borders and depth */
-        .keyword-column {
-            background: linear-gradient(145deg, #2d333b, #22272e);
-            border: 1px solid #444c56;
-            border-left: 3px solid #539bf5;
-            border-radius: 8px;
-            padding: 1.5rem;
-            height: 70vh;
-            overflow-y: auto;
-            box-shadow: 
-                0 0 0 1px rgba(110, 118, 129, 0.4),
-                0 8px 24px rgba(0, 0, 0, 0.4),
-                inset 0 1px 0 rgba(255, 255, 255, 0.05);
-            position: relative;
-            /* ✅ เพิ่ม GPU acceleration */
-            will-change: transform;
-            transform: translateZ(0);
-        }
-        
-        .keyword-column::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 1px;
-            background: linear-gradient(90deg, transparent, rgba(83, 155, 245, 0.3), transparent);
-        }
-        
-        .config-column {
-            background: linear-gradient(145deg, #2d333b, #22272e);
-            border: 1px solid #444c56;
-            border-left: 3px solid #768390;
-            border-radius: 8px;
-            padding: 1.5rem 2rem;
-            height: 70vh;
-            overflow-y: auto;
-            box-shadow: 
-                0 0 0 1px rgba(110, 118, 129, 0.4),
-                0 8px 24px rgba(0, 0, 0, 0.4),
-                inset 0 1px 0 rgba(255, 255, 255, 0.05);
-            position: relative;
-            /* ✅ เพิ่ม GPU acceleration */
-            will-change: transform;
-            transform: translateZ(0);
-        }
-        
-        .config-column::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 1px;
-            background: linear-gradient(90deg, transparent, rgba(118, 131, 144, 0.3), transparent);
-        }
-        
-        /* ✅ ปรับ Search box ให้ render เร็วขึ้น */
-        div[data-testid="stDialog"] .stTextInput > div > div > input {
-            background-color: #2d333b !important;
-            border: 1px solid #444c56 !important;
-            border-radius: 6px !important;
-            padding: 0.65rem 1rem !important;
-            font-size: 0.95rem !important;
-            color: #adbac7 !important;
-            transition: border-color 0.15s ease-in !important;  /* ลด transition time */
-        }
-        
-        div[data-testid="stDialog"] .stTextInput > div > div > input:focus {
-            border-color: #539bf5 !important;
-            box-shadow: 0 0 0 2px rgba(83, 155, 245, 0.15) !important;  /* ลด shadow */
-            background-color: #22272e !important;
-        }
-        
-        div[data-testid="stDialog"] .stTextInput > div > div > input::placeholder {
-            color: #768390 !important;
-        }
-        
-        /* ✅ ปรับ Expander ให้ render เร็วขึ้น */
-        div[data-testid="stDialog"] [data-testid="stExpander"] {
-            background-color: transparent !important;
-            border: none !important;
-            margin-bottom: 8px !important;
-        }
-        
-        div[data-testid="stDialog"] [data-testid="stExpander"] > div:first-child {
-            background-color: #2d333b !important;
-            border: 1px solid #444c56 !important;
-            border-radius: 6px !important;
-            padding: 0.7rem 1rem !important;
-            transition: background-color 0.15s ease-in !important;  /* ลด transition */
-            color: #adbac7 !important;
-        }
-        
-        div[data-testid="stDialog"] [data-testid="stExpander"] > div:first-child:hover {
-            background-color: #373e47 !important;
-            border-color: #539bf5 !important;
-        }
-        
-        /* ✅ ปรับ Button animation ให้เร็วขึ้น */
-        div[data-testid="stDialog"] div[data-testid="stButton"] > button[kind="secondary"] {
-            display: flex;
-            align-items: center;
-            justify-content: flex-start;
-            width: 100%;
-            padding: 0.7rem 1rem;
-            border-radius: 6px;
-            border: 1px solid #444c56;
-            background-color: #2d333b;
-            color: #adbac7;
-            font-weight: 500;
-            font-size: 0.92rem;
-            text-align: left;
-            transition: all 0.1s ease-in !important;  /* ลดจาก 0.2s */
-        }
-        
-        div[data-testid="stDialog"] div[data-testid="stButton"] > button[kind="secondary"]:hover {
-            border-color: #539bf5;
-            background-color: #373e47;
-            color: #cdd9e5;
-            transform: translateX(2px);  /* ลดจาก 4px */
-        }
-        
-        /* ✅ ซ่อน animation ที่ไม่จำเป็น */
-        * {
-            -webkit-tap-highlight-color: transparent;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
-
 # --- Helper Function for Rendering Keyword Row ---
 def _render_keyword_row(kw, key_prefix, selected_kw_state_key, recently_used_list, add_step_callback, context, ws_state, dialog_state_key, keyword_filter_func=None):
     if keyword_filter_func and not keyword_filter_func(kw): 
@@ -230,13 +62,13 @@ def render_add_step_dialog_base(
 ):
     """Renders the improved dialog for adding steps - FIXED VERSION (No Magic Tricks)"""
     # Import functions here to avoid circular import
-    from .test_flow_manager import categorize_keywords
+    from .keyword_categorizer import get_keyword_library, CONTROL_FLOW_KEYWORDS
     from .ui_common import (
         render_argument_input,
         render_verify_table_arguments_for_dialog
     )
     
-    inject_add_dialog_css()
+    inject_styles('add_dialog')
 
     # --- Get Context and State ---
     context = st.session_state.get(context_state_key, {})
@@ -246,30 +78,11 @@ def render_add_step_dialog_base(
     elif isinstance(context, str):
         section_name = context.upper().replace('_', ' ')
 
-    all_keywords_list = ws_state.get('keywords', [])
-    if all_keywords_list and 'categorized_keywords' not in ws_state:
-        ws_state['categorized_keywords'] = categorize_keywords(all_keywords_list)
-   
-    # --- START: Manually inject Control Flow Keywords ---
-    # (This ensures they *always* exist for any dialog that uses this base)
-    categorized_keywords = ws_state.get('categorized_keywords', {}) # <-- นี่คือบรรทัดที่ 1 ที่มาแทนที่
-    
-    control_flow_kws = [
-        {'name': 'IF Condition', 'args': [{'name': '${condition}', 'default': ''}], 'doc': 'Starts a conditional block.'},
-        {'name': 'ELSE IF Condition', 'args': [{'name': '${condition}', 'default': ''}], 'doc': 'Starts an else-if block.'},
-        {'name': 'ELSE', 'args': [], 'doc': 'Starts an else block.'},
-        {'name': 'END', 'args': [], 'doc': 'Ends a conditional block.'}
-    ]
-    
-    # Add them to the dictionary under a new category
-    categorized_keywords['Control Flow'] = control_flow_kws
-    
-    # We also need to update the keyword_map so they can be "selected"
-    keyword_map = {kw['name']: kw for kw in all_keywords_list} # <-- นี่คือบรรทัดที่ 2 ที่มาแทนที่
-    for kw in control_flow_kws:
-        if kw['name'] not in keyword_map:
-            keyword_map[kw['name']] = kw
-    # --- END: Manually inject Control Flow Keywords ---
+    # Shared, read-only views of the keyword library (recomputed only when its version changes).
+    # The categorized view always includes the Control Flow keywords.
+    keyword_library = get_keyword_library(ws_state)
+    search_index = keyword_library.search_index
+    categorized_keywords = keyword_library.categorized_with_control_flow
     
     if selected_kw_state_key not in st.session_state: 
         st.session_state[selected_kw_state_key] = None
@@ -352,11 +165,30 @@ def render_add_step_dialog_base(
             except ImportError:
                 sorted_items = categorized_keywords.items()
 
+            # Ranked matches from the prebuilt index (keyword id -> rank)
+            match_rank = None
+            if search_query:
+                match_rank = {id(kw): rank for rank, kw in enumerate(search_index.search(search_query, limit=None))}
+                for kw in CONTROL_FLOW_KEYWORDS:
+                    name_lower = kw['name'].lower()
+                    if name_lower.startswith(search_query):
+                        match_rank[id(kw)] = -1
+                    elif search_query in name_lower:
+                        match_rank[id(kw)] = len(match_rank)
+                # Categories holding the best matches come first
+                best_rank = {
+                    category: min((match_rank[id(kw)] for kw in keywords if id(kw) in match_rank), default=len(match_rank))
+                    for category, keywords in categorized_keywords.items()
+                }
+                sorted_items = sorted(sorted_items, key=lambda item: best_rank[item[0]])
+
             for category, keywords in sorted_items:
                 filtered_kws = [
                     kw for kw in keywords
-                    if (not keyword_filter_func or keyword_filter_func(kw)) and search_query in kw['name'].lower()
+                    if (not keyword_filter_func or keyword_filter_func(kw)) and (match_rank is None or id(kw) in match_rank)
                 ]
+                if match_rank is not None:
+                    filtered_kws.sort(key=lambda kw: match_rank[id(kw)])
                 
                 if filtered_kws:
                     filtered_count_total += len(filtered_kws)
@@ -471,7 +303,7 @@ def render_add_step_dialog_base(
                             for arg_item in selected_kw.get('args', []):
                                 arg_name = arg_item.get('name', '').strip('${}')
                                 is_locator = any(s in arg_name.lower() for s in ['locator', 'field', 'button', 'element', 'menu'])
-                                is_preset = arg_name in ARGUMENT_PRESETS
+                                is_preset = get_preset_registry().is_preset(arg_name)
                                 if not is_locator and not is_preset:
                                     text_args.append(arg_name)
                             
@@ -602,8 +434,8 @@ def render_add_step_dialog_base(
 
                             # 2. PRESETS (เช่น button_name, status)
                             # ✅ สำคัญ: ต้องเช็ค Preset ก่อน Locator
-                            elif clean_arg_name in ARGUMENT_PRESETS:
-                                config = ARGUMENT_PRESETS[clean_arg_name]
+                            elif get_preset_registry().is_preset(clean_arg_name):
+                                config = get_preset_registry().preset(clean_arg_name)
                                 input_type = config.get('type')
                                 if input_type == "select_or_input":
                                     selected = st.session_state.get(f"{unique_key}_select")
@@ -621,19 +453,14 @@ def render_add_step_dialog_base(
                                 final_value = st.session_state.get(f"{unique_key}_locator_select")
 
                             # 4. PATTERNS (เช่น timeout, password)
+                            elif get_preset_registry().resolve(clean_arg_name) is not None:
+                                # Pattern ใช้ key หลัก
+                                final_value = st.session_state.get(unique_key)
+
+                            # 5. DEFAULT
                             else:
-                                matched_pattern = False
-                                for pattern_key in ARGUMENT_PATTERNS.keys():
-                                    if pattern_key in arg_lower:
-                                        # Pattern ใช้ key หลัก
-                                        final_value = st.session_state.get(unique_key)
-                                        matched_pattern = True
-                                        break
-                                
-                                # 5. DEFAULT
-                                if not matched_pattern:
-                                    # Default ใช้ _default_text
-                                    final_value = st.session_state.get(f"{unique_key}_default_text")
+                                # Default ใช้ _default_text
+                                final_value = st.session_state.get(f"{unique_key}_default_text")
 
                             # Fallback
                             if final_value is None:
@@ -5,10 +5,11 @@ Handles all file operations: scanning, reading, writing Robot Framework files
 import os
 import re
 import streamlit as st
-import pandas as pd
 from datetime import datetime 
 from .utils import parse_robot_variables, parse_data_sources
+from .profiler import profiled
 
+@profiled()
 def scan_robot_project(path):
     """Scan Robot Framework project structure"""
     if not path or not os.path.exists(path):
@@ -57,8 +58,43 @@ def scan_robot_project(path):
 
     return structure
 
+@profiled()
+def parse_keyword_files(project_path, rel_paths, max_workers=8):
+    """
+    Reads and parses Robot files concurrently on a thread pool.
+
+    Yields:
+        tuple: (rel_path, parsed_keywords, error) in completion order;
+               error is None on success, parsed_keywords is [] on failure.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from .utils import parse_robot_keywords
+
+    def _parse(rel_path):
+        with open(os.path.join(project_path, rel_path), 'r', encoding='utf-8') as f:
+            return parse_robot_keywords(f.read())
+
+    if not rel_paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(rel_paths))) as pool:
+        futures = {pool.submit(_parse, rel_path): rel_path for rel_path in rel_paths}
+        for future in as_completed(futures):
+            rel_path = futures[future]
+            try:
+                yield rel_path, future.result(), None
+            except Exception as e:
+                yield rel_path, [], e
+
 def create_new_robot_file(file_path, content):
     """Create new Robot Framework file with content"""
+    return stream_robot_file(file_path, [content])
+
+def stream_robot_file(file_path, lines):
+    """
+    Create new Robot Framework file by streaming lines from an iterable/generator.
+    Lines are joined with newlines as they are written, so the full script
+    never has to be held in memory.
+    """
     try:
         file_path = os.path.abspath(file_path)
 
@@ -67,7 +103,10 @@ def create_new_robot_file(file_path, content):
             os.makedirs(directory, exist_ok=True)
         
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            for i, line in enumerate(lines):
+                if i:
+                    f.write("\n")
+                f.write(line)
         
         return True
         
@@ -309,6 +348,52 @@ def append_robot_content_intelligently(file_path, variables_code=None, keywords_
         return False, f"An error occurred: {str(e)}"
 
 
+def write_keywords_block(file_path, keywords_code):
+    """
+    Writes many keyword definitions into the *** Keywords *** section with ONE write.
+    - Creates the file (and section) if needed.
+    - Inserts inside the existing generator block, or creates the block once.
+    (Duplicate filtering is done by the caller, see kw_manager.export_all_keywords)
+    """
+    start_marker = "# --- START: Generated by Robot Framework Code Generator ---"
+    end_marker = "# ---  END: Generated by Robot Framework Code Generator  ---"
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    section_name = "*** Keywords ***"
+    code = keywords_code.strip("\n")
+
+    try:
+        if os.path.exists(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        else:
+            content = "*** Settings ***\n# Resource    commonkeywords.resource\n"
+
+        if section_name.lower() not in content.lower():
+            content = content.rstrip("\n") + f"\n\n{section_name}\n"
+
+        section_pattern = re.compile(rf'({re.escape(section_name)}.*?)(?=\n\*\*\*|$)', re.DOTALL | re.IGNORECASE)
+        match = section_pattern.search(content)
+        section_text = match.group(1)
+        end_marker_pos = section_text.rfind(end_marker)
+
+        if end_marker_pos != -1:
+            insertion_point = match.start(1) + end_marker_pos
+            content = f"{content[:insertion_point]}\n{code}\n{content[insertion_point:]}"
+        else:
+            new_block = f"\n{start_marker}\n# Created: {timestamp}\n\n{code}\n{end_marker}\n"
+            insertion_point = match.end(1)
+            content = content[:insertion_point] + new_block + content[insertion_point:]
+
+        directory = os.path.dirname(os.path.abspath(file_path))
+        os.makedirs(directory, exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return True, f"✅ Successfully updated {os.path.basename(file_path)}"
+
+    except Exception as e:
+        return False, f"An error occurred: {str(e)}"
+
+
 def append_to_api_base(file_path, variable_line, keyword_line):
     """
     [FINAL FIX] Prevents nested blocks and duplicate end markers.
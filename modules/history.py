@@ -0,0 +1,153 @@
+# modules/history.py
+"""
+Undo / Redo History
+Operation log for workspace edits. An entry holds only the primitive operations
+of one edit, with references to the steps it touched (never copies of the
+workspace), so memory grows with the number of changed steps and undo/redo
+replay a single entry.
+This module should NOT import streamlit.
+"""
+from collections import deque
+
+DEFAULT_HISTORY_LIMIT = 100
+
+_MISSING = object()
+
+# ===================================================================
+# ===== 1. Primitive Operations
+# ===================================================================
+# ('insert', path, index, item)   insert item into the list at path
+# ('pop',    path, index, item)   remove item from the list at path
+# ('set',    path, key, old, new) set container[key] (old/new may be _MISSING)
+#
+# A path is a tuple of keys from the workspace root. Inside a list a str key
+# selects the item whose 'id' matches, so paths survive reordering.
+
+def resolve_path(root, path):
+    node = root
+    for key in path:
+        if isinstance(node, list) and isinstance(key, str):
+            node = next(item for item in node if item.get('id') == key)
+        else:
+            node = node[key]
+    return node
+
+def insert_op(path, index, item):
+    return ('insert', tuple(path), index, item)
+
+def pop_op(root, path, index):
+    return ('pop', tuple(path), index, resolve_path(root, path)[index])
+
+def set_op(root, path, key, new_value):
+    container = resolve_path(root, path)
+    old_value = container.get(key, _MISSING) if isinstance(container, dict) else container[key]
+    return ('set', tuple(path), key, old_value, new_value)
+
+def move_ops(root, path, index, new_index):
+    """Pop + insert pair that moves one list item."""
+    pop = pop_op(root, path, index)
+    return [pop, insert_op(path, new_index, pop[3])]
+
+def _apply_op(root, op):
+    """Applies one op; returns it as applied (a pop carries the index it actually used)."""
+    kind, path = op[0], op[1]
+    target = resolve_path(root, path)
+    if kind == 'insert':
+        target.insert(op[2], op[3])
+    elif kind == 'pop':
+        index = op[2]
+        if index >= len(target) or target[index] is not op[3]:
+            # The list was edited outside the history; fall back to identity lookup
+            index = next(i for i, item in enumerate(target) if item is op[3])
+        target.pop(index)
+        return ('pop', path, index, op[3])
+    elif kind == 'set':
+        if op[4] is _MISSING:
+            target.pop(op[2], None)
+        else:
+            target[op[2]] = op[4]
+    return op
+
+def _invert_op(op):
+    kind = op[0]
+    if kind == 'insert':
+        return ('pop',) + op[1:]
+    if kind == 'pop':
+        return ('insert',) + op[1:]
+    return ('set', op[1], op[2], op[4], op[3])
+
+# ===================================================================
+# ===== 2. History
+# ===================================================================
+
+class History:
+    """Undo/redo stacks of (label, ops) entries for one workspace."""
+
+    def __init__(self, limit=DEFAULT_HISTORY_LIMIT):
+        self.undo_stack = deque(maxlen=limit)
+        self.redo_stack = []
+
+    def apply(self, root, label, ops):
+        """Applies ops to the workspace and records them as one undoable edit."""
+        ops = tuple(ops)
+        if not ops:
+            return
+        for op in ops:
+            _apply_op(root, op)
+        self.undo_stack.append((label, ops))
+        self.redo_stack.clear()
+
+    def undo(self, root):
+        """Reverts the latest edit; returns its label (None if nothing to undo)."""
+        if not self.undo_stack:
+            return None
+        label, ops = self.undo_stack.pop()
+        if not self._replay(root, [_invert_op(op) for op in reversed(ops)]):
+            return None
+        self.redo_stack.append((label, ops))
+        return label
+
+    def redo(self, root):
+        """Re-applies the latest undone edit; returns its label."""
+        if not self.redo_stack:
+            return None
+        label, ops = self.redo_stack.pop()
+        if not self._replay(root, ops):
+            return None
+        self.undo_stack.append((label, ops))
+        return label
+
+    def _replay(self, root, ops):
+        applied = []
+        try:
+            for op in ops:
+                applied.append(_apply_op(root, op))
+        except (KeyError, IndexError, StopIteration):
+            # The target was removed outside the history: roll back the ops already
+            # applied so the workspace is never left half-reverted, then drop the
+            # entries (older ones cannot be trusted either)
+            for op in reversed(applied):
+                _apply_op(root, _invert_op(op))
+            self.clear()
+            return False
+        return True
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_stack)
+
+    @property
+    def undo_label(self):
+        return self.undo_stack[-1][0] if self.undo_stack else None
+
+    @property
+    def redo_label(self):
+        return self.redo_stack[-1][0] if self.redo_stack else None
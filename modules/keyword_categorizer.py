@@ -3,6 +3,11 @@ modules/keyword_categorizer.py
 Robot Framework Keyword Categorizer Module - Exact Mapping Version
 Version: 2.0 - Using exact keyword name mapping
 """
+import heapq
+import re
+from collections import Counter
+from functools import lru_cache
+from types import MappingProxyType
 
 def get_exact_keyword_mappings():
     """
@@ -111,21 +116,26 @@ def get_exact_keyword_mappings():
     return mappings
 
 
-def categorize_keywords(all_keywords):
-    """
-    Categorizes keywords using exact name matching.
-    ใช้การ match แบบตรงตัวเท่านั้น (case-insensitive)
-    """
+@lru_cache(maxsize=1)
+def _get_category_lookup():
+    """Category order and lowercase name -> category lookup (mappings are static, built once)."""
     mappings = get_exact_keyword_mappings()
-    
-    # สร้าง lookup dictionary สำหรับการค้นหาที่เร็วขึ้น
     keyword_to_category = {}
     for category, keyword_names in mappings.items():
         for kw_name in keyword_names:
             keyword_to_category[kw_name.lower()] = category
+    return tuple(mappings.keys()), keyword_to_category
+
+
+def categorize_keywords(all_keywords):
+    """
+    Categorizes keywords using exact name matching.
+    ใช้การ match แบบตรงตัวเท่านั้น (case-insensitive)
+    """
+    category_order, keyword_to_category = _get_category_lookup()
     
     # Initialize result dictionary
-    categorized = {cat: [] for cat in mappings.keys()}
+    categorized = {cat: [] for cat in category_order}
     categorized["🧩 Others"] = []
     
     # Categorize each keyword
@@ -219,13 +229,194 @@ def get_category_priority(category_name):
 
 def search_keywords_by_name(all_keywords, search_term):
     """
-    Searches keywords by name (case-insensitive).
+    Searches keywords by name, arguments and documentation (case-insensitive, ranked).
     """
     if not search_term:
         return all_keywords
-    
-    search_lower = search_term.lower()
-    return [kw for kw in all_keywords if search_lower in kw['name'].lower()]
+    return get_keyword_search_index(all_keywords).search(search_term, limit=None)
+
+
+# ===================================================================
+# ===== Keyword Search Index
+# ===================================================================
+
+_COMPACT_PATTERN = re.compile(r'[\s_]+')
+SEARCH_RESULT_LIMIT = 100
+_WORD_PREFIX_LENGTH = 3
+_SEARCH_INDEX_CACHE = {}
+_SEARCH_INDEX_CACHE_SIZE = 8
+
+
+def _compact(text):
+    return _COMPACT_PATTERN.sub('', text.lower())
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class KeywordSearchIndex:
+    """
+    Prebuilt search index over a keyword library.
+    Candidates come from posting lists (trigrams of compacted names, argument names
+    and docs; 1-3 character word prefixes) and are ranked:
+    exact > prefix > substring > word prefixes > fuzzy > args > doc.
+    Queries too short for trigrams fall back to a substring scan of the names, so every
+    name containing the query is always a candidate.
+    Name matches are ranked first; the weaker tiers are only looked at when they are
+    needed to fill `limit`.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = keywords
+        self._names = []
+        self._compact_names = []
+        self._name_words = []
+        self._args = []
+        self._docs = []
+        self._grams = {}            # name + argument trigram -> ids (fuzzy matching)
+        self._name_grams = {}       # name trigram -> ids
+        self._arg_grams = {}        # argument-name trigram -> ids
+        self._doc_grams = {}        # doc trigram -> ids
+        self._name_prefixes = {}    # name word prefix -> ids
+        self._arg_prefixes = {}     # argument-name word prefix -> ids
+
+        for i, kw in enumerate(keywords):
+            name = kw.get('name', '').lower()
+            arg_names = " ".join(
+                (arg.get('name', '') if isinstance(arg, dict) else str(arg)).strip('$@&{}').lower()
+                for arg in kw.get('args', []) or []
+            )
+            doc = (kw.get('doc') or '').lower()
+            compact_name = _compact(name)
+            words = name.split()
+            self._names.append(name)
+            self._compact_names.append(compact_name)
+            self._name_words.append(words)
+            self._args.append(arg_names)
+            self._docs.append(doc)
+            name_grams = _trigrams(compact_name)
+            arg_grams = _trigrams(_compact(arg_names))
+            _add_postings(self._name_grams, name_grams, i)
+            _add_postings(self._arg_grams, arg_grams, i)
+            _add_postings(self._grams, name_grams | arg_grams, i)
+            _add_postings(self._doc_grams, _trigrams(_compact(doc)), i)
+            _add_postings(self._name_prefixes, _word_prefixes(words), i)
+            _add_postings(self._arg_prefixes, _word_prefixes(arg_names.replace('_', ' ').split()), i)
+
+    def __len__(self):
+        return len(self.keywords)
+
+    def _score(self, i, query, compact_query, query_words, gram_hits, gram_total):
+        name = self._names[i]
+        if name == query:
+            return 1000
+        if name.startswith(query):
+            return 800
+        position = name.find(query)
+        if position != -1:
+            return 600 - min(position, 100)
+        words = self._name_words[i]
+        if all(any(w.startswith(q) for w in words) for q in query_words):
+            return 500
+        if compact_query in self._compact_names[i]:
+            return 450
+        score = 0
+        if gram_total and gram_hits:
+            score = int(300 * gram_hits / gram_total)
+        if query in self._args[i]:
+            score = max(score, 200)
+        if query in self._docs[i]:
+            score = max(score, 100)
+        return score
+
+    def _rank(self, ids, query, compact_query, query_words, gram_counts, gram_total, limit):
+        scored = []
+        for i in ids:
+            score = self._score(i, query, compact_query, query_words, gram_counts.get(i, 0), gram_total)
+            if score:
+                scored.append((-score, len(self._names[i]), self._names[i], i))
+        return heapq.nsmallest(limit, scored) if limit else sorted(scored)
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        """Returns matching keywords, best match first (at most `limit`; None for all)."""
+        query = (query or '').strip().lower()
+        if not query:
+            return list(self.keywords)
+
+        compact_query = _compact(query)
+        query_words = query.split()
+        query_grams = _trigrams(compact_query)
+        word_keys = {word[:_WORD_PREFIX_LENGTH] for word in query_words}
+        no_hits = {}
+
+        # Tier 1 (score >= 450): names holding every query trigram (a superset of the names
+        # containing the query), or every query word as a word prefix
+        if query_grams:
+            strong = _intersect(self._name_grams, query_grams)
+        else:
+            strong = {i for i, name in enumerate(self._names)
+                      if query in name or (compact_query and compact_query in self._compact_names[i])}
+        strong |= _intersect(self._name_prefixes, word_keys)
+        ranked = self._rank(strong, query, compact_query, query_words, no_hits, len(query_grams), limit)
+        if limit and len(ranked) >= limit:
+            return [self.keywords[entry[3]] for entry in ranked]
+
+        # Tier 2 (score <= 300): fuzzy name/argument trigrams, argument names, docs
+        gram_counts = Counter()
+        if query_grams:
+            for gram in query_grams:
+                gram_counts.update(self._grams.get(gram, ()))
+            # Fuzzy candidates must share at least half of the query trigrams
+            threshold = max(1, (len(query_grams) + 1) // 2)
+            weak = {i for i, hits in gram_counts.items() if hits >= threshold}
+            weak |= _intersect(self._arg_grams, query_grams)
+            weak |= _intersect(self._doc_grams, query_grams)
+        else:
+            # Too short for trigrams: argument-name word prefixes
+            weak = _intersect(self._arg_prefixes, word_keys)
+        # Tier-1 candidates that scored 0 there (scattered trigrams) still get fuzzy-scored
+        weak -= {entry[3] for entry in ranked}
+        remaining = limit - len(ranked) if limit else None
+        ranked += self._rank(weak, query, compact_query, query_words, gram_counts, len(query_grams), remaining)
+        return [self.keywords[entry[3]] for entry in ranked]
+
+
+def _add_postings(postings, keys, i):
+    for key in keys:
+        postings.setdefault(key, set()).add(i)
+
+
+def _word_prefixes(words):
+    return {word[:length] for word in words for length in range(1, _WORD_PREFIX_LENGTH + 1)}
+
+
+def _intersect(postings, keys):
+    """Ids present in the posting sets of every key (smallest set first)."""
+    if not keys:
+        return set()
+    sets = sorted((postings.get(key, ()) for key in keys), key=len)
+    if not sets[0]:
+        return set()
+    return set(sets[0]).intersection(*sets[1:])
+
+
+def get_keyword_search_index(all_keywords):
+    """
+    Returns the cached index for this keyword list.
+    A new index is built only when the library changes (a new list or a different length).
+    """
+    cache_key = (id(all_keywords), len(all_keywords))
+    index = _SEARCH_INDEX_CACHE.get(cache_key)
+    if index is None:
+        # Drop stale entries for the same list before caching the new one
+        for key in [k for k in _SEARCH_INDEX_CACHE if k[0] == cache_key[0]]:
+            del _SEARCH_INDEX_CACHE[key]
+        while len(_SEARCH_INDEX_CACHE) >= _SEARCH_INDEX_CACHE_SIZE:
+            del _SEARCH_INDEX_CACHE[next(iter(_SEARCH_INDEX_CACHE))]
+        index = KeywordSearchIndex(all_keywords)
+        _SEARCH_INDEX_CACHE[cache_key] = index
+    return index
 
 
 def get_keywords_by_category(categorized_keywords, category_name):
@@ -326,3 +517,92 @@ def export_categorization_summary(categorized_keywords, output_file=None):
         return f"Summary exported to: {output_file}"
     else:
         return summary_text
+
+
+# ===================================================================
+# ===== Versioned Keyword Library
+# ===================================================================
+
+CONTROL_FLOW_CATEGORY = "Control Flow"
+CONTROL_FLOW_KEYWORDS = (
+    {'name': 'IF Condition', 'args': [{'name': '${condition}', 'default': ''}], 'doc': 'Starts a conditional block.'},
+    {'name': 'ELSE IF Condition', 'args': [{'name': '${condition}', 'default': ''}], 'doc': 'Starts an else-if block.'},
+    {'name': 'ELSE', 'args': [], 'doc': 'Starts an else block.'},
+    {'name': 'END', 'args': [], 'doc': 'Ends a conditional block.'},
+)
+
+
+class KeywordLibrary:
+    """
+    A keyword list plus a version number.
+    Derived views are computed lazily once per version and returned read-only
+    (mapping proxies over tuples), so dialogs can share them without copying.
+    """
+
+    def __init__(self, keywords=None):
+        self.version = 0
+        self.replace(keywords if keywords is not None else [])
+
+    def replace(self, keywords):
+        """Swaps in a new keyword list and drops every derived view."""
+        self._source = keywords
+        self._source_len = len(keywords)
+        self.keywords = tuple(keywords)
+        self.version += 1
+        self._views = {}
+
+    def is_current(self, keywords):
+        return keywords is self._source and len(keywords) == self._source_len
+
+    def _view(self, name, build):
+        if name not in self._views:
+            self._views[name] = build()
+        return self._views[name]
+
+    @property
+    def categorized(self):
+        return self._view('categorized', lambda: MappingProxyType(
+            {cat: tuple(kws) for cat, kws in categorize_keywords(self.keywords).items()}
+        ))
+
+    @property
+    def categorized_with_control_flow(self):
+        """Categorized view plus the IF/ELSE/END pseudo keywords used by the step dialogs."""
+        return self._view('categorized_with_control_flow', lambda: MappingProxyType(
+            {**self.categorized, CONTROL_FLOW_CATEGORY: CONTROL_FLOW_KEYWORDS}
+        ))
+
+    @property
+    def keyword_map(self):
+        """Name -> keyword, including control flow entries unless the library defines the name."""
+        return self._view('keyword_map', lambda: MappingProxyType(
+            {**{kw['name']: kw for kw in CONTROL_FLOW_KEYWORDS}, **{kw['name']: kw for kw in self.keywords}}
+        ))
+
+    @property
+    def stats(self):
+        return self._view('stats', lambda: MappingProxyType(get_category_stats(self.categorized)))
+
+    @property
+    def search_index(self):
+        return self._view('search_index', lambda: KeywordSearchIndex(self.keywords))
+
+
+_NO_KEYWORDS = ()
+
+
+def get_keyword_library(ws_state):
+    """
+    Returns the workspace's KeywordLibrary, bumping its version when
+    ws_state['keywords'] was replaced or resized since the last call.
+    """
+    keywords = ws_state.get('keywords')
+    if keywords is None:
+        # Shared sentinel: a fresh [] per call would look like a replaced list every time
+        keywords = _NO_KEYWORDS
+    library = ws_state.get('keyword_library')
+    if library is None:
+        library = ws_state['keyword_library'] = KeywordLibrary(keywords)
+    elif not library.is_current(keywords):
+        library.replace(keywords)
+    return library
@@ -0,0 +1,103 @@
+# modules/keyword_registry.py
+"""
+Keyword Registry
+Shared, session-wide registry of the Keyword Factory keywords. Other workspaces
+(e.g. the CRUD Generator) resolve factory keywords through it by id or name
+instead of holding their own list, so a keyword object exists once per session.
+This module should NOT import streamlit.
+"""
+from types import MappingProxyType
+
+
+class KeywordRegistry:
+    """
+    Registry over the Keyword Factory keyword list (held by reference).
+
+    version is bumped on every Keyword Factory edit; the id/name lookups are
+    rebuilt lazily, at most once per version. Consumers retain() the registry
+    so it knows which workspaces reference which keyword ids.
+    """
+
+    def __init__(self):
+        self._source = []
+        self.version = 0
+        self._maps_key = None
+        self._by_id = MappingProxyType({})
+        self._by_name = MappingProxyType({})
+        self._holders = {}      # holder -> set of keyword ids
+        self._ref_counts = {}   # keyword id -> number of holders
+
+    # --- Source ---
+    def publish(self, keywords):
+        """Points the registry at the live keyword list; only bumps when it is a new list."""
+        if keywords is not self._source:
+            self._source = keywords
+            self.bump()
+
+    def bump(self):
+        self.version += 1
+
+    def keywords(self):
+        """The shared keyword list (read-only by convention)."""
+        return self._source
+
+    def __len__(self):
+        return len(self._source)
+
+    # --- Lookups ---
+    def _ensure_maps(self):
+        # Bulk imports append without an edit, so the length is part of the key
+        key = (self.version, len(self._source))
+        if self._maps_key != key:
+            self._by_id = MappingProxyType({kw['id']: kw for kw in self._source if kw.get('id')})
+            self._by_name = MappingProxyType({kw['name']: kw for kw in self._source if kw.get('name')})
+            self._maps_key = key
+
+    def get(self, keyword_id):
+        self._ensure_maps()
+        return self._by_id.get(keyword_id)
+
+    def find_by_name(self, name):
+        self._ensure_maps()
+        return self._by_name.get(name)
+
+    def name_map(self):
+        """Read-only name -> keyword view (shared until the next version)."""
+        self._ensure_maps()
+        return self._by_name
+
+    def resolve(self, keyword_ids):
+        """Keywords for the given ids, skipping ids that no longer exist."""
+        self._ensure_maps()
+        return [self._by_id[kid] for kid in keyword_ids if kid in self._by_id]
+
+    # --- Reference counting ---
+    def retain(self, holder, keyword_ids):
+        """Sets the keyword ids a holder (e.g. a workspace key) references."""
+        new_ids = set(keyword_ids)
+        old_ids = self._holders.get(holder, set())
+        for kid in new_ids - old_ids:
+            self._ref_counts[kid] = self._ref_counts.get(kid, 0) + 1
+        for kid in old_ids - new_ids:
+            self._release_id(kid)
+        if new_ids:
+            self._holders[holder] = new_ids
+        else:
+            self._holders.pop(holder, None)
+
+    def release(self, holder):
+        for kid in self._holders.pop(holder, ()):
+            self._release_id(kid)
+
+    def _release_id(self, keyword_id):
+        count = self._ref_counts.get(keyword_id, 0) - 1
+        if count > 0:
+            self._ref_counts[keyword_id] = count
+        else:
+            self._ref_counts.pop(keyword_id, None)
+
+    def ref_count(self, keyword_id):
+        return self._ref_counts.get(keyword_id, 0)
+
+    def holders_of(self, keyword_id):
+        return [holder for holder, ids in self._holders.items() if keyword_id in ids]
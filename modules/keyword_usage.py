@@ -0,0 +1,477 @@
+# modules/keyword_usage.py
+"""
+Keyword Usage Analyzer
+Indexes every keyword call site in a Robot Framework project and builds a call graph
+(unused keywords, keywords unreachable from testsuite/, hot keywords).
+utils.parse_robot_keywords only reads definitions (name, args, doc) without line
+numbers, so call sites and test cases are tokenized here.
+This module should NOT import streamlit.
+"""
+import os
+import re
+from collections import Counter, deque
+from .utils import normalize_keyword_name
+from .profiler import profiled
+
+# ===================================================================
+# ===== 1. Robot Statement Tokenizing
+# ===================================================================
+
+SECTION_PATTERN = re.compile(r'^\*+\s*([^*]+?)\s*\*+\s*$')
+CELL_SEPARATOR = re.compile(r'\s{2,}|\t')
+ASSIGNMENT_PATTERN = re.compile(r'^[$@&]\{[^}]+\}(\[[^\]]*\])*\s*=?$')
+VARIABLE_ONLY_PATTERN = re.compile(r'^[$@&%]\{[^}]+\}$')
+
+CONTROL_WORDS = {'FOR', 'END', 'IF', 'ELSE IF', 'ELSE', 'WHILE', 'TRY', 'EXCEPT',
+                 'FINALLY', 'RETURN', 'BREAK', 'CONTINUE', 'VAR', 'IN', 'IN RANGE'}
+SETTING_CALLS = {'suite setup', 'suite teardown', 'test setup', 'test teardown',
+                 'task setup', 'task teardown', 'test template', 'task template'}
+BODY_SETTING_CALLS = {'[setup]', '[teardown]', '[template]'}
+BDD_PREFIXES = ('given ', 'when ', 'then ', 'and ', 'but ')
+
+# BuiltIn keywords that take another keyword as an argument -> index of that argument
+RUN_KEYWORD_ARG_INDEX = {
+    'runkeyword': 0,
+    'runkeywordandreturn': 0,
+    'runkeywordandreturnstatus': 0,
+    'runkeywordandignoreerror': 0,
+    'runkeywordandcontinueonfailure': 0,
+    'runkeywordandwarnonfailure': 0,
+    'runkeywordandexpecterror': 1,
+    'runkeywordandreturnif': 1,
+    'runkeywordif': 1,
+    'runkeywordunless': 1,
+    'runkeywordiftestfailed': 0,
+    'runkeywordiftestpassed': 0,
+    'runkeywordiftimeoutoccurred': 0,
+    'runkeywordifalltestspassed': 0,
+    'runkeywordifanytestsfailed': 0,
+    'runkeywordifallcriticaltestspassed': 0,
+    'runkeywordifanycriticaltestsfailed': 0,
+    'repeatkeyword': 1,
+    'waituntilkeywordsucceeds': 2,
+}
+
+# Keyword Factory pseudo-steps that are rendered as control structures
+FACTORY_CONTROL_KEYWORDS = {'IF Condition', 'ELSE IF Condition', 'ELSE', 'END'}
+
+def split_robot_cells(line):
+    """Splits a space separated Robot line into its non-empty cells."""
+    return [c for c in CELL_SEPARATOR.split(line.strip()) if c]
+
+def expand_keyword_calls(cells):
+    """
+    Returns the keyword names called by a statement whose first cell is a keyword,
+    following BuiltIn 'Run Keyword ...' variants into their keyword arguments.
+    """
+    if not cells:
+        return []
+    name = cells[0]
+    if VARIABLE_ONLY_PATTERN.match(name):
+        return []
+
+    calls = [name]
+    normalized = normalize_keyword_name(name)
+    rest = cells[1:]
+
+    if normalized == 'runkeywords':
+        if 'AND' in rest:
+            group = []
+            for cell in rest + ['AND']:
+                if cell == 'AND':
+                    calls.extend(expand_keyword_calls(group))
+                    group = []
+                else:
+                    group.append(cell)
+        else:
+            for cell in rest:
+                calls.extend(expand_keyword_calls([cell]))
+        return calls
+
+    arg_index = RUN_KEYWORD_ARG_INDEX.get(normalized)
+    if arg_index is None or len(rest) <= arg_index:
+        return calls
+
+    nested = rest[arg_index:]
+    if normalized in ('runkeywordif', 'runkeywordunless'):
+        # Run Keyword If    cond    Kw    args    ELSE IF    cond    Kw    ELSE    Kw
+        for branch in _split_else_branches(nested):
+            calls.extend(expand_keyword_calls(branch))
+    else:
+        calls.extend(expand_keyword_calls(nested))
+    return calls
+
+def _split_else_branches(cells):
+    """Splits 'Kw  args  ELSE IF  cond  Kw  ELSE  Kw' (first condition already removed) into branches."""
+    branch, branches = [], []
+    i = 0
+    while i < len(cells):
+        if cells[i] == 'ELSE IF' and i + 1 < len(cells):
+            branches.append(branch)
+            branch = []
+            i += 2
+            continue
+        if cells[i] == 'ELSE':
+            branches.append(branch)
+            branch = []
+            i += 1
+            continue
+        branch.append(cells[i])
+        i += 1
+    branches.append(branch)
+    return branches
+
+def _statement_calls(cells):
+    """Keyword calls made by one body statement (test case or keyword body)."""
+    if not cells or cells[0].startswith('#'):
+        return []
+    first = cells[0]
+    if first.lower() in BODY_SETTING_CALLS:
+        if first.lower() == '[template]':
+            return cells[1:2]
+        return expand_keyword_calls(cells[1:])
+    if first.startswith('['):
+        return []
+    while cells and ASSIGNMENT_PATTERN.match(cells[0]):
+        cells = cells[1:]
+    if len(cells) > 2 and cells[0] == 'IF':
+        # Inline IF (RF 5+):  [${x} =]    IF    cond    Kw    args    ELSE IF    cond    Kw    ELSE    Kw
+        calls = []
+        for branch in _split_else_branches(cells[2:]):
+            calls.extend(_statement_calls(branch))
+        return calls
+    if not cells or cells[0] in CONTROL_WORDS:
+        return []
+    return expand_keyword_calls(cells)
+
+def parse_robot_usage(file_content):
+    """
+    Tokenizes one Robot file into keyword definitions, test cases and call sites.
+
+    Returns:
+        dict: {
+            'definitions': [{'name', 'line'}],
+            'tests': [{'name', 'line'}],
+            'calls': [{'caller', 'caller_type', 'callee', 'line'}]
+        }
+        caller_type is 'keyword', 'test' or 'settings' (caller is None for settings).
+    """
+    usage = {'definitions': [], 'tests': [], 'calls': []}
+    section = None
+    caller, caller_type = None, None
+    # Continuation lines ('...') extend the statement that precedes them
+    pending_cells, pending_line = [], 0
+    # With a template, test bodies are data rows rather than keyword calls
+    templates = {'suite': False, 'test': False}
+
+    def _flush():
+        if not pending_cells:
+            return
+        setting = pending_cells[0].lower()
+        if section == 'settings':
+            if setting in SETTING_CALLS:
+                is_template = 'template' in setting
+                if is_template:
+                    templates['suite'] = len(pending_cells) > 1 and pending_cells[1].upper() != 'NONE'
+                names = pending_cells[1:2] if is_template else expand_keyword_calls(pending_cells[1:])
+                for callee in names:
+                    if VARIABLE_ONLY_PATTERN.match(callee) or callee.upper() == 'NONE':
+                        continue
+                    usage['calls'].append({'caller': None, 'caller_type': 'settings', 'callee': callee, 'line': pending_line})
+            return
+        if caller is None:
+            return
+        if caller_type == 'test':
+            if setting == '[template]':
+                templates['test'] = len(pending_cells) > 1 and pending_cells[1].upper() != 'NONE'
+                if not templates['test']:
+                    return
+            elif templates['test'] and setting not in BODY_SETTING_CALLS:
+                return
+        for callee in _statement_calls(pending_cells):
+            if VARIABLE_ONLY_PATTERN.match(callee) or callee.upper() == 'NONE':
+                continue
+            usage['calls'].append({'caller': caller, 'caller_type': caller_type, 'callee': callee, 'line': pending_line})
+
+    for line_no, raw_line in enumerate(file_content.splitlines(), start=1):
+        if not raw_line.strip():
+            continue
+
+        section_match = SECTION_PATTERN.match(raw_line.strip()) if raw_line.startswith('*') else None
+        if section_match:
+            _flush()
+            pending_cells = []
+            header = section_match.group(1).lower()
+            if header.startswith('setting'):
+                section = 'settings'
+            elif header.startswith(('test case', 'task')):
+                section = 'tests'
+            elif header.startswith('keyword'):
+                section = 'keywords'
+            else:
+                section = None
+            caller, caller_type = None, None
+            continue
+
+        if section is None:
+            continue
+
+        cells = split_robot_cells(raw_line)
+        if not cells:
+            continue
+        if cells[0] == '...':
+            pending_cells.extend(cells[1:])
+            continue
+
+        _flush()
+        pending_cells, pending_line = [], line_no
+
+        if section == 'settings':
+            pending_cells = cells
+            continue
+
+        if not raw_line[0].isspace():
+            name = cells[0]
+            if name.startswith('#'):
+                continue
+            caller = name
+            if section == 'keywords':
+                caller_type = 'keyword'
+                usage['definitions'].append({'name': name, 'line': line_no})
+            else:
+                caller_type = 'test'
+                templates['test'] = templates['suite']
+                usage['tests'].append({'name': name, 'line': line_no})
+            # A test/keyword may start its body on the same line
+            pending_cells = cells[1:]
+            continue
+
+        pending_cells = cells
+
+    _flush()
+    return usage
+
+def factory_keywords_usage(keywords):
+    """Builds the same usage structure from Keyword Factory keywords (session state)."""
+    usage = {'definitions': [], 'tests': [], 'calls': []}
+    for kw in keywords or []:
+        name = kw.get('name')
+        if not name:
+            continue
+        usage['definitions'].append({'name': name, 'line': None})
+        for step in kw.get('steps', []):
+            callee = step.get('keyword', '')
+            if not callee or callee in FACTORY_CONTROL_KEYWORDS or callee.startswith('FOR'):
+                continue
+            usage['calls'].append({'caller': name, 'caller_type': 'keyword', 'callee': callee, 'line': None})
+    return usage
+
+# ===================================================================
+# ===== 2. Incremental Project Index
+# ===================================================================
+
+FACTORY_SOURCE = '<Keyword Factory>'
+ENTRY_FOLDER = 'testsuite/'
+
+class KeywordUsageIndex:
+    """
+    Call-site index over a project. Files are re-parsed only when their
+    mtime/size change; the call graph is rebuilt lazily after any change.
+    Keywords are identified by their normalized name, so a keyword defined in
+    several files is treated as one node.
+    """
+
+    def __init__(self):
+        self.project_path = None
+        self.sources = {}       # source -> {'fingerprint', 'usage'}
+        self._graph = None
+
+    # --- Source updates ---
+
+    @profiled()
+    def refresh(self, project_path, rel_paths):
+        """
+        Syncs the index with the given project files.
+
+        Returns:
+            tuple: (parsed_paths, removed_paths, errors)
+        """
+        if project_path != self.project_path:
+            self.project_path = project_path
+            self.sources = {k: v for k, v in self.sources.items() if k == FACTORY_SOURCE}
+            self._graph = None
+
+        wanted = {p.replace(os.sep, '/') for p in rel_paths}
+        removed = [p for p in self.sources if p != FACTORY_SOURCE and p not in wanted]
+        for rel_path in removed:
+            del self.sources[rel_path]
+
+        parsed, errors = [], []
+        for rel_path in sorted(wanted):
+            full_path = os.path.join(project_path, rel_path)
+            try:
+                stat = os.stat(full_path)
+                fingerprint = (stat.st_mtime_ns, stat.st_size)
+                entry = self.sources.get(rel_path)
+                if entry and entry['fingerprint'] == fingerprint:
+                    continue
+                with open(full_path, 'r', encoding='utf-8') as f:
+                    usage = parse_robot_usage(f.read())
+            except (OSError, UnicodeDecodeError) as e:
+                errors.append((rel_path, str(e)))
+                self.sources.pop(rel_path, None)
+                continue
+            self.sources[rel_path] = {'fingerprint': fingerprint, 'usage': usage}
+            parsed.append(rel_path)
+
+        if parsed or removed or errors:
+            self._graph = None
+        return parsed, removed, errors
+
+    def set_factory_keywords(self, keywords):
+        """Indexes Keyword Factory keywords; returns True if they changed."""
+        usage = factory_keywords_usage(keywords)
+        entry = self.sources.get(FACTORY_SOURCE)
+        if entry and entry['usage'] == usage:
+            return False
+        self.sources[FACTORY_SOURCE] = {'fingerprint': None, 'usage': usage}
+        self._graph = None
+        return True
+
+    # --- Graph ---
+
+    def graph(self):
+        if self._graph is None:
+            self._graph = self._build_graph()
+        return self._graph
+
+    def _build_graph(self):
+        definitions = {}        # key -> {'name', 'source', 'line', 'duplicates'}
+        embedded = []           # (regex, key) for keywords with embedded arguments
+        for source, entry in self.sources.items():
+            for d in entry['usage']['definitions']:
+                key = normalize_keyword_name(d['name'])
+                if key in definitions:
+                    definitions[key]['duplicates'].append(source)
+                    continue
+                definitions[key] = {'name': d['name'], 'source': source, 'line': d['line'], 'duplicates': []}
+                if '${' in d['name']:
+                    pattern = re.sub(r'\\\$\\\{[^}]*\\\}', '.+?', re.escape(d['name']))
+                    embedded.append((re.compile(f'^{pattern}$', re.IGNORECASE), key))
+
+        def _resolve(callee):
+            candidates = [callee]
+            lowered = callee.lower()
+            for prefix in BDD_PREFIXES:
+                if lowered.startswith(prefix):
+                    candidates.append(callee[len(prefix):])
+            if '.' in callee:
+                candidates.append(callee.rsplit('.', 1)[1])
+            for candidate in candidates:
+                key = normalize_keyword_name(candidate)
+                if key in definitions:
+                    return key
+            for candidate in candidates:
+                for regex, key in embedded:
+                    if regex.match(candidate):
+                        return key
+            return None
+
+        resolve_cache = {}
+        edges = {}              # caller key -> Counter(callee key)
+        call_counts = Counter()
+        call_sites = {}         # callee key -> [(source, caller, line)]
+        external = Counter()    # library / unknown keywords by display name
+        entry_points = set()
+
+        for source, entry in self.sources.items():
+            in_suite = source.startswith(ENTRY_FOLDER)
+            for call in entry['usage']['calls']:
+                callee = call['callee']
+                if callee not in resolve_cache:
+                    resolve_cache[callee] = _resolve(callee)
+                key = resolve_cache[callee]
+                if key is None:
+                    external[callee] += 1
+                    continue
+                call_counts[key] += 1
+                call_sites.setdefault(key, []).append((source, call['caller'], call['line']))
+                if call['caller_type'] == 'keyword':
+                    caller_key = normalize_keyword_name(call['caller'])
+                    edges.setdefault(caller_key, Counter())[key] += 1
+                elif in_suite:
+                    entry_points.add(key)
+
+        # Everything reachable from test cases / suite settings in testsuite/
+        reachable = set()
+        queue = deque(entry_points)
+        while queue:
+            key = queue.popleft()
+            if key in reachable:
+                continue
+            reachable.add(key)
+            queue.extend(k for k in edges.get(key, ()) if k not in reachable)
+
+        test_count = sum(len(e['usage']['tests']) for s, e in self.sources.items() if s.startswith(ENTRY_FOLDER))
+        return {
+            'definitions': definitions, 'edges': edges, 'call_counts': call_counts,
+            'call_sites': call_sites, 'external': external, 'reachable': reachable,
+            'test_count': test_count,
+        }
+
+    # --- Reports ---
+
+    def _keyword_row(self, key, graph):
+        d = graph['definitions'][key]
+        return {
+            'name': d['name'], 'source': d['source'], 'line': d['line'],
+            'calls': graph['call_counts'].get(key, 0),
+            'callers': len({site[1] for site in graph['call_sites'].get(key, [])}),
+            'reachable': key in graph['reachable'],
+        }
+
+    def unused_keywords(self):
+        """Keywords that are defined but never called anywhere."""
+        graph = self.graph()
+        return sorted(
+            (self._keyword_row(key, graph) for key in graph['definitions'] if not graph['call_counts'].get(key)),
+            key=lambda r: (r['source'], r['name'].lower())
+        )
+
+    def dead_keywords(self):
+        """Keywords that no test in testsuite/ can reach (includes unused ones)."""
+        graph = self.graph()
+        return sorted(
+            (self._keyword_row(key, graph) for key in graph['definitions'] if key not in graph['reachable']),
+            key=lambda r: (r['source'], r['name'].lower())
+        )
+
+    def hot_keywords(self, limit=20):
+        """Project keywords with the most call sites."""
+        graph = self.graph()
+        return [self._keyword_row(key, graph) for key, _ in graph['call_counts'].most_common(limit)]
+
+    def external_keywords(self, limit=20):
+        """Most-called keywords that are not defined in the project (libraries)."""
+        return self.graph()['external'].most_common(limit)
+
+    def callers_of(self, name):
+        """Call sites of a keyword: [(source, caller, line)]."""
+        return list(self.graph()['call_sites'].get(normalize_keyword_name(name), []))
+
+    def callees_of(self, name):
+        """Project keywords called directly by a keyword: [(name, count)]."""
+        graph = self.graph()
+        callees = graph['edges'].get(normalize_keyword_name(name), Counter())
+        return [(graph['definitions'][k]['name'], n) for k, n in callees.most_common()]
+
+    def summary(self):
+        graph = self.graph()
+        return {
+            'files': sum(1 for s in self.sources if s != FACTORY_SOURCE),
+            'keywords': len(graph['definitions']),
+            'tests': graph['test_count'],
+            'call_sites': sum(graph['call_counts'].values()) + sum(graph['external'].values()),
+            'unused': sum(1 for k in graph['definitions'] if not graph['call_counts'].get(k)),
+            'dead': len(graph['definitions']) - len(graph['reachable'] & graph['definitions'].keys()),
+        }
@@ -6,8 +6,15 @@ Handles the business logic for the Keyword Factory tab.
 import streamlit as st
 import uuid
 import re
+import os
+import pickle
 # Make sure utils functions are imported correctly
-from .utils import format_robot_step_line, convert_json_path_to_robot_accessor, generate_arg_name_from_locator
+from .utils import format_robot_step_line, convert_json_path_to_robot_accessor, generate_arg_name_from_locator, parse_robot_keywords
+from .utils import normalize_keyword_name, ArgumentIndex, plan_control_flow
+from .session_manager import get_workspace_history, get_keyword_registry
+from .history import insert_op, pop_op, set_op, move_ops
+from .profiler import profiled
+from .preview_service import snapshot
 
 # --- START: Import Defaults ---
 # (Need these for the deprecated functions)
@@ -27,6 +34,22 @@ def _get_workspace():
         initialize_workspace()
     return st.session_state.keyword_factory_workspace
 
+# --- Undo / Redo (edits below go through the workspace history) ---
+# Every edit also bumps the shared keyword registry version (other workspaces read through it)
+def _apply_edit(label, ops):
+    get_workspace_history('keyword_factory_workspace').apply(_get_workspace(), label, ops)
+    get_keyword_registry().bump()
+
+def undo():
+    label = get_workspace_history('keyword_factory_workspace').undo(_get_workspace())
+    get_keyword_registry().bump()
+    return label
+
+def redo():
+    label = get_workspace_history('keyword_factory_workspace').redo(_get_workspace())
+    get_keyword_registry().bump()
+    return label
+
 def get_all_keywords():
     return _get_workspace().get('keywords', [])
 
@@ -51,13 +74,15 @@ def create_new_keyword():
         'steps': [],
         'tags': ['Generated']
     }
-    ws['keywords'].append(new_kw)
+    _apply_edit("Create keyword", [insert_op(('keywords',), len(ws['keywords']), new_kw)])
     ws['active_keyword_id'] = new_id
     return new_id
 
 def delete_keyword(keyword_id):
     ws = _get_workspace()
-    ws['keywords'] = [kw for kw in ws['keywords'] if kw['id'] != keyword_id]
+    index = next((i for i, kw in enumerate(ws['keywords']) if kw['id'] == keyword_id), -1)
+    if index != -1:
+        _apply_edit("Delete keyword", [pop_op(ws, ('keywords',), index)])
     if ws['active_keyword_id'] == keyword_id:
         ws['active_keyword_id'] = None
 
@@ -65,19 +90,99 @@ def delete_keyword(keyword_id):
 def update_keyword_details(keyword_id, name): # Removed args_str
     """Updates ONLY the name, documentation, and tags of a keyword."""
     kw = get_keyword(keyword_id)
-    if kw:
-        kw['name'] = name
+    if kw and kw.get('name') != name:
+        _apply_edit("Rename keyword", [set_op(_get_workspace(), ('keywords', keyword_id), 'name', name)])
+
+# --- Argument Usage ---
+def get_argument_index(keyword_id):
+    """Variable -> step usage index of a keyword, synced with its current steps."""
+    indexes = st.session_state.setdefault('keyword_argument_indexes', {})
+    kw = get_keyword(keyword_id)
+    if kw is None:
+        indexes.pop(keyword_id, None)
+        return ArgumentIndex()
+    if keyword_id not in indexes:
+        indexes[keyword_id] = ArgumentIndex()
+    return indexes[keyword_id].sync(kw.get('steps', []))
+
+ARGUMENT_NAME_PATTERN = re.compile(r'^[$@&]\{[^{}]+\}$')
+
+def rename_argument(keyword_id, old_name, new_name):
+    """
+    Renames an argument in the keyword signature and in the step values that use it.
+
+    Raises:
+        ValueError: new_name is not a variable (${name}) or names another argument.
+    """
+    kw = get_keyword(keyword_id)
+    if not kw or not new_name or old_name == new_name:
+        return
+    if not ARGUMENT_NAME_PATTERN.match(new_name):
+        raise ValueError(f"'{new_name}' is not a variable name, use e.g. ${{{new_name.strip('$@&{}') or 'name'}}}")
+    # Robot variable names ignore case, spaces and underscores
+    new_key = normalize_keyword_name(new_name[2:-1])
+    if any(arg['name'] != old_name and normalize_keyword_name(arg['name'][2:-1]) == new_key for arg in kw.get('args', [])):
+        raise ValueError(f"The keyword already has an argument named {new_name}")
+    ws = _get_workspace()
+    ops = []
+    # Only the steps listed in the index are touched (copy-on-write args)
+    for _, step, new_args in get_argument_index(keyword_id).renamed_step_args(kw.get('steps', []), old_name, new_name):
+        ops.append(set_op(ws, _steps_path(keyword_id) + (step['id'],), 'args', new_args))
+    if any(arg['name'] == old_name for arg in kw.get('args', [])):
+        new_signature = [{**arg, 'name': new_name} if arg['name'] == old_name else arg for arg in kw['args']]
+        ops.append(set_op(ws, ('keywords', keyword_id), 'args', new_signature))
+    _apply_edit("Rename argument", ops)
+
+# --- Signature / Step Order (quick actions and drag & drop) ---
+def set_keyword_args(keyword_id, new_args, label="Edit arguments"):
+    """Replaces the keyword signature as one undoable edit (no-op when unchanged)."""
+    kw = get_keyword(keyword_id)
+    if kw is None or kw.get('args') == new_args:
+        return
+    _apply_edit(label, [set_op(_get_workspace(), ('keywords', keyword_id), 'args', list(new_args))])
+
+def set_argument_default(keyword_id, arg_name, default):
+    """Sets one argument's default value (copy-on-write signature, undoable)."""
+    kw = get_keyword(keyword_id)
+    args = (kw or {}).get('args') or []
+    if not any(arg['name'] == arg_name and arg.get('default', '') != default for arg in args):
+        return
+    new_args = [{**arg, 'default': default} if arg['name'] == arg_name else arg for arg in args]
+    set_keyword_args(keyword_id, new_args, "Edit argument default")
+
+def set_step_order(keyword_id, new_steps):
+    """Applies a reordered list of the keyword's own steps as one undoable edit."""
+    kw = get_keyword(keyword_id)
+    if kw is None or [s['id'] for s in kw.get('steps', [])] == [s['id'] for s in new_steps]:
+        return
+    _apply_edit("Reorder steps", [set_op(_get_workspace(), ('keywords', keyword_id), 'steps', list(new_steps))])
+
+# --- Step Management ---
+def _steps_path(keyword_id):
+    return ('keywords', keyword_id, 'steps')
 
-# --- Step Management (No changes needed in add, delete, move) ---
 def add_step(keyword_id, new_step):
     kw = get_keyword(keyword_id)
     if kw and 'steps' in kw: # Ensure 'steps' key exists
-        kw['steps'].append(new_step)
+        _apply_edit("Add step", [insert_op(_steps_path(keyword_id), len(kw['steps']), new_step)])
 
 def delete_step(keyword_id, step_id):
     kw = get_keyword(keyword_id)
     if kw and 'steps' in kw:
-        kw['steps'] = [s for s in kw['steps'] if s.get('id') != step_id]
+        ops = [pop_op(_get_workspace(), _steps_path(keyword_id), i)
+               for i, s in enumerate(kw['steps']) if s.get('id') == step_id]
+        # Pop from the end so earlier indexes stay valid
+        _apply_edit("Delete step", reversed(ops))
+
+def duplicate_step(keyword_id, step_id):
+    kw = get_keyword(keyword_id)
+    if not kw or 'steps' not in kw:
+        return
+    index = next((i for i, s in enumerate(kw['steps']) if s.get('id') == step_id), -1)
+    if index != -1:
+        new_step = kw['steps'][index].copy()
+        new_step['id'] = str(uuid.uuid4())
+        _apply_edit("Duplicate step", [insert_op(_steps_path(keyword_id), index + 1, new_step)])
 
 def move_step(keyword_id, step_id, direction):
     kw = get_keyword(keyword_id)
@@ -91,9 +196,9 @@ def move_step(keyword_id, step_id, direction):
         return
 
     if direction == 'up' and index > 0:
-        steps.insert(index - 1, steps.pop(index))
+        _apply_edit("Move step", move_ops(_get_workspace(), _steps_path(keyword_id), index, index - 1))
     elif direction == 'down' and index < len(steps) - 1:
-        steps.insert(index + 1, steps.pop(index))
+        _apply_edit("Move step", move_ops(_get_workspace(), _steps_path(keyword_id), index, index + 1))
 
 # --- Step Update (Correct version provided by user) ---
 def update_step(keyword_id, step_id, updated_data):
@@ -104,13 +209,13 @@ def update_step(keyword_id, step_id, updated_data):
     for i, step in enumerate(kw['steps']):
         if step['id'] == step_id:
             # Update specific keys to avoid overwriting unrelated data
-            if 'keyword' in updated_data:
-                kw['steps'][i]['keyword'] = updated_data['keyword']
-            if 'args' in updated_data:
-                kw['steps'][i]['args'] = updated_data['args']
-            if 'output_variable' in updated_data:
-                kw['steps'][i]['output_variable'] = updated_data['output_variable']
+            step_path = _steps_path(keyword_id) + (step_id,)
+            ops = [
+                set_op(_get_workspace(), step_path, key, updated_data[key])
+                for key in ('keyword', 'args', 'output_variable') if key in updated_data
+            ]
             # Add other keys if needed in the future
+            _apply_edit("Edit step", ops)
             break
 
 # --- *** CORRECTED: Quick Steps Functions *** ---
@@ -137,8 +242,11 @@ def add_quick_fill_form_steps_with_custom_args(keyword_id, locators_with_custom_
 
     if 'args' not in kw or not isinstance(kw['args'], list):
         kw['args'] = [] # Initialize if missing/incorrect type
+    if 'steps' not in kw: kw['steps'] = []
 
     current_arg_names = {arg['name'] for arg in kw['args']} # Set for quick lookup
+    new_args = list(kw['args'])
+    ops = []
 
     for loc_name, custom_args in locators_with_custom_args.items():
         # Generate suggested variable name (without ${})
@@ -162,16 +270,16 @@ def add_quick_fill_form_steps_with_custom_args(keyword_id, locators_with_custom_
             "args": step_args # Use the merged arguments
         }
 
-        if 'steps' not in kw: kw['steps'] = []
-        kw['steps'].append(new_step)
+        ops.append(insert_op(_steps_path(keyword_id), len(kw['steps']) + len(ops), new_step))
 
         # Add the new argument dictionary if the name isn't already present
         if arg_var not in current_arg_names:
-            kw['args'].append({'name': arg_var, 'default': ''}) # Add as dict
+            new_args.append({'name': arg_var, 'default': ''}) # Add as dict
             current_arg_names.add(arg_var) # Update the set
 
     # Sort args list after adding potentially multiple new ones
-    kw['args'] = sorted(kw['args'], key=lambda x: x['name'])
+    ops.append(set_op(_get_workspace(), ('keywords', keyword_id), 'args', sorted(new_args, key=lambda x: x['name'])))
+    _apply_edit("Quick add fill form steps", ops)
 
 
 def add_quick_verify_steps(keyword_id, locators_to_add):
@@ -205,8 +313,11 @@ def add_quick_verify_steps_with_custom_args(keyword_id, locators_with_custom_arg
 
     if 'args' not in kw or not isinstance(kw['args'], list):
         kw['args'] = []
+    if 'steps' not in kw: kw['steps'] = []
 
     current_arg_names = {arg['name'] for arg in kw['args']}
+    new_args = list(kw['args'])
+    ops = []
 
     for loc_name, custom_args in locators_with_custom_args.items():
         # Start building the args for this step
@@ -226,17 +337,17 @@ def add_quick_verify_steps_with_custom_args(keyword_id, locators_with_custom_arg
             "args": step_args
         }
 
-        if 'steps' not in kw: kw['steps'] = []
-        kw['steps'].append(new_step)
+        ops.append(insert_op(_steps_path(keyword_id), len(kw['steps']) + len(ops), new_step))
 
         # Add the exp_value as an argument if it looks like a variable and isn't already added
         if arg_var and isinstance(arg_var, str) and arg_var.startswith("${") and arg_var.endswith("}"):
             if arg_var not in current_arg_names:
-                kw['args'].append({'name': arg_var, 'default': ''})
+                new_args.append({'name': arg_var, 'default': ''})
                 current_arg_names.add(arg_var)
 
     # Sort args list
-    kw['args'] = sorted(kw['args'], key=lambda x: x['name'])
+    ops.append(set_op(_get_workspace(), ('keywords', keyword_id), 'args', sorted(new_args, key=lambda x: x['name'])))
+    _apply_edit("Quick add verify steps", ops)
 
 
 # --- START: [FIX] RESTORED LOGIC ---
@@ -251,8 +362,11 @@ def add_quick_verify_detail_steps_with_custom_args(keyword_id, locators_with_cus
 
     if 'args' not in kw or not isinstance(kw['args'], list):
         kw['args'] = []
+    if 'steps' not in kw: kw['steps'] = []
 
     current_arg_names = {arg['name'] for arg in kw['args']}
+    new_args = list(kw['args'])
+    ops = []
 
     for loc_name, custom_args in locators_with_custom_args.items():
         # Generate suggested variable name for expected value (without ${})
@@ -292,26 +406,42 @@ def add_quick_verify_detail_steps_with_custom_args(keyword_id, locators_with_cus
             "args": step_args
         }
 
-        if 'steps' not in kw:
-            kw['steps'] = []
-        kw['steps'].append(new_step)
+        ops.append(insert_op(_steps_path(keyword_id), len(kw['steps']) + len(ops), new_step))
 
         # Add the new argument dictionary if the name isn't already present
         if arg_var not in current_arg_names:
-            kw['args'].append({'name': arg_var, 'default': ''})  # Add as dict
+            new_args.append({'name': arg_var, 'default': ''})  # Add as dict
             current_arg_names.add(arg_var)  # Update the set
 
     # Sort args list after adding potentially multiple new ones
-    kw['args'] = sorted(kw['args'], key=lambda x: x['name'])
+    ops.append(set_op(_get_workspace(), ('keywords', keyword_id), 'args', sorted(new_args, key=lambda x: x['name'])))
+    _apply_edit("Quick add verify detail steps", ops)
 # --- END: [FIX] RESTORED LOGIC ---
 
 
 # --- *** Script Generation (Correct version from previous steps) *** ---
+@profiled()
 def generate_robot_script_for_keyword(keyword_id):
     kw = get_keyword(keyword_id)
     if not kw:
         return "# Keyword not found."
+    return format_keyword_script(kw)
+
+def preview_snapshot(keyword_id):
+    """(version, payload) of one keyword for the background preview; see render_preview_script."""
+    return snapshot(get_keyword(keyword_id))
 
+def render_preview_script(payload):
+    """Renders a preview_snapshot() payload (runs on the preview worker thread)."""
+    kw = pickle.loads(payload)
+    return format_keyword_script(kw) if kw else "# Keyword not found."
+
+def format_keyword_script(kw, step_cache=None):
+    """
+    Formats a keyword dict into its Robot Framework definition block.
+    Pure function (no session state) so it can be reused for exports and benchmarks.
+    step_cache: optional dict shared across keywords so identical steps are formatted once.
+    """
     script = []
     script.append(f"{kw.get('name', 'Untitled Keyword')}") # Use get with default
 
@@ -335,47 +465,41 @@ def generate_robot_script_for_keyword(keyword_id):
     if not steps:
         script.append("    Log    This keyword has no steps.") # 4 spaces indent
     else:
-        indent_level = 0 # Base indent level within the keyword
         base_indent = "    " # 4 spaces
+        # Indent of every step comes from the shared (memoized) block plan
+        depths = plan_control_flow(steps).depths
 
-        for step in steps: # Use the correct variable 'steps'
+        for step, depth in zip(steps, depths): # Use the correct variable 'steps'
             keyword_name = step.get('keyword', '')
-
-            # --- คำนวณ Indent ปัจจุบัน *ก่อน* สร้างโค้ด ---
-            current_indent_adjustment = 0
-            if keyword_name in ['ELSE IF Condition', 'ELSE', 'END']:
-                # ลด indent ชั่วคราว *สำหรับบรรทัดนี้เท่านั้น*
-                current_indent_adjustment = -1
-
-            # คำนวณ indent string ที่จะใช้จริง (ป้องกันค่าติดลบ)
-            actual_indent_level = max(0, indent_level + current_indent_adjustment)
-            current_indent_str = base_indent * (actual_indent_level + 1) # +1 เพราะอยู่ใน Keyword
+            current_indent_str = base_indent * (depth + 1) # +1 เพราะอยู่ใน Keyword
 
             # --- จัดการ Logic พิเศษสำหรับ IF / ELSE IF / ELSE / END ---
             if keyword_name == 'IF Condition':
                 condition = step.get('args', {}).get('condition', 'True')
                 script.append(f"{current_indent_str}IF    {condition}")
-                indent_level += 1 # เพิ่มระดับสำหรับ Step *ถัดไป*
                 continue # ข้ามไป Step ถัดไป
 
             elif keyword_name == 'ELSE IF Condition': # <-- เพิ่ม ELSE IF
                 condition = step.get('args', {}).get('condition', 'True')
                 script.append(f"{current_indent_str}ELSE IF    {condition}")
-                # ไม่เปลี่ยน indent_level สำหรับ Step ถัดไป
                 continue # ข้ามไป Step ถัดไป
 
             elif keyword_name == 'ELSE': # <-- เพิ่ม ELSE
                 script.append(f"{current_indent_str}ELSE")
-                # ไม่เปลี่ยน indent_level สำหรับ Step ถัดไป
                 continue # ข้ามไป Step ถัดไป
 
             elif keyword_name == 'END':
                 script.append(f"{current_indent_str}END")
-                indent_level = max(0, indent_level - 1) # ลดระดับสำหรับ Step *ถัดไป*
                 continue # ข้ามไป Step ถัดไป
 
             # --- Logic เดิมสำหรับ Step ทั่วไป (ใช้ current_indent_str) ---
-            formatted_lines_str = format_robot_step_line(step)
+            if step_cache is None:
+                formatted_lines_str = format_robot_step_line(step)
+            else:
+                cache_key = (keyword_name, repr(tuple(step.get('args', {}).items())))
+                formatted_lines_str = step_cache.get(cache_key)
+                if formatted_lines_str is None:
+                    formatted_lines_str = step_cache[cache_key] = format_robot_step_line(step)
             lines = formatted_lines_str.split('\n')
 
             if lines:
@@ -425,35 +549,87 @@ def generate_robot_script_for_keyword(keyword_id):
     script.append("")
     return "\n".join(script)
 
+# --- Library Export (all keywords -> one *** Keywords *** block) ---
+def format_keyword_library(keywords):
+    """Renders many keywords in one pass; identical steps are formatted once (one shared cache)."""
+    step_cache = {}
+    return [format_keyword_script(kw, step_cache) for kw in keywords]
+
+def export_all_keywords(file_path, include_imported=False):
+    """
+    Exports every factory keyword to file_path with a single merged write.
+    Keywords already defined in the target file are skipped.
+
+    Returns:
+        tuple: (success, message, exported_names)
+    """
+    from .file_manager import write_keywords_block
+
+    existing_names = set()
+    if os.path.exists(file_path):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            existing_names = {normalize_keyword_name(kw['name']) for kw in parse_robot_keywords(f.read())}
+
+    to_export = []
+    for kw in get_all_keywords():
+        if not include_imported and 'Imported' in kw.get('tags', []):
+            continue
+        normalized = normalize_keyword_name(kw.get('name'))
+        if normalized and normalized not in existing_names:
+            existing_names.add(normalized)
+            to_export.append(kw)
+
+    if not to_export:
+        return True, "⚠️ All keywords already exist in the target file. No changes made.", []
+
+    blocks = format_keyword_library(to_export)
+    success, message = write_keywords_block(file_path, "\n".join(blocks))
+    return success, message, [kw['name'] for kw in to_export]
+
 def import_existing_keyword(name, args, doc, tags=None):
     """
     Imports an existing, parsed keyword into the factory workspace.
     Args/doc are taken from the parsed .robot file.
     (MODIFIED: Silent operation - no st.warning)
     """
+    new_ids = import_existing_keywords_bulk([{'name': name, 'args': args, 'doc': doc}], tags=tags)
+    return new_ids[0] if new_ids else None
+
+def import_existing_keywords_bulk(parsed_keywords, tags=None):
+    """
+    Imports many parsed keywords in one pass.
+    Duplicates (against the workspace and within the batch) are skipped using a
+    case-folded name set, so importing N keywords is O(N) instead of O(N²).
+
+    Args:
+        parsed_keywords (iterable): dicts with 'name', 'args', 'doc' (from parse_robot_keywords)
+        tags (list): Tags applied to every imported keyword (default ['Imported'])
+
+    Returns:
+        list: ids of the keywords that were actually added
+    """
     if tags is None:
         tags = ['Imported'] # เพิ่ม Tag พิเศษ
-    
+
     ws = _get_workspace()
-    
-    # ตรวจสอบว่ามีชื่อนี้ใน Factory แล้วหรือยัง
-    if any(kw['name'].lower() == name.lower() for kw in ws['keywords']):
+    existing_names = {kw['name'].casefold() for kw in ws['keywords']}
+
+    new_keywords = []
+    for parsed in parsed_keywords:
+        name = parsed.get('name', '')
+        folded = name.casefold()
         # ทำงานแบบเงียบๆ ถ้าซ้ำ
-        return None 
-    
-    new_id = str(uuid.uuid4())
-    
-    # สร้าง Keyword object ใหม่ใน state
-    # เราสมมติว่า 'args' ที่รับเข้ามาจาก parser
-    # อยู่ในรูปแบบ list of dicts ที่ถูกต้องแล้ว
-    # (ซึ่ง parser ใน utils.py ทำแบบนั้นอยู่แล้ว)
-    new_kw = {
-        'id': new_id,
-        'name': name,
-        'doc': doc,
-        'args': args, # ใช้ args ที่ parse มาได้เลย
-        'steps': [],  # Keyword ที่ Import มาจะเริ่มโดยไม่มี step
-        'tags': tags
-    }
-    ws['keywords'].append(new_kw)
-    return new_id
\ No newline at end of file
+        if not name or folded in existing_names:
+            continue
+        existing_names.add(folded)
+        new_keywords.append({
+            'id': str(uuid.uuid4()),
+            'name': name,
+            'doc': parsed.get('doc', 'Imported keyword.'),
+            'args': parsed.get('args', []), # ใช้ args ที่ parse มาได้เลย
+            'steps': [],  # Keyword ที่ Import มาจะเริ่มโดยไม่มี step
+            'tags': list(tags)
+        })
+
+    ws['keywords'].extend(new_keywords)
+    return [kw['id'] for kw in new_keywords]
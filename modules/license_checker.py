@@ -2,6 +2,8 @@
 import datetime
 import json
 import os
+import threading
+import time
 from cryptography.fernet import Fernet
 
 # 1. ต้องใช้ Key ตัวเดียวกับตอนสร้าง (Copy มาใส่ตรงนี้เลย)
@@ -31,4 +33,46 @@ def check_license_file(key_path="license.key"):
         return True, "Valid", expiration_date
 
     except Exception:
-        return False, "Invalid license file.", None
\ No newline at end of file
+        return False, "Invalid license file.", None
+
+
+# --- Cached license service ---
+# Streamlit re-executes app.py on every interaction; the verified result is kept
+# per process and only re-checked when the key file changes or the date rolls over.
+_status_cache = {}      # absolute key path -> (file stamp, date checked, result)
+_status_lock = threading.Lock()
+LICENSE_STATS = {'verifications': 0, 'cache_hits': 0, 'last_verify_seconds': 0.0, 'last_lookup_seconds': 0.0}
+
+def _file_stamp(key_path):
+    try:
+        stat = os.stat(key_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+def get_license_status(key_path="license.key"):
+    """Same result as check_license_file(), verified at most once per key file version per day."""
+    start = time.perf_counter()
+    cache_key = os.path.abspath(key_path)
+    stamp = _file_stamp(key_path)
+    today = datetime.date.today()
+
+    with _status_lock:
+        cached = _status_cache.get(cache_key)
+        if cached is not None and cached[0] == stamp and cached[1] == today:
+            LICENSE_STATS['cache_hits'] += 1
+            LICENSE_STATS['last_lookup_seconds'] = time.perf_counter() - start
+            return cached[2]
+
+    result = check_license_file(key_path)
+    elapsed = time.perf_counter() - start
+    with _status_lock:
+        _status_cache[cache_key] = (stamp, today, result)
+        LICENSE_STATS['verifications'] += 1
+        LICENSE_STATS['last_verify_seconds'] = elapsed
+        LICENSE_STATS['last_lookup_seconds'] = elapsed
+    return result
+
+def clear_license_cache():
+    with _status_lock:
+        _status_cache.clear()
@@ -0,0 +1,164 @@
+# modules/preview_service.py
+"""
+Live Preview Service
+Renders script previews on a background thread so a widget change never waits
+for script generation.
+
+- Every rerun submits (version, payload); the version is a content digest of the
+  workspace, so reruns that change nothing never re-render.
+- Changes are debounced: the worker renders only once submissions have been quiet
+  for `debounce` seconds, and only the latest one (intermediate versions are skipped).
+- Until that render completes, state() returns the last completed render marked stale.
+
+The render callable receives only the payload (a pickled workspace copy plus any
+read-only inputs), never live session objects. diff_hunks() turns two renders into
+the line hunks the code preview component applies.
+This module should NOT import streamlit.
+"""
+import difflib
+import hashlib
+import pickle
+import threading
+import time
+from collections import namedtuple
+
+PREVIEW_DEBOUNCE_SECONDS = 0.3
+
+# Changed regions longer than this (old + new lines) become one replace hunk
+# instead of going through SequenceMatcher
+DIFF_MAX_LINES = 4000
+
+# text / version of the last completed render; stale while a newer version is queued;
+# error is the message of the latest failed render (the previous text is kept)
+PreviewState = namedtuple('PreviewState', ['text', 'version', 'stale', 'error', 'seconds'])
+
+_EMPTY_STATE = PreviewState('', None, False, None, 0.0)
+
+# ===================================================================
+# ===== 1. Input Snapshots
+# ===================================================================
+
+def snapshot(inputs):
+    """
+    Content version and an independent copy of a preview's inputs (one pickle serves both).
+
+    Returns:
+        tuple: (version digest, pickled inputs); the worker restores them with pickle.loads.
+    """
+    data = pickle.dumps(inputs, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.blake2b(data, digest_size=16).hexdigest(), data
+
+# ===================================================================
+# ===== 2. Preview Service
+# ===================================================================
+
+class PreviewService:
+    """Debounced background renderer of one preview (e.g. the CRUD script)."""
+
+    def __init__(self, render, debounce=PREVIEW_DEBOUNCE_SECONDS):
+        self._render = render
+        self.debounce = debounce
+        self._cond = threading.Condition()
+        self._result = None        # PreviewState of the last completed render
+        self._pending = None       # (version, payload) waiting for the worker
+        self._submitted_at = 0.0
+        self._worker = None
+
+    def submit(self, version, payload):
+        """
+        Queues a render of `payload` unless `version` is already rendered or queued.
+        The very first render runs synchronously (there is nothing older to show).
+
+        Returns:
+            PreviewState: Same as state().
+        """
+        with self._cond:
+            if self._result is None:
+                self._result = self._run(version, payload, None)
+                return self._state()
+            if self._result.version == version:
+                # Back to the rendered version (e.g. an edit was undone)
+                self._pending = None
+                return self._state()
+            if self._pending is None or self._pending[0] != version:
+                self._pending = (version, payload)
+                self._submitted_at = time.monotonic()
+                self._cond.notify_all()
+                if self._worker is None:
+                    self._worker = threading.Thread(target=self._work, name="preview-render", daemon=True)
+                    self._worker.start()
+            return self._state()
+
+    def state(self):
+        with self._cond:
+            return self._state()
+
+    def wait(self, timeout=None):
+        """Blocks until the queued render (if any) completed; returns state()."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending is None, timeout)
+            return self._state()
+
+    def _state(self):
+        result = self._result or _EMPTY_STATE
+        return result._replace(stale=self._pending is not None)
+
+    def _run(self, version, payload, previous):
+        started = time.perf_counter()
+        try:
+            text, error = self._render(payload), None
+        except Exception as e:
+            text, error = (previous.text if previous else ''), f"{type(e).__name__}: {e}"
+        return PreviewState(text, version, False, error, time.perf_counter() - started)
+
+    def _work(self):
+        while True:
+            with self._cond:
+                # Wait until submissions have been quiet for `debounce` seconds
+                while True:
+                    if self._pending is None:
+                        self._worker = None
+                        return
+                    remaining = self._submitted_at + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                version, payload = self._pending
+                previous = self._result
+            result = self._run(version, payload, previous)
+            with self._cond:
+                self._result = result
+                if self._pending is not None and self._pending[0] == version:
+                    self._pending = None
+                self._cond.notify_all()
+
+# ===================================================================
+# ===== 3. Line Diff
+# ===================================================================
+
+def diff_hunks(old_lines, new_lines):
+    """
+    Hunks turning old_lines into new_lines.
+
+    Returns:
+        list: [start, delete_count, inserted_lines] entries with start in new-text
+              positions, so applying them in order with a list splice is enough.
+    """
+    n_old, n_new = len(old_lines), len(new_lines)
+    limit = min(n_old, n_new)
+    # Edits are local: trim the common prefix / suffix before matching
+    prefix = 0
+    while prefix < limit and old_lines[prefix] == new_lines[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old_lines[n_old - 1 - suffix] == new_lines[n_new - 1 - suffix]:
+        suffix += 1
+    old_mid = old_lines[prefix:n_old - suffix]
+    new_mid = new_lines[prefix:n_new - suffix]
+    if not old_mid and not new_mid:
+        return []
+    if not old_mid or not new_mid or len(old_mid) + len(new_mid) > DIFF_MAX_LINES:
+        return [[prefix, len(old_mid), list(new_mid)]]
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    return [[prefix + j1, i2 - i1, new_mid[j1:j2]]
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
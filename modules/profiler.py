@@ -0,0 +1,145 @@
+# modules/profiler.py
+"""
+Rerun Profiler
+Instrumentation for Streamlit reruns. Sections (context manager or decorator)
+record wall time, call count and, optionally, the allocation delta of the code
+they wrap while a rerun is being profiled. Outside a profiled rerun a section
+costs a single thread-local lookup.
+
+Section times are inclusive (a section nested in another counts in both).
+Allocation deltas come from tracemalloc, which is process-wide, so concurrent
+sessions show up in each other's numbers.
+This module should NOT import streamlit.
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+PSTATS_TOP_FUNCTIONS = 25
+
+_local = threading.local()
+
+# ===================================================================
+# ===== 1. Rerun Profile
+# ===================================================================
+
+class RerunProfile:
+    """Measurements of one rerun: section name -> [calls, seconds, allocated bytes]."""
+
+    def __init__(self, track_memory=False, use_cprofile=False):
+        self.sections = {}
+        self.track_memory = track_memory
+        self._started_tracemalloc = False
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._cprofile = None
+        if use_cprofile:
+            self._cprofile = cProfile.Profile()
+            try:
+                self._cprofile.enable()
+            except ValueError:
+                # Another profiler is active (e.g. a concurrent session's dump)
+                self._cprofile = None
+        self.started_at = time.perf_counter()
+        self.total_seconds = None
+
+    def record(self, name, seconds, allocated=0):
+        entry = self.sections.get(name)
+        if entry is None:
+            entry = self.sections[name] = [0, 0.0, 0]
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += allocated
+
+    def finish(self, dump_dir=None):
+        """Stops measuring; returns a plain-dict report (safe to keep in session state)."""
+        self.total_seconds = time.perf_counter() - self.started_at
+        report = {
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'total_ms': self.total_seconds * 1000,
+            'track_memory': self.track_memory,
+            'sections': [
+                {'section': name, 'calls': calls, 'ms': round(seconds * 1000, 2),
+                 'alloc_kb': round(allocated / 1024, 1) if self.track_memory else None,
+                 'share': round(seconds / self.total_seconds * 100, 1) if self.total_seconds else 0.0}
+                for name, (calls, seconds, allocated)
+                in sorted(self.sections.items(), key=lambda item: item[1][1], reverse=True)
+            ],
+            'pstats_path': None,
+            'pstats_top': None,
+        }
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self._cprofile, stream=stream)
+            stats.sort_stats('cumulative').print_stats(PSTATS_TOP_FUNCTIONS)
+            report['pstats_top'] = stream.getvalue()
+            if dump_dir:
+                os.makedirs(dump_dir, exist_ok=True)
+                path = os.path.join(dump_dir, f"rerun-{datetime.now():%Y%m%d-%H%M%S}.pstats")
+                stats.dump_stats(path)
+                report['pstats_path'] = path
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+        return report
+
+# ===================================================================
+# ===== 2. Rerun Lifecycle
+# ===================================================================
+
+def begin_rerun(enabled, track_memory=False, use_cprofile=False):
+    """Starts profiling this thread's rerun (a no-op when not enabled)."""
+    _local.profile = RerunProfile(track_memory, use_cprofile) if enabled else None
+    return _local.profile
+
+def end_rerun(dump_dir=None):
+    """Finishes the current rerun; returns its report, or None if it was not profiled."""
+    profile = getattr(_local, 'profile', None)
+    _local.profile = None
+    return profile.finish(dump_dir) if profile is not None else None
+
+def current_profile():
+    return getattr(_local, 'profile', None)
+
+# ===================================================================
+# ===== 3. Sections
+# ===================================================================
+
+@contextmanager
+def section(name):
+    """Times the enclosed block as one call of `name` in the current rerun."""
+    profile = getattr(_local, 'profile', None)
+    if profile is None:
+        yield
+        return
+    track_memory = profile.track_memory and tracemalloc.is_tracing()
+    allocated_before = tracemalloc.get_traced_memory()[0] if track_memory else 0
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        allocated = tracemalloc.get_traced_memory()[0] - allocated_before if track_memory else 0
+        profile.record(name, elapsed, allocated)
+
+def profiled(name=None):
+    """Decorator form of section(); the default name is module.function."""
+    def decorator(func):
+        section_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, 'profile', None) is None:
+                return func(*args, **kwargs)
+            with section(section_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -5,9 +5,13 @@ Handles all session state initialization and helper functions
 
 import streamlit as st
 import os
+import re
 from .file_manager import scan_robot_project, read_robot_variables_from_content
 from pathlib import Path
 from .utils import parse_robot_keywords
+from .history import History
+from .keyword_registry import KeywordRegistry
+from . import workspace_store
 
 def _load_default_keywords():
     """Loads and parses the default commonkeywords.resource file."""
@@ -126,7 +130,7 @@ def init_session_state():
                 'verification': [],
                 'teardown': []
             },
-            'keyword_factory_keywords': []
+            'keyword_factory_ids': []   # Keyword Factory keywords used by steps (see get_keyword_registry)
         }
     # ===== END: สิ้นสุดส่วนที่เพิ่ม =====
 
@@ -182,6 +186,82 @@ def init_session_state():
             }
         # ===== END: ADDED FOR KEYWORD FACTORY =====
 
+def get_workspace_history(workspace_key):
+    """Undo/redo history for one workspace (e.g. 'crud_generator_workspace'), kept per session."""
+    histories = st.session_state.setdefault('workspace_history', {})
+    if workspace_key not in histories:
+        histories[workspace_key] = History()
+    return histories[workspace_key]
+
+def get_keyword_registry():
+    """Session-wide registry of the Keyword Factory keywords, shared by the other workspaces."""
+    if 'keyword_registry' not in st.session_state:
+        st.session_state.keyword_registry = KeywordRegistry()
+    return st.session_state.keyword_registry
+
+DEFAULT_SESSION_ARCHIVE = str(Path(__file__).resolve().parent.parent / 'saved_sessions' / f"session{workspace_store.ARCHIVE_EXTENSION}")
+
+def save_session_workspaces(file_path):
+    """Saves the persisted workspaces of this session; returns the archive size in bytes."""
+    workspaces = {name: st.session_state[name] for name in workspace_store.PERSISTED_WORKSPACES
+                  if name in st.session_state}
+    return workspace_store.save_workspaces(file_path, workspaces)
+
+# Session entries derived from workspace content, rebuilt after a restore
+RESTORE_RESET_KEYS = ('preview_services', 'code_preview_sent', 'keyword_argument_indexes')
+# Widgets whose keys carry no item id but whose values mirror workspace data
+RESTORE_RESET_PREFIXES = ('crud_data_driven_', 'step_window_')
+
+_UUID_PATTERN = re.compile(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}')
+
+def _collect_item_ids(value, ids):
+    """Adds the 'id' of every item (step, keyword, locator, ...) nested in value to ids."""
+    if isinstance(value, dict):
+        item_id = value.get('id')
+        if isinstance(item_id, str):
+            ids.add(item_id)
+        for child in value.values():
+            _collect_item_ids(child, ids)
+    elif isinstance(value, list):
+        for child in value:
+            _collect_item_ids(child, ids)
+
+def _clear_workspace_widget_state(ids):
+    """
+    Drops widget / edit state tied to workspace items (keys such as
+    f"edit_temp_args_{step_id}" or f"tcols_{step_id}_{digest}"), so stale widget
+    values cannot overwrite restored data on the next render.
+    """
+    for key in list(st.session_state.keys()):
+        if key in RESTORE_RESET_KEYS or key.startswith(RESTORE_RESET_PREFIXES) \
+                or any(m in ids for m in _UUID_PATTERN.findall(key)):
+            del st.session_state[key]
+
+def restore_session_workspaces(workspaces):
+    """
+    Replaces session workspaces with restored ones ({name: workspace_dict}).
+    Undo history, derived caches and widget state of the replaced workspaces are dropped.
+    """
+    histories = st.session_state.get('workspace_history', {})
+    item_ids = set()
+    for name, ws in workspaces.items():
+        if name not in workspace_store.PERSISTED_WORKSPACES:
+            continue
+        current = st.session_state.get(name) or {}
+        _collect_item_ids(current, item_ids)
+        _collect_item_ids(ws, item_ids)
+        # Keep defaults for keys the archive does not carry (e.g. added in a newer version)
+        st.session_state[name] = {**current, **ws}
+        st.session_state[name].pop('keyword_library', None)
+        histories.pop(name, None)
+    _clear_workspace_widget_state(item_ids)
+    if 'crud_generator_workspace' in workspaces or 'keyword_factory_workspace' in workspaces:
+        # Re-point the keyword registry and rebuild the CRUD ref counts now, so the
+        # Keyword Factory usage markers are right before the CRUD page is opened
+        from .crud_generator import manager as crud_manager
+        crud_manager.sync_keyword_factory_keywords()
+    return list(workspaces)
+
 # 🎯 START: เพิ่มฟังก์ชันใหม่นี้เข้าไปทั้งหมด
 def get_clean_locator_name(raw_name):
     """Removes Robot Framework variable syntax ${...} for cleaner display."""
@@ -0,0 +1,180 @@
+# modules/static_assets.py
+"""
+Offline Static Assets
+Vendored front-end assets (assets/vendor) served through Streamlit's static file
+serving, so the app works without network access.
+
+- Files are published to static/vendor under a ?v=<content hash> URL; the static
+  handler answers versioned requests with a 10-year Cache-Control header.
+- .css is not served with a stylesheet content type by Streamlit, so the icon CSS
+  is inlined (only the icons the app uses, see used_icon_names) while the font is a
+  static file.
+- server.enableStaticServing is set in .streamlit/config.toml; without it the font
+  is left out (icons render blank) rather than inlined into every rerun.
+
+Re-vendor Bootstrap Icons (from the installed streamlit-option-menu build):
+    python -m modules.static_assets
+Refresh only the committed list of icons the source uses (after adding a bi-* icon):
+    python -m modules.static_assets --icons
+This module should NOT import streamlit.
+"""
+import glob
+import hashlib
+import os
+import re
+import shutil
+import sys
+from functools import lru_cache
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+VENDOR_DIR = os.path.join(ROOT_DIR, 'assets', 'vendor')
+STATIC_VENDOR_DIR = os.path.join(ROOT_DIR, 'static', 'vendor')
+STATIC_VENDOR_URL = 'app/static/vendor'
+
+BOOTSTRAP_ICONS_VERSION = '1.11.3'
+BOOTSTRAP_ICONS_CSS = 'bootstrap-icons/bootstrap-icons.css'
+BOOTSTRAP_ICONS_FONT = 'bootstrap-icons/bootstrap-icons.woff2'
+# Icons the source uses, committed next to the CSS: compiled builds ship no .py to scan
+BOOTSTRAP_ICONS_USED = 'bootstrap-icons/used-icons.txt'
+
+# Sources scanned for `bi-<name>` icon classes
+ICON_SOURCE_PATHS = ('app.py', 'modules')
+
+_ICON_RULE_RE = re.compile(r'\.bi-([a-z0-9-]+)::?before\{content:"([^"]+)"\}')
+_ICON_BASE_RULE_RE = re.compile(r'\.bi::?before,\[class\*=" bi-"\]::?before,\[class\^=bi-\]::?before\{[^}]*\}')
+_ICON_USE_RE = re.compile(r'\bbi-([a-z0-9]+(?:-[a-z0-9]+)*)')
+
+# ===================================================================
+# ===== 1. Publishing
+# ===================================================================
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+@lru_cache(maxsize=None)
+def publish_asset(relative_path):
+    """
+    Copies a vendored file to static/vendor (when missing or changed).
+
+    Returns:
+        str: Versioned URL of the file, or None when it cannot be published.
+    """
+    source = os.path.join(VENDOR_DIR, relative_path)
+    target = os.path.join(STATIC_VENDOR_DIR, relative_path)
+    try:
+        digest = _file_digest(source)
+        if not os.path.exists(target) or _file_digest(target) != digest:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(source, f"{target}.tmp")
+            os.replace(f"{target}.tmp", target)
+    except OSError:
+        return None
+    return f"{STATIC_VENDOR_URL}/{relative_path}?v={digest}"
+
+# ===================================================================
+# ===== 2. Bootstrap Icons
+# ===================================================================
+
+def scan_icon_names():
+    """Icon names referenced as bi-<name> in the app's source (empty when no .py ships)."""
+    names = set()
+    for entry in ICON_SOURCE_PATHS:
+        path = os.path.join(ROOT_DIR, entry)
+        files = [path] if os.path.isfile(path) else glob.glob(os.path.join(path, '**', '*.py'), recursive=True)
+        for file_path in files:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                names.update(_ICON_USE_RE.findall(f.read()))
+    return names
+
+def write_used_icon_list():
+    """Writes scan_icon_names() to the committed icon list; returns the icon count."""
+    names = sorted(scan_icon_names())
+    with open(os.path.join(VENDOR_DIR, BOOTSTRAP_ICONS_USED), 'w', encoding='utf-8') as f:
+        f.write("\n".join(names) + "\n")
+    return len(names)
+
+@lru_cache(maxsize=1)
+def used_icon_names():
+    """
+    Committed icon list plus a scan of the source (catches icons added since the list
+    was written). None when both are empty: every vendored icon is then kept.
+    """
+    names = scan_icon_names()
+    try:
+        with open(os.path.join(VENDOR_DIR, BOOTSTRAP_ICONS_USED), 'r', encoding='utf-8') as f:
+            names.update(line.strip() for line in f if line.strip())
+    except OSError:
+        pass
+    return frozenset(names) or None
+
+@lru_cache(maxsize=None)
+def bootstrap_icons_css(static_serving=True):
+    """
+    @font-face + base rule + the rules of used_icon_names(), pointing at the vendored font.
+    Without static serving the @font-face is left out (a data URI would add ~175 KB to
+    every rerun).
+    """
+    with open(os.path.join(VENDOR_DIR, BOOTSTRAP_ICONS_CSS), 'r', encoding='utf-8') as f:
+        vendored = f.read()
+    font_url = publish_asset(BOOTSTRAP_ICONS_FONT) if static_serving else None
+    if font_url is None:
+        print("Bootstrap Icons font not served: enable server.enableStaticServing (.streamlit/config.toml)")
+    used = used_icon_names()
+    base_rule = _ICON_BASE_RULE_RE.search(vendored)
+    rules = [f'.bi-{name}::before{{content:"{code}"}}'
+             for name, code in _ICON_RULE_RE.findall(vendored) if used is None or name in used]
+    font_face = (f'@font-face{{font-display:block;font-family:bootstrap-icons;src:url("{font_url}") format("woff2")}}'
+                 if font_url else '')
+    return "".join([font_face, base_rule.group(0) if base_rule else '', *rules])
+
+# ===================================================================
+# ===== 3. Vendoring Pipeline
+# ===================================================================
+
+def _option_menu_dist():
+    import streamlit_option_menu
+    return os.path.join(os.path.dirname(streamlit_option_menu.__file__), 'frontend', 'dist')
+
+def vendor_bootstrap_icons(dist_dir=None):
+    """
+    Extracts Bootstrap Icons (CSS section + woff2 font) from the streamlit-option-menu
+    build, which bundles the same release the app used to load from the CDN.
+    """
+    dist_dir = dist_dir or _option_menu_dist()
+    bundle_css = ''
+    for css_path in glob.glob(os.path.join(dist_dir, 'css', '*.css')):
+        with open(css_path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        if f'Bootstrap Icons v{BOOTSTRAP_ICONS_VERSION}' in text:
+            bundle_css = text
+            break
+    fonts = glob.glob(os.path.join(dist_dir, 'fonts', 'bootstrap-icons*.woff2'))
+    if not bundle_css or not fonts:
+        raise FileNotFoundError(f"Bootstrap Icons v{BOOTSTRAP_ICONS_VERSION} not found in {dist_dir}")
+
+    base_rule = _ICON_BASE_RULE_RE.search(bundle_css)
+    rules = _ICON_RULE_RE.findall(bundle_css)
+    css = "\n".join([
+        f"/*!\n * Bootstrap Icons v{BOOTSTRAP_ICONS_VERSION} (https://icons.getbootstrap.com/)\n"
+        " * Copyright 2019-2024 The Bootstrap Authors\n"
+        " * Licensed under MIT (https://github.com/twbs/icons/blob/main/LICENSE)\n */",
+        '@font-face{font-display:block;font-family:bootstrap-icons;src:url("bootstrap-icons.woff2") format("woff2")}',
+        base_rule.group(0) if base_rule else '',
+        *(f'.bi-{name}::before{{content:"{code}"}}' for name, code in rules),
+    ]) + "\n"
+
+    target_dir = os.path.join(VENDOR_DIR, os.path.dirname(BOOTSTRAP_ICONS_CSS))
+    os.makedirs(target_dir, exist_ok=True)
+    with open(os.path.join(VENDOR_DIR, BOOTSTRAP_ICONS_CSS), 'w', encoding='utf-8') as f:
+        f.write(css)
+    shutil.copyfile(fonts[0], os.path.join(VENDOR_DIR, BOOTSTRAP_ICONS_FONT))
+    write_used_icon_list()
+    return len(rules)
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--icons']:
+        print(f"Wrote {write_used_icon_list()} used icon names to {BOOTSTRAP_ICONS_USED}")
+    else:
+        count = vendor_bootstrap_icons(sys.argv[1] if len(sys.argv) > 1 else None)
+        print(f"Vendored Bootstrap Icons v{BOOTSTRAP_ICONS_VERSION} ({count} icons) into {VENDOR_DIR}")
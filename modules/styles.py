@@ -1,3 +1,17 @@
+"""
+Application Styles
+CSS sheets of the app, grouped into bundles (STYLE_BUNDLES). A bundle is built
+once per process (minified, @import rules hoisted) and injected as one <style>.
+"""
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+import streamlit as st
+
+from .static_assets import bootstrap_icons_css
+
+
 def get_css():
     """Return GitHub Dark Premium CSS styling"""
     return """
@@ -1143,9 +1157,6 @@ def get_css():
         
 
         /* ==================== DATA SOURCE TABLE - ENHANCED VISIBILITY ==================== */
-        /* Font Awesome for Icons */
-        @import url('https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css');
-        
         /* Table Container */
         .ds-table-wrapper {
             background: var(--bg-overlay, #1c2128);
@@ -1564,4 +1575,888 @@ def get_css():
             font-family: 'SF Mono', Monaco, 'Courier New', monospace !important;
         }
     </style>
-    """
\ No newline at end of file
+    """
+
+
+def get_hybrid_css():
+    """Step card, toolbar and live preview styling (CRUD Generator / Keyword Factory tabs)"""
+    return """
+    <style>
+
+        /* --- 1. Live Code Preview --- */
+        .code-preview-container {
+            max-height: 800px; /* (V3.7) Increased height */
+            overflow-y: auto;
+            border: 1px solid #30363d;
+            border-radius: 8px;
+            margin-bottom: 1rem;
+            background: #0d1117;
+            /* (V3.7) Added sticky position */
+            position: sticky;
+            top: 60px; /* Adjust this value based on your header height */
+        }
+        .code-preview-container .stCodeBlock { height: 100%; margin-bottom: 0; }
+
+        /* --- 2. Dialog Button Left-Align --- */
+        div[data-testid="stDialog"] div[data-testid="stExpander"] div[data-testid="stButton"] > button { justify-content: flex-start !important; text-align: left; padding-left: 1rem; }
+
+        /* --- 3. Top Tabs --- */
+        .stTabs [data-baseweb="tab-list"] { gap: 8px; background: rgba(30, 41, 59, 0.5); padding: 8px; border-radius: 12px; margin-bottom: 1rem; }
+        .stTabs [data-baseweb="tab"] { background: transparent; border-radius: 8px; padding: 10px 18px; font-weight: 600; transition: all 0.3s ease; }
+        .stTabs [data-baseweb="tab"]:hover { background: rgba(88, 166, 255, 0.1); }
+        .stTabs [data-baseweb="tab"][aria-selected="true"] { background: linear-gradient(135deg, rgba(88, 166, 255, 0.2), rgba(88, 166, 255, 0.1)); border-bottom: 3px solid #58a6ff; color: #c9d1d9; }
+
+        /* --- 4. Step Card --- */
+        .step-card {
+            width: 100%;
+            margin-bottom: 0.75rem;
+            position: relative;
+            background: #161b22;
+            border: 1px solid #30363d;
+            border-radius: 8px;
+            transition: all 0.3s ease;
+        }
+        .step-card:hover { border-color: #8b949e; }
+
+        /* Header Container */
+        .step-card > div > div > div > .stColumns {
+            border-bottom: 1px solid #30363d;
+            padding: 0.5rem 0.75rem;
+            align-items: center;
+        }
+        /* Header Content Wrapper */
+        .step-header-content { display: flex; align-items: center; gap: 0.75rem; }
+        /* Inline Step Number */
+        .step-number-inline {
+            font-size: 1.2rem;
+            font-weight: 700;
+            color: #ffffff;
+            background: linear-gradient(135deg, #1f4788 0%, #0d2d5e 100%);
+            border: 1px solid #2d5a9e;
+            border-radius: 8px;
+            padding: 0.4rem 0.6rem;
+            min-width: 37px;
+            height: 37px;
+            display: inline-flex;
+            align-items: center;
+            justify-content: center;
+            line-height: 1;
+            box-shadow: 0 2px 8px rgba(15, 45, 94, 0.4),
+                        0 0 0 1px rgba(45, 90, 158, 0.5),
+                        inset 0 1px 0 rgba(255, 255, 255, 0.1);
+            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.6);
+        }
+        /* Keyword Display */
+        .step-keyword { display: flex; flex-direction: column; justify-content: center; gap: 0rem; }
+        .step-keyword-label { font-size: 0.7rem; font-weight: 600; text-transform: uppercase; color: #8b949e; }
+        .step-keyword-name { font-size: 1.1rem; font-weight: 600; color: #58a6ff; line-height: 1.3; }
+
+
+        /* === REVISED TOOLBAR (IMPROVED) === */
+        /* Wrapper container - compact alignment */
+        .step-card-toolbar-wrapper {
+            display: flex;
+            justify-content: flex-end;
+            align-items: center;
+            gap: 0.2rem !important;
+            padding: 0 !important;
+            margin: 0 !important;
+        }
+
+        /* Hide Column wrapper styling completely */
+        .step-card-toolbar-wrapper > div[data-testid="column"] {
+            padding: 0 !important;
+            margin: 0 !important;
+            background: transparent !important;
+            border: none !important;
+            box-shadow: none !important;
+            min-width: auto !important;
+            width: auto !important;
+            flex: 0 0 auto !important;
+        }
+
+        .step-card-toolbar-wrapper > div[data-testid="column"]:hover {
+            transform: none !important;
+            box-shadow: none !important;
+            background: transparent !important;
+        }
+
+        /* Hide inner div that wraps the button */
+        .step-card-toolbar-wrapper div[data-testid="column"] > div {
+            padding: 0 !important;
+            margin: 0 !important;
+            width: 20px !important;
+            height: 20px !important;
+        }
+
+        /* Button styling - clean and minimal */
+        .step-card-toolbar-wrapper .stButton {
+            width: 20px !important;
+            height: 20px !important;
+            margin: 0 !important;
+            padding: 0 !important;
+        }
+
+        .step-card-toolbar-wrapper .stButton button {
+            width: 20px !important;
+            height: 20px !important;
+            min-width: 20px !important;
+            min-height: 20px !important;
+            padding: 0 !important;
+            margin: 0 !important;
+            font-size: 0.8rem !important;
+            line-height: 1 !important;
+            border-radius: 5px !important;
+            background: transparent !important;
+            border: 1px solid transparent !important;
+            box-shadow: none !important;
+            display: flex !important;
+            justify-content: center !important;
+            align-items: center !important;
+            overflow: hidden;
+            color: var(--text-tertiary) !important;
+            transition: all 0.15s ease !important;
+        }
+
+        /* Hover effects */
+        .step-card-toolbar-wrapper .stButton button:hover {
+            background: var(--bg-subtle) !important;
+            border-color: var(--border-default) !important;
+            color: var(--text-primary) !important;
+            transform: scale(1.08);
+            box-shadow: var(--shadow-sm) !important;
+        }
+
+        /* Active state */
+        .step-card-toolbar-wrapper .stButton button:active {
+            transform: scale(0.95);
+            filter: brightness(0.9);
+        }
+
+        /* Icon sizing */
+        .step-card-toolbar-wrapper .stButton button i,
+        .step-card-toolbar-wrapper .stButton button svg {
+            font-size: inherit !important;
+            width: 1em;
+            height: 1em;
+        }
+        /* === END REVISED TOOLBAR === */
+
+
+        /* Caption (Argument) Styling */
+
+        /* Caption (Argument) Styling */
+        .step-card .stCaption { 
+            padding: 0.1rem 1rem 0.6rem 1rem; 
+            color: #58a6ff !important;; /* เปลี่ยนเป็นสีฟ้าเหมือน keyword */
+            font-size: 0.8rem; 
+            font-family: 'SF Mono', 'Monaco', 'Courier New', monospace; 
+            line-height: 1.4; 
+            margin-top: -0.2rem; 
+            display: block; 
+            width: 100%; 
+            word-wrap: break-word; 
+            white-space: normal; /* แสดงหลายบรรทัดได้ */
+            overflow-wrap: break-word; /* แบ่งคำยาวๆ */
+        }
+
+        /* --- NEW: Inline Edit Section Styling --- */
+        .crud-edit-section {
+            padding: 1rem 1.25rem;
+            background: rgba(30, 41, 59, 0.3); /* Slightly different background */
+            border-top: 1px solid #30363d;
+            border-radius: 0 0 7px 7px; /* Match card rounding */
+        }
+        .crud-edit-section h5 { /* Style the 'Edit Step' title */
+            margin-top: 0;
+            margin-bottom: 1rem;
+            color: #c9d1d9;
+        }
+        .crud-edit-section .stSelectbox, .crud-edit-section .stTextInput {
+            margin-bottom: 0.75rem; /* Space between inputs */
+        }
+
+        /* --- Existing Styles --- */
+        button[kind="secondary"] { background: #21262d; border: 1px solid #30363d; }
+        button[kind="secondary"]:hover { background: #30363d; border-color: #8b949e; }
+        h4, h3 { color: #58a6ff; border-bottom: 2px solid #30363d; padding-bottom: 0.5rem; margin-bottom: 1rem; }
+        .stMetric { background: #161b22; padding: 0.75rem; border-radius: 8px; border: 1px solid #30363d; }
+        .stAlert { border-radius: 8px; border-left: 4px solid; }
+    </style>
+
+    """
+
+
+def get_add_dialog_css():
+    """Add Step dialog styling"""
+    return """
+    <style>
+        /* Inter when installed locally, no web font download */
+        .stApp { 
+            font-family: 'Inter', system-ui, sans-serif; 
+        }
+
+        /* ✅ FIX: เร่ง Dialog Animation */
+        div[data-testid="stDialog"] {
+            animation: fadeIn 0.15s ease-in !important;  /* เร็วขึ้นจาก 0.3s */
+        }
+
+        @keyframes fadeIn {
+            from { opacity: 0; transform: scale(0.98); }
+            to { opacity: 1; transform: scale(1); }
+        }
+
+        /* Dialog container adjustments */
+        div[data-testid="stDialog"] > div > div[data-testid="stVerticalBlock"] > div:first-child {
+            padding-top: 0.5rem !important;
+        }
+
+        /* ✅ FIX: ลด blur effect เพื่อความเร็ว */
+        div[data-testid="stDialog"] > div {
+            background-color: rgba(15, 23, 42, 0.40) !important;  /* สีน้ำเงินเข้ม + โปร่ง */
+            backdrop-filter: blur(8px) saturate(1.2) !important;  /* Blur + เพิ่มสีสัน */
+            border: 1px solid rgba(255, 255, 255, 0.1) !important; /* ขอบโปร่งใส */
+            transition: opacity 0.1s ease-in !important;  /* เร็วขึ้น */
+        }
+
+        /* Back button styling */
+        .back-button-container {
+            margin-bottom: 1rem;
+        }
+
+        /* Column layout improvements with clear borders and depth */
+        .keyword-column {
+            background: linear-gradient(145deg, #2d333b, #22272e);
+            border: 1px solid #444c56;
+            border-left: 3px solid #539bf5;
+            border-radius: 8px;
+            padding: 1.5rem;
+            height: 70vh;
+            overflow-y: auto;
+            box-shadow: 
+                0 0 0 1px rgba(110, 118, 129, 0.4),
+                0 8px 24px rgba(0, 0, 0, 0.4),
+                inset 0 1px 0 rgba(255, 255, 255, 0.05);
+            position: relative;
+            /* ✅ เพิ่ม GPU acceleration */
+            will-change: transform;
+            transform: translateZ(0);
+        }
+
+        .keyword-column::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 1px;
+            background: linear-gradient(90deg, transparent, rgba(83, 155, 245, 0.3), transparent);
+        }
+
+        .config-column {
+            background: linear-gradient(145deg, #2d333b, #22272e);
+            border: 1px solid #444c56;
+            border-left: 3px solid #768390;
+            border-radius: 8px;
+            padding: 1.5rem 2rem;
+            height: 70vh;
+            overflow-y: auto;
+            box-shadow: 
+                0 0 0 1px rgba(110, 118, 129, 0.4),
+                0 8px 24px rgba(0, 0, 0, 0.4),
+                inset 0 1px 0 rgba(255, 255, 255, 0.05);
+            position: relative;
+            /* ✅ เพิ่ม GPU acceleration */
+            will-change: transform;
+            transform: translateZ(0);
+        }
+
+        .config-column::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 1px;
+            background: linear-gradient(90deg, transparent, rgba(118, 131, 144, 0.3), transparent);
+        }
+
+        /* ✅ ปรับ Search box ให้ render เร็วขึ้น */
+        div[data-testid="stDialog"] .stTextInput > div > div > input {
+            background-color: #2d333b !important;
+            border: 1px solid #444c56 !important;
+            border-radius: 6px !important;
+            padding: 0.65rem 1rem !important;
+            font-size: 0.95rem !important;
+            color: #adbac7 !important;
+            transition: border-color 0.15s ease-in !important;  /* ลด transition time */
+        }
+
+        div[data-testid="stDialog"] .stTextInput > div > div > input:focus {
+            border-color: #539bf5 !important;
+            box-shadow: 0 0 0 2px rgba(83, 155, 245, 0.15) !important;  /* ลด shadow */
+            background-color: #22272e !important;
+        }
+
+        div[data-testid="stDialog"] .stTextInput > div > div > input::placeholder {
+            color: #768390 !important;
+        }
+
+        /* ✅ ปรับ Expander ให้ render เร็วขึ้น */
+        div[data-testid="stDialog"] [data-testid="stExpander"] {
+            background-color: transparent !important;
+            border: none !important;
+            margin-bottom: 8px !important;
+        }
+
+        div[data-testid="stDialog"] [data-testid="stExpander"] > div:first-child {
+            background-color: #2d333b !important;
+            border: 1px solid #444c56 !important;
+            border-radius: 6px !important;
+            padding: 0.7rem 1rem !important;
+            transition: background-color 0.15s ease-in !important;  /* ลด transition */
+            color: #adbac7 !important;
+        }
+
+        div[data-testid="stDialog"] [data-testid="stExpander"] > div:first-child:hover {
+            background-color: #373e47 !important;
+            border-color: #539bf5 !important;
+        }
+
+        /* ✅ ปรับ Button animation ให้เร็วขึ้น */
+        div[data-testid="stDialog"] div[data-testid="stButton"] > button[kind="secondary"] {
+            display: flex;
+            align-items: center;
+            justify-content: flex-start;
+            width: 100%;
+            padding: 0.7rem 1rem;
+            border-radius: 6px;
+            border: 1px solid #444c56;
+            background-color: #2d333b;
+            color: #adbac7;
+            font-weight: 500;
+            font-size: 0.92rem;
+            text-align: left;
+            transition: all 0.1s ease-in !important;  /* ลดจาก 0.2s */
+        }
+
+        div[data-testid="stDialog"] div[data-testid="stButton"] > button[kind="secondary"]:hover {
+            border-color: #539bf5;
+            background-color: #373e47;
+            color: #cdd9e5;
+            transform: translateX(2px);  /* ลดจาก 4px */
+        }
+
+        /* ✅ ซ่อน animation ที่ไม่จำเป็น */
+        * {
+            -webkit-tap-highlight-color: transparent;
+        }
+    </style>
+
+    """
+
+
+def get_test_flow_css():
+    """Test Flow tab styling"""
+    return """
+    <style>
+        /* Section Expander Styling */
+        .stExpander {
+            background: rgba(30, 41, 59, 0.5);
+            border: 1px solid #374151;
+            border-radius: 12px;
+            overflow: hidden;
+            margin-bottom: 1.5rem;
+        }
+
+        div[data-testid="stExpander"] > div:last-child {
+            background-color: rgba(15, 23, 42, 0.4);
+            padding: 1.5rem 1rem;
+        }
+
+        /* Card Wrapper - Centers cards */
+        .card-wrapper {
+            display: flex;
+            justify-content: center;
+            width: 100%;
+            flex-direction: column;
+            align-items: center;
+        }
+
+        /* Modern Step Card - Softer colors */
+        .step-card {
+            width: 96%;
+            max-width: 1200px;
+            margin-bottom: 1rem;
+            position: relative;
+            background: linear-gradient(145deg, #1e293b 0%, #0f172a 100%);
+            border: 1px solid rgba(71, 85, 105, 0.3);
+            border-radius: 12px;
+            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.3);
+            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
+            overflow: hidden;
+        }
+
+        .step-card:hover {
+            border-color: rgba(100, 116, 139, 0.5);
+            transform: translateY(-2px);
+            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.4);
+        }
+
+        /* Accent Border - Left Side - More subtle */
+        .step-card::before {
+            content: '';
+            position: absolute;
+            left: 0;
+            top: 0;
+            bottom: 0;
+            width: 4px;
+            background: linear-gradient(180deg, #64748b 0%, #475569 100%);
+            opacity: 0.6;
+        }
+
+        /* Top Accent Line - Removed for cleaner look */
+        .step-card::after {
+            display: none;
+        }
+
+        /* Header Container - Enhanced depth */
+        .step-header-container {
+            padding: 0.3rem 1rem;
+            background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(15, 23, 42, 0.8) 100%);
+            border-bottom: 1px solid rgba(71, 85, 105, 0.4);
+            position: relative;
+            display: flex;
+            align-items: center;
+            min-height: 52px;
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4),
+                        0 2px 4px rgba(0, 0, 0, 0.3) inset;
+        }
+
+        /* Header Bottom Accent Line - Subtle 3D effect */
+        .step-header-container::after {
+            content: '';
+            position: absolute;
+            left: 0;
+            bottom: 0;
+            right: 0;
+            height: 1px;
+            background: linear-gradient(90deg, 
+                transparent 0%,
+                rgba(148, 163, 184, 0.3) 50%,
+                transparent 100%);
+        }
+
+        /* Step Number Badge - Enhanced 3D depth */
+        .step-number {
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            width: 48px;
+            height: 48px;
+            background: linear-gradient(135deg, #52627a 0%, #3d4c5f 50%, #2d3748 100%);
+            border-radius: 10px;
+            font-size: 1.3rem;
+            font-weight: 700;
+            color: #e2e8f0;
+            box-shadow: 0 4px 8px rgba(0, 0, 0, 0.4),
+                        0 1px 2px rgba(0, 0, 0, 0.3),
+                        0 0 0 1px rgba(148, 163, 184, 0.15),
+                        inset 0 1px 1px rgba(255, 255, 255, 0.1),
+                        inset 0 -2px 4px rgba(0, 0, 0, 0.3);
+            position: relative;
+            border: 1px solid rgba(71, 85, 105, 0.4);
+            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
+        }
+
+        .step-number::after {
+            content: '';
+            position: absolute;
+            inset: 0;
+            border-radius: 10px;
+            background: linear-gradient(135deg, 
+                rgba(255, 255, 255, 0.15) 0%, 
+                transparent 50%, 
+                rgba(0, 0, 0, 0.2) 100%);
+            pointer-events: none;
+        }
+
+        /* Keyword Display */
+        .step-keyword {
+            display: flex;
+            flex-direction: column;
+            justify-content: center;
+            gap: 0.3rem;
+            padding: 0.5rem 0;
+        }
+
+        .step-keyword-label {
+            font-size: 0.85rem;
+            font-weight: 700;
+            text-transform: uppercase;
+            letter-spacing: 0.08em;
+            color: #94a3b8;
+        }
+
+        .step-keyword-name {
+            font-size: 1.5rem;
+            font-weight: 700;
+            color: #f1f5f9;
+            display: flex;
+            align-items: center;
+            gap: 0.5rem;
+            line-height: 1.3;
+        }
+
+        .step-keyword-name::before {
+            content: '⚡';
+            font-size: 1rem;
+        }
+
+        /* Action Buttons - Enhanced 3D depth */
+        .stButton > button {
+            border-radius: 8px;
+            border: 1px solid rgba(71, 85, 105, 0.6);
+            background: linear-gradient(135deg, #3d4c5f 0%, #2d3748 50%, #1e293b 100%);
+            color: #cbd5e1;
+            font-weight: 600;
+            transition: all 0.25s cubic-bezier(0.4, 0, 0.2, 1);
+            height: 36px;
+            font-size: 1rem;
+            padding: 0.4rem 0.5rem;
+            box-shadow: 0 3px 6px rgba(0, 0, 0, 0.4),
+                        0 1px 2px rgba(0, 0, 0, 0.3),
+                        inset 0 1px 1px rgba(255, 255, 255, 0.1),
+                        inset 0 -2px 4px rgba(0, 0, 0, 0.2);
+            position: relative;
+            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
+        }
+
+        .stButton > button::before {
+            content: '';
+            position: absolute;
+            inset: 0;
+            border-radius: 8px;
+            background: linear-gradient(135deg, 
+                rgba(255, 255, 255, 0.1) 0%, 
+                transparent 50%, 
+                rgba(0, 0, 0, 0.15) 100%);
+            pointer-events: none;
+        }
+
+        .stButton > button:hover {
+            background: linear-gradient(135deg, #4a5a70 0%, #3d4c5f 50%, #334155 100%);
+            border-color: #64748b;
+            color: #ffffff;
+            transform: translateY(-2px);
+            box-shadow: 0 6px 12px rgba(0, 0, 0, 0.5),
+                        0 2px 4px rgba(0, 0, 0, 0.3),
+                        inset 0 1px 2px rgba(255, 255, 255, 0.15),
+                        inset 0 -2px 4px rgba(0, 0, 0, 0.2);
+        }
+
+        .stButton > button:active {
+            transform: translateY(0px);
+            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.4),
+                        inset 0 2px 4px rgba(0, 0, 0, 0.3);
+        }
+
+        .stButton > button:disabled {
+            opacity: 0.35;
+            cursor: not-allowed;
+            background: #1e293b;
+            border-color: #334155;
+            color: #64748b;
+            transform: none;
+        }
+        .step-card-toolbar .stButton > button {
+            height: 42px;
+            width: 42px;
+            padding: 0;
+            justify-content: center;
+            font-size: 1.2rem;
+        }
+
+        .step-card-toolbar .stButton > button:hover {
+            /* สไตล์ตอน hover ยังคงเหมือนเดิม */
+        }
+
+        /* Card Body */
+        .step-body {
+            padding: 0.1rem 1.75rem 0.1rem 1.75rem;
+            background: rgba(15, 23, 42, 0.4);
+            border-top: 1px solid rgba(71, 85, 105, 0.2);
+        }
+
+        /* Arguments Section - Remove top spacing */
+        .args-section-title {
+            font-size: 0.85rem;
+            font-weight: 700;
+            text-transform: uppercase;
+            letter-spacing: 0.1em;
+            color: #94a3b8;
+            margin-bottom: 1rem;
+            margin-top: 0;
+            display: flex;
+            align-items: center;
+            gap: 0.6rem;
+            padding-bottom: 0.6rem;
+            padding-top: 0;
+            border-bottom: 2px solid rgba(71, 85, 105, 0.3);
+        }
+
+        .args-section-title i {
+            color: #64748b;
+            font-size: 1.1rem;
+        }
+
+        /* Arguments Grid */
+        .args-grid {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
+            gap: 1rem;
+        }
+
+        @media (max-width: 768px) {
+            .args-grid {
+                grid-template-columns: 1fr;
+            }
+        }
+
+        /* Argument Card - Plain style */
+        .arg-card {
+            background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(15, 23, 42, 0.6) 100%);
+            border: 1px solid rgba(71, 85, 105, 0.3);
+            border-radius: 10px;
+            padding: 1rem;
+            transition: all 0.3s ease;
+            position: relative;
+            overflow: hidden;
+        }
+
+        .arg-card::before {
+            content: '';
+            position: absolute;
+            top: 0;
+            left: 0;
+            right: 0;
+            height: 2px;
+            background: linear-gradient(90deg, #64748b 0%, #475569 100%);
+            opacity: 0;
+            transition: opacity 0.3s ease;
+        }
+
+        .arg-card:hover {
+            border-color: rgba(100, 116, 139, 0.5);
+            transform: translateY(-2px);
+            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
+        }
+
+        .arg-card:hover::before {
+            opacity: 0.5;
+        }
+
+        .arg-label {
+            color: #94a3b8;
+            font-size: 0.75rem;
+            font-weight: 700;
+            text-transform: uppercase;
+            letter-spacing: 0.05em;
+            margin-bottom: 0.6rem;
+            display: flex;
+            align-items: center;
+            gap: 0.4rem;
+        }
+
+        .arg-label::before {
+            content: '●';
+            color: #64748b;
+            font-size: 0.5rem;
+        }
+
+        .arg-value {
+            color: #e2e8f0;
+            font-size: 0.95rem;
+            font-family: 'SF Mono', 'Monaco', 'Cascadia Code', 'Courier New', monospace;
+            background: rgba(30, 41, 59, 0.5);
+            padding: 0.75rem 0.85rem;
+            border-radius: 8px;
+            border: 1px solid rgba(71, 85, 105, 0.2);
+            word-break: break-word;
+            line-height: 1.5;
+            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.2) inset;
+        }
+
+        /* No Arguments State */
+        .no-args {
+            text-align: center;
+            padding: 2.5rem 1.5rem;
+            color: #64748b;
+            font-style: italic;
+            font-size: 0.95rem;
+            grid-column: 1 / -1;
+            background: rgba(30, 41, 59, 0.3);
+            border-radius: 10px;
+            border: 2px dashed rgba(71, 85, 105, 0.3);
+        }
+
+        .no-args i {
+            display: block;
+            font-size: 2.5rem;
+            margin-bottom: 0.75rem;
+            opacity: 0.25;
+            color: #475569;
+        }
+
+        /* Edit Section - Softer background */
+        .edit-section {
+            padding: 1.5rem 2rem;
+            background: rgba(30, 41, 59, 0.3);
+            border-top: 1px solid rgba(71, 85, 105, 0.3);
+        }
+
+        /* Keyword Info Box - Softer accent */
+        .keyword-info {
+            background: rgba(30, 41, 59, 0.4);
+            border-left: 3px solid #64748b;
+            padding: 1.25rem;
+            border-radius: 10px;
+            margin-bottom: 1.25rem;
+            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.2);
+        }
+
+        .keyword-info-title {
+            font-weight: 700;
+            color: #cbd5e1;
+            font-size: 1.05rem;
+            margin-bottom: 0.5rem;
+        }
+
+        /* Responsive adjustments */
+        @media (max-width: 1024px) {
+            .step-card {
+                width: 98%;
+            }
+
+            .step-header-container {
+                padding: 1rem 1.25rem;
+            }
+
+            .step-body {
+                padding: 0.5rem 0.5rem;
+            }
+        }
+    </style>
+
+    """
+
+
+def get_component_css():
+    """Sidebar folder tree and keyword tag styling (always loaded)"""
+    return """
+    <style>
+        [data-testid="stSidebar"] button[kind="secondary"][key*="folder_btn_"] {
+            background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(51, 65, 85, 0.4) 100%) !important;
+            backdrop-filter: blur(12px);
+            border: 1px solid rgba(99, 102, 241, 0.3) !important;
+            border-left: 3px solid #6366f1 !important;
+            border-radius: 10px !important;
+            color: #cbd5e1 !important;
+            text-align: left !important;
+            padding: 10px 16px !important;
+            transition: all 0.3s ease !important;
+            height: auto !important;
+            min-height: auto !important;
+            justify-content: flex-start !important;
+        }
+        [data-testid="stSidebar"] button[kind="secondary"][key*="folder_btn_"]:hover {
+            border-color: rgba(129, 140, 248, 0.5) !important;
+            box-shadow: 0 4px 16px rgba(99, 102, 241, 0.25) !important;
+            transform: translateX(2px) !important;
+            background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(51, 65, 85, 0.4) 100%) !important;
+            filter: none !important;
+        }
+    </style>
+    <style>
+    .tag-container {
+        display: flex;
+        flex-wrap: wrap;
+        gap: 4px;
+        margin-top: 5px;
+    }
+    .tag {
+        font-size: 0.7rem;
+        font-weight: 600;
+        padding: 2px 6px;
+        border-radius: 10px;
+        background-color: #30363d; /* Default tag color */
+        color: #8b949e;
+        border: 1px solid #484f58;
+    }
+    .tag-imported { /* Specific style for 'imported' tag */
+        background-color: rgba(56, 139, 253, 0.1);
+        color: #79c0ff;
+        border: 1px solid rgba(56, 139, 253, 0.4);
+    }
+    .tag-from { /* Specific style for 'from:' tag */
+        background-color: rgba(110, 118, 129, 0.1);
+        color: #8b949e;
+        border: 1px solid rgba(110, 118, 129, 0.4);
+    }
+    </style>
+    """
+
+
+# ===================================================================
+# ===== Style Bundles
+# ===================================================================
+
+def get_icon_css():
+    """Bootstrap Icons served from the vendored font (see modules/static_assets.py)"""
+    return f"<style>{bootstrap_icons_css(bool(st.get_option('server.enableStaticServing')))}</style>"
+
+STYLE_BUNDLES = {
+    'app': (get_icon_css, get_css, get_component_css),      # every rerun
+    'steps': (get_hybrid_css,),                 # CRUD Generator / Keyword Factory tabs
+    'add_dialog': (get_add_dialog_css,),
+    'test_flow': (get_test_flow_css,),
+}
+
+StyleBundle = namedtuple('StyleBundle', ['name', 'css', 'links'])
+
+_STYLE_TAG_RE = re.compile(r'</?style[^>]*>', re.IGNORECASE)
+_LINK_TAG_RE = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_IMPORT_RE = re.compile(r'@import\s+(?:url\([^)]*\)|"[^"]*"|\'[^\']*\')[^;]*;')
+_SPACE_RE = re.compile(r'\s+')
+_PUNCT_RE = re.compile(r'\s*([{};,])\s*')
+
+def minify_css(css):
+    """Drops comments and collapses whitespace (selectors and values are kept as written)."""
+    css = _COMMENT_RE.sub('', css)
+    return _PUNCT_RE.sub(r'\1', _SPACE_RE.sub(' ', css)).strip()
+
+@lru_cache(maxsize=None)
+def build_style_bundle(name):
+    """Minified CSS of a bundle; <link> tags of its sheets are kept aside."""
+    links, imports, rules = [], [], []
+    for sheet in STYLE_BUNDLES[name]:
+        text = sheet()
+        links.extend(_LINK_TAG_RE.findall(text))
+        css = _COMMENT_RE.sub('', _STYLE_TAG_RE.sub('', _LINK_TAG_RE.sub('', text)))
+        # @import is only honoured at the top of a stylesheet
+        imports.extend(_IMPORT_RE.findall(css))
+        rules.append(_IMPORT_RE.sub('', css))
+    return StyleBundle(name, minify_css(''.join(imports) + '\n'.join(rules)), tuple(links))
+
+# Streamlit's static file serving sends .css as text/plain with "nosniff", which
+# browsers refuse as a stylesheet, so bundles are always inlined.
+@lru_cache(maxsize=None)
+def style_markup(name):
+    bundle = build_style_bundle(name)
+    # Blank line: keeps the <style> line an HTML block for the markdown renderer
+    return '\n\n'.join(bundle.links + (f'<style>{bundle.css}</style>',))
+
+def inject_styles(name):
+    """Emits a style bundle (its minified CSS, built once per process)."""
+    st.markdown(style_markup(name), unsafe_allow_html=True)
@@ -4,8 +4,56 @@ Handles the business logic for the Test Flow tab, including script generation.
 (Version 15.2 - Integrated with advanced categorizer)
 """
 
+import uuid
 from .keyword_categorizer import categorize_keywords
+from .utils import format_robot_step_line as _format_step_for_script
+from .session_manager import get_workspace_history
+from .history import insert_op, pop_op, set_op, move_ops
+from .profiler import profiled
 
+# ===================================================================
+# ===== Timeline Edits (undoable, recorded on the studio workspace history)
+# ===================================================================
+
+def _apply_edit(ws_state, label, ops):
+    get_workspace_history('studio_workspace').apply(ws_state, label, ops)
+
+def undo(ws_state):
+    return get_workspace_history('studio_workspace').undo(ws_state)
+
+def redo(ws_state):
+    return get_workspace_history('studio_workspace').redo(ws_state)
+
+def _find_timeline_index(ws_state, timeline_key, step_id):
+    return next((i for i, s in enumerate(ws_state.get(timeline_key, [])) if s.get('id') == step_id), -1)
+
+def add_timeline_step(ws_state, timeline_key, new_step):
+    steps = ws_state.setdefault(timeline_key, [])
+    _apply_edit(ws_state, "Add step", [insert_op((timeline_key,), len(steps), new_step)])
+
+def delete_timeline_step(ws_state, timeline_key, step_id):
+    index = _find_timeline_index(ws_state, timeline_key, step_id)
+    if index != -1:
+        _apply_edit(ws_state, "Delete step", [pop_op(ws_state, (timeline_key,), index)])
+
+def move_timeline_step(ws_state, timeline_key, index, new_index):
+    if 0 <= new_index < len(ws_state.get(timeline_key, [])):
+        _apply_edit(ws_state, "Move step", move_ops(ws_state, (timeline_key,), index, new_index))
+
+def duplicate_timeline_step(ws_state, timeline_key, index):
+    new_step = ws_state[timeline_key][index].copy()
+    new_step['id'] = str(uuid.uuid4())
+    _apply_edit(ws_state, "Duplicate step", [insert_op((timeline_key,), index + 1, new_step)])
+
+def update_timeline_step(ws_state, timeline_key, step_id, keyword, args):
+    if _find_timeline_index(ws_state, timeline_key, step_id) != -1:
+        step_path = (timeline_key, step_id)
+        _apply_edit(ws_state, "Edit step", [
+            set_op(ws_state, step_path, 'keyword', keyword),
+            set_op(ws_state, step_path, 'args', args),
+        ])
+
+@profiled()
 def generate_robot_script_from_timeline(ws_state):
     """
     Generates a complete Robot Framework script from the timeline state.
@@ -7,7 +7,7 @@ import json
 from bs4 import BeautifulSoup
 from .utils import get_clean_locator_name, parse_robot_keywords
 from .file_manager import read_robot_variables_from_content, create_new_robot_file, append_robot_content_intelligently, scan_robot_project
-from .keyword_categorizer import categorize_keywords, get_category_stats, get_expansion_config, get_category_priority
+from .keyword_categorizer import get_keyword_library, get_expansion_config, get_category_priority
 from .menu_locator_manager import render_menu_locator_manager
 from .checkbox_keywords_generator import analyze_checkbox_structure, generate_checkbox_template_and_keyword
 
@@ -168,7 +168,7 @@ def render_resources_view_new():
 
     # --- LEFT: KEYWORDS ---
     with panel_grid[0]:
-        st.markdown("#### <i class='fa-solid fa-cubes'></i> Common Keywords", unsafe_allow_html=True)
+        st.markdown("#### <i class='bi bi-boxes'></i> Common Keywords", unsafe_allow_html=True)
         with st.container(border=True):
             curr_kw = ws_state.get('common_keyword_path', 'N/A')
             st.caption(f"Loaded from: **{curr_kw}**")
@@ -191,8 +191,9 @@ def render_resources_view_new():
             if ws_state.get('keywords'):
                 st.markdown("""<style>[data-testid="stExpander"] { margin-bottom: 1px !important; }</style>""", unsafe_allow_html=True)
                 
-                cats = categorize_keywords(ws_state['keywords'])
-                stats = get_category_stats(cats)
+                keyword_library = get_keyword_library(ws_state)
+                cats = keyword_library.categorized
+                stats = keyword_library.stats
                 exp_conf = get_expansion_config()
                 
                 c1, c2, c3 = st.columns(3)
@@ -231,7 +232,7 @@ def render_resources_view_new():
 
     # --- RIGHT: STATIC LOCATORS ---
     with panel_grid[1]:
-        st.markdown("#### <i class='fa-solid fa-bullseye'></i> Locators", unsafe_allow_html=True)
+        st.markdown("#### <i class='bi bi-bullseye'></i> Locators", unsafe_allow_html=True)
         with st.container(border=True):
             with st.expander("🍔 Menu Locator Management", expanded=False):
                 render_menu_locator_manager()
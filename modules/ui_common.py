@@ -4,39 +4,75 @@ Common UI Utility Functions
 Contains shared UI components and helper functions used across different modules.
 """
 import streamlit as st
+from streamlit.errors import StreamlitAPIException
 import uuid
-import json
-import numpy as n
 import re
-from pathlib import Path
 from .utils import util_get_csv_headers, get_clean_locator_name, format_args_as_string, util_get_csv_first_column_values
 from .keyword_categorizer import categorize_keywords
+from .argument_presets import PRESET_REGISTRY
+from .preview_service import PreviewService
+from .ui_components import code_preview_component
+
+# --- Undo / Redo Controls (shared by CRUD, Keyword Factory and Test Flow) ---
+def render_undo_redo_controls(history, undo_fn, redo_fn, key_prefix):
+    """Renders Undo/Redo buttons for a workspace history (see modules/history.py)."""
+    col_undo, col_redo = st.columns(2)
+    with col_undo:
+        if st.button("↶ Undo", key=f"{key_prefix}_undo", disabled=not history.can_undo, use_container_width=True,
+                     help=f"Undo: {history.undo_label}" if history.can_undo else "Nothing to undo"):
+            label = undo_fn()
+            if label:
+                st.toast(f"↶ Undone: {label}")
+            st.rerun()
+    with col_redo:
+        if st.button("↷ Redo", key=f"{key_prefix}_redo", disabled=not history.can_redo, use_container_width=True,
+                     help=f"Redo: {history.redo_label}" if history.can_redo else "Nothing to redo"):
+            label = redo_fn()
+            if label:
+                st.toast(f"↷ Redone: {label}")
+            st.rerun()
+
+# --- Argument Presets (one process-wide registry, see modules/argument_presets.py) ---
+def get_preset_registry():
+    """The shared preset registry; argument_presets.json is re-read when it changes."""
+    registry = PRESET_REGISTRY.refresh()
+    if registry.error and st.session_state.get('argument_presets_error_version') != registry.version:
+        st.session_state['argument_presets_error_version'] = registry.version
+        if registry.error == 'missing':
+            st.warning("⚠️ argument_presets.json not found. Using default text inputs.")
+        else:
+            st.error("❌ Error parsing argument_presets.json. Check JSON syntax.")
+    return registry
+
+# --- Live Code Preview (rendered in the background, see modules/preview_service.py) ---
+# While a render is queued the preview fragment polls; when it finds the render
+# finished it triggers one full rerun, which also clears the poll timer.
+PREVIEW_POLL_SECONDS = 0.5
+
+def get_preview_service(name, render):
+    """Per-session PreviewService for one preview; render(payload) -> script text."""
+    services = st.session_state.setdefault('preview_services', {})
+    if name not in services:
+        services[name] = PreviewService(render)
+    return services[name]
+
+def render_code_preview(name, version, payload, render):
+    """
+    Shows the latest completed render of a preview and queues `payload` when
+    `version` changed. A stale render is marked until the new one is ready.
+    """
+    state = get_preview_service(name, render).submit(version, payload)
+    st.fragment(_code_preview_fragment, run_every=PREVIEW_POLL_SECONDS if state.stale else None)(name, state.stale)
 
-# --- Argument Preset Loading (Moved from ui_test_flow.py) ---
-def load_argument_presets():
-    """Load argument presets from JSON file"""
-    try:
-        # Adjusted path to find assets folder relative to this file's parent
-        preset_path = Path(__file__).parent.parent / "assets" / "argument_presets.json"
-        with open(preset_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('presets', {}), data.get('patterns', {})
-    except FileNotFoundError:
-        st.warning("⚠️ argument_presets.json not found. Using default text inputs.")
-        return {}, {}
-    except json.JSONDecodeError:
-        st.error("❌ Error parsing argument_presets.json. Check JSON syntax.")
-        return {}, {}
-
-# Load presets at module level
-ARGUMENT_PRESETS, ARGUMENT_PATTERNS = load_argument_presets()
-
-ARGUMENT_PRESETS['button_name'] = {
-    "type": "select_or_input",
-    "options": ["OK", "Yes", "No", "Cancel", "Save", "Confirm", "Close", "Submit", "Back", "Next"],
-    "label": "🔘 Button Name (Text)",
-    "placeholder": "Enter button text (e.g., OK)"
-}
+def _code_preview_fragment(name, polling):
+    state = st.session_state['preview_services'][name].state()
+    if polling and not state.stale:
+        st.rerun()
+    if state.stale:
+        st.caption("⏳ Updating preview… showing the last completed version")
+    if state.error:
+        st.caption(f"⚠️ Preview failed: {state.error}")
+    code_preview_component(name, state.text, state.version)
 
 # --- Argument Input Rendering Functions (Moved from ui_test_flow.py) ---
 
@@ -331,18 +367,15 @@ def render_argument_input(arg_info, ws_state, unique_key_prefix, current_value=N
 
     # === END: NEW LOGIC (V7) ===
 
-    # Priority 2: Check Presets
-    if arg_name in ARGUMENT_PRESETS:
+    # Priority 2 / 3: Presets (exact name), then Patterns (partial name)
+    spec = get_preset_registry().resolve(arg_name)
+    if spec is not None and spec.kind == 'preset':
         return render_preset_input(
-            arg_name, ARGUMENT_PRESETS[arg_name], default_value,
+            arg_name, spec.config, default_value,
             unique_key_prefix, ws_state=ws_state # Pass ws_state
         )
-
-    # Priority 3: Check Patterns
-    arg_lower_pattern = arg_name.lower() # Use separate var if needed
-    for pattern_key, pattern_config in ARGUMENT_PATTERNS.items():
-        if pattern_key in arg_lower_pattern:
-            return render_pattern_input(arg_name, pattern_config, default_value, unique_key_prefix)
+    if spec is not None:
+        return render_pattern_input(arg_name, spec.config, default_value, unique_key_prefix)
 
 
     # Priority 4: Default Text Input
@@ -432,7 +465,7 @@ def render_verify_table_arguments_for_edit_mode(ws_state, unique_context_id, cur
                 assertion['id'] = assertion['col_value'].strip() # Update ID based on input
 
             with cols[1]:
-                assertion_preset = ARGUMENT_PRESETS.get('assertion', {})
+                assertion_preset = get_preset_registry().preset('assertion') or {}
                 options = assertion_preset.get('options', ['equal', 'contains', 'should be', 'should not be'])
                 default_index = options.index(assertion['assert_value']) if assertion['assert_value'] in options else 0
                 assertion['assert_value'] = st.selectbox(
@@ -665,7 +698,87 @@ def render_csv_insert_button(input_key, ws_state, button_label="📊"):
     return None
 
 # ======= REVISED STEP CARD (V3.6) =======
+# --- Step cards run as fragments: edits inside a card rerun only that card.
+# Structural changes (move / duplicate / delete) and Save still rerun the app
+# so numbering and the script preview stay in sync.
+_VIRTUAL_SECTION_KEYS = {
+    'action_detail_others': 'action_detail',
+    'verify_detail_others': 'verify_detail',
+}
+
+def rerun_card():
+    """Reruns only the enclosing card fragment (a full rerun when called during an app run)."""
+    try:
+        st.rerun(scope="fragment")
+    except StreamlitAPIException:
+        st.rerun()
+
+# --- Long step lists are windowed: only one page of full cards is rendered,
+# the steps before / after it collapse into one-line summaries.
+STEP_WINDOW_SIZE = 25
+
+def _step_summary_lines(steps, start, end, depths=None):
+    lines = []
+    for i in range(start, end):
+        step = steps[i]
+        indent = '    ' * depths[i] if depths else ''
+        args = format_args_as_string(step.get('args') or {})
+        lines.append(f"{i + 1:>4}. {indent}{step.get('keyword', '?')}  {args}".rstrip())
+    return "\n".join(lines)
+
+def _render_step_summaries(steps, start, end, depths=None):
+    with st.expander(f"Steps {start + 1}–{end} (collapsed)", expanded=False):
+        st.code(_step_summary_lines(steps, start, end, depths), language=None)
+
+def step_window_bounds(total, window_key, window_size=STEP_WINDOW_SIZE):
+    """(start, end) of the current page of a list; renders the page selector when needed."""
+    if total <= window_size:
+        return 0, total
+    page_count = (total + window_size - 1) // window_size
+    page_key = f"step_window_{window_key}"
+    if st.session_state.get(page_key, 0) >= page_count:
+        st.session_state[page_key] = page_count - 1
+    page = st.selectbox(
+        "Step page", range(page_count), key=page_key, label_visibility="collapsed",
+        format_func=lambda p: f"📄 Steps {p * window_size + 1}–{min(total, (p + 1) * window_size)} of {total}"
+    )
+    return page * window_size, min(total, (page + 1) * window_size)
+
+def render_step_window(steps, render_card, window_key, window_size=STEP_WINDOW_SIZE, depths=None):
+    """
+    Renders render_card(step, index) for the current page of steps only.
+    Steps outside the page are listed as collapsed one-line summaries.
+    """
+    start, end = step_window_bounds(len(steps), window_key, window_size)
+    if start > 0:
+        _render_step_summaries(steps, 0, start, depths)
+    for i in range(start, end):
+        render_card(steps[i], i)
+    if end < len(steps):
+        _render_step_summaries(steps, end, len(steps), depths)
+
+def render_step_cards_compact(steps, section_key, ws, manager_module, card_prefix="crud"):
+    """Windowed list of render_step_card_compact cards."""
+    render_step_window(
+        steps,
+        lambda step, i: render_step_card_compact(step, i, section_key, ws, manager_module, card_prefix=card_prefix),
+        f"{card_prefix}_{section_key}"
+    )
+
 def render_step_card_compact(step, index, section_key, ws, manager_module, card_prefix="crud"):
+    """Renders one CRUD step card as an independent fragment."""
+    _step_card_fragment(step['id'], index, section_key, ws, manager_module, card_prefix)
+
+@st.fragment
+def _step_card_fragment(step_id, index, section_key, ws, manager_module, card_prefix):
+    # Re-resolve by id: on a fragment rerun the arguments are the ones from the last full run
+    real_section_key = _VIRTUAL_SECTION_KEYS.get(section_key, section_key)
+    step = next((s for s in ws['steps'].get(real_section_key, []) if s.get('id') == step_id), None)
+    if step is None:
+        return
+    _render_step_card_compact(step, index, section_key, ws, manager_module, card_prefix)
+
+def _render_step_card_compact(step, index, section_key, ws, manager_module, card_prefix="crud"):
     """
     REVISED (V3.11) - Enhanced CSV/API config display
     Displays CSV configuration in caption.
@@ -673,8 +786,7 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
     """
     real_section_key = section_key
     ws_state = st.session_state.studio_workspace
-
-    global ARGUMENT_PRESETS, ARGUMENT_PATTERNS
+    preset_registry = get_preset_registry()
 
     # --- Logic to handle 'virtual' section keys ---
     if section_key == 'action_detail_others':
@@ -767,7 +879,7 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
 
                         # ✅ ไม่ต้องลบ prev_kw หรือ temp_args ออก — ให้คงไว้จนกว่าจะ save หรือ cancel
 
-                        st.rerun()
+                        rerun_card()
 
             with action_cols[3]:
                 if st.button("📋", key=f"copy_{real_section_key}_{step['id']}", help="Duplicate", use_container_width=True):
@@ -832,21 +944,16 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
         # --- Edit Mode: Show inputs ---
         st.markdown("<div class='crud-edit-section'>", unsafe_allow_html=True)
 
-        if 'categorized_keywords' not in ws_state:
-            all_keywords_list = ws_state.get('keywords', [])
-            if all_keywords_list:
-                from .keyword_categorizer import categorize_keywords
-                ws_state['categorized_keywords'] = categorize_keywords(all_keywords_list)
-
-        categorized_keywords = ws_state.get('categorized_keywords', {})
+        from .keyword_categorizer import get_keyword_library
+        categorized_keywords = get_keyword_library(ws_state).categorized
         
         # ✅ Smart Filter: ตรวจสอบประเภทของ step ที่กำลัง edit
         step_type = step.get('type', 'common')  # default เป็น common
         
         if step_type == 'keyword_factory' and card_prefix.startswith("crud"):
             # ถ้า step เป็น Keyword Factory → แสดงเฉพาะ Keyword Factory keywords
-            crud_ws = st.session_state.get('crud_generator_workspace', {})
-            all_kws = crud_ws.get('keyword_factory_keywords', [])
+            from .session_manager import get_keyword_registry
+            all_kws = get_keyword_registry().keywords()
             keyword_source = "Keyword Factory"
         else:
             # ถ้า step เป็น Common Keyword → แสดงเฉพาะ Common keywords
@@ -947,7 +1054,7 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                         for arg_item in selected_kw.get('args', []):
                             arg_name = arg_item.get('name', '').strip('${}')
                             is_locator = any(s in arg_name.lower() for s in ['locator', 'field', 'button', 'element', 'menu'])
-                            is_preset = arg_name in ARGUMENT_PRESETS
+                            is_preset = get_preset_registry().is_preset(arg_name)
                             if not is_locator and not is_preset:
                                 text_args.append(arg_name)
 
@@ -996,7 +1103,7 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                                     st.session_state[f"{base_key}_default_text"] = insert_syntax
 
                                 st.toast(f"✅ Inserted '{insert_syntax}' into '{target_arg}'", icon="✅")
-                                st.rerun()
+                                rerun_card()
                 else:
                     st.info("No CSV data sources found. Add them in Test Data tab.")
 
@@ -1104,8 +1211,8 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                         # Logic for other locators
                         final_value = st.session_state.get(f"{input_key}_locator_select", current_value)
 
-                elif clean_arg_name in ARGUMENT_PRESETS:
-                    config = ARGUMENT_PRESETS[clean_arg_name]
+                elif preset_registry.is_preset(clean_arg_name):
+                    config = preset_registry.preset(clean_arg_name)
                     input_type = config.get('type')
                     if input_type == "select_or_input":
                         selected = st.session_state.get(f"{input_key}_select")
@@ -1117,19 +1224,12 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                          final_value = 'true' if st.session_state.get(input_key, False) else 'false'
                     else:
                         final_value = st.session_state.get(input_key, current_value)
+                elif preset_registry.resolve(clean_arg_name) is not None:
+                    # Pattern input (key is base for pattern)
+                    final_value = st.session_state.get(input_key, current_value)
                 else:
-                    # Check patterns
-                    matched_pattern = False
-                    arg_lower = clean_arg_name.lower()
-                    for pattern_key in ARGUMENT_PATTERNS.keys():
-                        if pattern_key in arg_lower:
-                            final_value = st.session_state.get(input_key, current_value) # Key is base for pattern
-                            matched_pattern = True
-                            break
-
                     # Default Text Input
-                    if not matched_pattern:
-                        final_value = st.session_state.get(f"{input_key}_default_text", current_value)
+                    final_value = st.session_state.get(f"{input_key}_default_text", current_value)
 
                 # Update temp_args_key (ensure value is not None)
                 st.session_state[temp_args_key][clean_arg_name] = final_value if final_value is not None else current_value
@@ -1169,8 +1269,8 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                             final_value = st.session_state.get(f"{input_key}_sub_menu_select", '')
 
                         # --- 2. PRESETS (สำคัญ: เช็คก่อน Locator เพื่อดัก button_name) ---
-                        elif clean_arg_name in ARGUMENT_PRESETS:
-                            config = ARGUMENT_PRESETS[clean_arg_name]
+                        elif preset_registry.is_preset(clean_arg_name):
+                            config = preset_registry.preset(clean_arg_name)
                             input_type = config.get('type')
                             if input_type == "select_or_input":
                                 sel = st.session_state.get(f"{input_key}_select")
@@ -1188,15 +1288,10 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                             final_value = st.session_state.get(f"{input_key}_locator_select")
 
                         # --- 4. PATTERNS & DEFAULT ---
+                        elif preset_registry.resolve(clean_arg_name) is not None:
+                            final_value = st.session_state.get(input_key)
                         else:
-                            matched = False
-                            for p_key in ARGUMENT_PATTERNS.keys():
-                                if p_key in arg_lower:
-                                    final_value = st.session_state.get(input_key)
-                                    matched = True
-                                    break
-                            if not matched:
-                                final_value = st.session_state.get(f"{input_key}_default_text")
+                            final_value = st.session_state.get(f"{input_key}_default_text")
 
                         # Fallback & Update
                         if final_value is None: 
@@ -1276,7 +1371,7 @@ def render_step_card_compact(step, index, section_key, ws, manager_module, card_
                                 if widget_key_cleanup_cancel in st.session_state:
                                     try: del st.session_state[widget_key_cleanup_cancel]
                                     except KeyError: pass
-                st.rerun()
+                rerun_card()
 
         st.markdown("</div>", unsafe_allow_html=True)
 
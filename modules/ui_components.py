@@ -1,5 +1,12 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import base64
+import os
+from .styles import get_icon_css
+from .preview_service import diff_hunks
+
+_CODE_PREVIEW_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'components', 'code_preview')
+_code_preview = components.declare_component("code_preview", path=_CODE_PREVIEW_DIR)
 
 def render_header():
     """Render main header with enhanced description"""
@@ -30,7 +37,7 @@ def copy_button_component(text_to_copy, button_key):
     <html>
     <head>
         <meta charset="UTF-8">
-        <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.11.3/font/bootstrap-icons.min.css">
+        {get_icon_css()}
         <style>
             * {{ margin: 0; padding: 0; box-sizing: border-box; }}
             html, body {{
@@ -105,4 +112,28 @@ def copy_button_component(text_to_copy, button_key):
     </body>
     </html>
     """
-    return html
\ No newline at end of file
+    return html
+
+
+def code_preview_component(name, text, version, max_height=800):
+    """
+    Code preview that keeps its lines in the browser between reruns.
+
+    Only the line hunks between the previous render and this one are sent (the
+    changed lines are highlighted); the full text goes out on the first render
+    and whenever the component asks for a resync (e.g. after it was remounted).
+    """
+    sent_renders = st.session_state.setdefault('code_preview_sent', {})
+    key = f"code_preview_{name}"
+    request = st.session_state.get(key)
+    token = request.get('resync') if isinstance(request, dict) else None
+    lines = text.split('\n')
+    sent = sent_renders.get(name)
+    if sent is None or sent['token'] != token:
+        args = {'base': None, 'hunks': [], 'lines': lines}
+    elif sent['version'] == version:
+        args = {'base': version, 'hunks': [], 'lines': None}
+    else:
+        args = {'base': sent['version'], 'hunks': diff_hunks(sent['lines'], lines), 'lines': None}
+    sent_renders[name] = {'version': version, 'lines': lines, 'token': token}
+    _code_preview(version=version, max_height=max_height, key=key, default=None, **args)
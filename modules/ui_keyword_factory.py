@@ -9,17 +9,19 @@ import os  # <--- ตรวจสอบว่ามี import นี้
 import re
 import textwrap
 from . import kw_manager
-from .session_manager import get_clean_locator_name
-from .ui_common import render_argument_input, ARGUMENT_PRESETS, ARGUMENT_PATTERNS, extract_csv_datasource_keywords
+from .session_manager import get_clean_locator_name, get_workspace_history, get_keyword_registry
+from .ui_common import rerun_card, render_step_window, render_undo_redo_controls, render_argument_input, get_preset_registry, extract_csv_datasource_keywords, render_code_preview
 from .dialog_commonkw import render_add_step_dialog_base
-from .file_manager import append_robot_content_intelligently, create_new_robot_file, scan_robot_project
-from .test_flow_manager import categorize_keywords
+from .file_manager import append_robot_content_intelligently, create_new_robot_file, scan_robot_project, parse_keyword_files
+from .keyword_categorizer import get_keyword_library, CONTROL_FLOW_KEYWORDS
+from .keyword_usage import KeywordUsageIndex
 from datetime import datetime
 from .utils import parse_robot_keywords  # <--- ตรวจสอบว่ามี import นี้
-from .utils import scan_steps_for_variables, generate_arg_name_from_locator, format_args_as_string, format_args_as_multiline_string
+from .utils import plan_control_flow, generate_arg_name_from_locator, format_args_as_string, format_args_as_multiline_string
 from .utils import FILL_FORM_DEFAULTS, VERIFY_FORM_DEFAULTS
 from .simplified_quick_fill_dialog import render_kw_factory_fill_form_dialog as render_simplified_fill
 from .simplified_quick_verify_dialog import render_kw_factory_verify_detail_dialog as render_simplified_verify
+from .styles import inject_styles
 from .ui_reorder_component import render_sortable_arguments, render_sortable_steps
 
 # ======= ENTRY POINT FUNCTION =======
@@ -27,8 +29,7 @@ def render_keyword_factory_tab():
     """
     Main entry point for the Keyword Factory Tab
     """
-    from .crud_generator.ui_crud import inject_hybrid_css
-    inject_hybrid_css()
+    inject_styles('steps')
 
     kw_manager.initialize_workspace()
     ws = kw_manager._get_workspace()
@@ -70,29 +71,25 @@ def render_keyword_list_view(ws):
         if pageobject_files:
             new_keywords_imported_count = 0
             
-            # ใช้ st.spinner เพื่อแสดงสถานะการโหลด
+            # ใช้ st.spinner เพื่อแสดงสถานะการโหลด (parse หลายไฟล์พร้อมกันบน thread pool)
             with st.spinner(f"Scanning {len(pageobject_files)} files in `pageobjects` for keywords..."):
-                for rel_path in pageobject_files:
-                    full_path = os.path.join(project_path, rel_path)
-                    try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                        
-                        parsed_keywords = parse_robot_keywords(content)
-                        
-                        for kw in parsed_keywords:
-                            # ใช้ import function (ซึ่งตอนนี้เช็คซ้ำแบบเงียบๆ แล้ว)
-                            new_id = kw_manager.import_existing_keyword(
-                                kw['name'], 
-                                kw.get('args', []), 
-                                kw.get('doc', 'Imported keyword.'),
-                                tags=['Imported', f"from:{target_folder}"] # เพิ่ม Tag
-                            )
-                            if new_id:
-                                new_keywords_imported_count += 1
-                                
-                    except Exception as e:
-                        st.warning(f"Could not parse {rel_path}: {e}")
+                progress = st.progress(0.0, text="Parsing keyword files...")
+                parsed_by_file = {}
+                for done, (rel_path, keywords, error) in enumerate(
+                        parse_keyword_files(project_path, pageobject_files), start=1):
+                    if error:
+                        st.warning(f"Could not parse {rel_path}: {error}")
+                    parsed_by_file[rel_path] = keywords
+                    progress.progress(done / len(pageobject_files),
+                                      text=f"Parsed {done}/{len(pageobject_files)}: `{rel_path}`")
+
+                # ใช้ bulk import (เช็คซ้ำแบบเงียบๆ ใน pass เดียว) ตามลำดับไฟล์เดิม
+                new_ids = kw_manager.import_existing_keywords_bulk(
+                    (kw for rel_path in pageobject_files for kw in parsed_by_file.get(rel_path, [])),
+                    tags=['Imported', f"from:{target_folder}"] # เพิ่ม Tag
+                )
+                new_keywords_imported_count = len(new_ids)
+                progress.empty()
 
             if new_keywords_imported_count > 0:
                  st.toast(f"Auto-imported {new_keywords_imported_count} new keywords from `pageobjects`.", icon="✅")
@@ -111,42 +108,16 @@ def render_keyword_list_view(ws):
         st.rerun()
 
     all_keywords = kw_manager.get_all_keywords()
+    keyword_registry = get_keyword_registry()
+
+    if any('Imported' not in kw.get('tags', []) for kw in all_keywords):
+        render_export_all_keywords_section()
+
+    render_keyword_usage_section(all_keywords)
     
     st.markdown("---") 
     st.markdown("#### Manage Existing Keywords")
 
-    # --- NEW: Add CSS for Tags ---
-    st.markdown("""
-    <style>
-    .tag-container {
-        display: flex;
-        flex-wrap: wrap;
-        gap: 4px;
-        margin-top: 5px;
-    }
-    .tag {
-        font-size: 0.7rem;
-        font-weight: 600;
-        padding: 2px 6px;
-        border-radius: 10px;
-        background-color: #30363d; /* Default tag color */
-        color: #8b949e;
-        border: 1px solid #484f58;
-    }
-    .tag-imported { /* Specific style for 'imported' tag */
-        background-color: rgba(56, 139, 253, 0.1);
-        color: #79c0ff;
-        border: 1px solid rgba(56, 139, 253, 0.4);
-    }
-    .tag-from { /* Specific style for 'from:' tag */
-        background-color: rgba(110, 118, 129, 0.1);
-        color: #8b949e;
-        border: 1px solid rgba(110, 118, 129, 0.4);
-    }
-    </style>
-    """, unsafe_allow_html=True)
-    # --- END: Add CSS ---
-
     if not all_keywords:
         st.info("No keywords found. Create one, or set a project path in the sidebar to auto-import from `pageobjects`.")
         return
@@ -172,6 +143,8 @@ def render_keyword_list_view(ws):
                 if not is_imported:
                     st.caption(f"Steps: {len(kw.get('steps', []))}")
                 # --- END: แก้ไข ---
+                if keyword_registry.ref_count(kw['id']):
+                    st.caption("🔗 Used by CRUD Generator steps")
 
                 tags = kw.get('tags', [])
                 if tags:
@@ -204,12 +177,148 @@ def render_keyword_list_view(ws):
             # --- END: แก้ไข ---
 
 
+def render_export_all_keywords_section():
+    """Export every factory keyword into one resource file (single merged write)."""
+    project_path = st.session_state.get("project_path")
+
+    with st.expander("📦 Export All Keywords to Resource File", expanded=False):
+        if not project_path:
+            st.warning("⚠️ Project path not set in sidebar. Export disabled.")
+            return
+
+        all_robot_files = st.session_state.get('project_structure', {}).get('robot_files', [])
+        file_options = sorted(
+            f.replace(os.sep, '/') for f in all_robot_files
+            if f.replace(os.sep, '/').startswith(('resources/', 'pageobjects/'))
+        )
+        new_file_label = "➕ New file..."
+        target = st.selectbox("Target file:", [new_file_label] + file_options, key="kw_export_all_target")
+        if target == new_file_label:
+            target = st.text_input("New file (relative to project):",
+                                   value="resources/kw_factory_keywords.resource", key="kw_export_all_new_file")
+
+        include_imported = st.checkbox("Include imported keywords", value=False, key="kw_export_all_imported",
+                                       help="Imported keywords have no steps and already exist in pageobjects.")
+
+        if st.button("📦 Export All", type="primary", use_container_width=True, key="kw_export_all_btn"):
+            if not target or not target.endswith(('.robot', '.resource')):
+                st.error("File name must end with .robot or .resource")
+                return
+            full_path = os.path.join(project_path, target)
+            with st.spinner("Rendering keywords..."):
+                success, message, exported = kw_manager.export_all_keywords(
+                    full_path,
+                    include_imported=include_imported
+                )
+            if success:
+                st.success(f"{message} ({len(exported)} keyword(s) exported)" if exported else message)
+                st.session_state.project_structure = scan_robot_project(project_path)
+            else:
+                st.error(message)
+
+
+def _get_keyword_usage_index(all_keywords):
+    """Session-cached call-site index; only changed files are re-parsed on refresh."""
+    if 'keyword_usage_index' not in st.session_state:
+        st.session_state.keyword_usage_index = KeywordUsageIndex()
+    index = st.session_state.keyword_usage_index
+
+    project_path = st.session_state.get("project_path")
+    robot_files = st.session_state.get('project_structure', {}).get('robot_files', [])
+    if project_path:
+        index.refresh(project_path, robot_files)
+    index.set_factory_keywords([kw for kw in all_keywords if 'Imported' not in kw.get('tags', [])])
+    return index
+
+def render_keyword_usage_section(all_keywords):
+    """Call graph report: unused / dead keywords and the most-called ones."""
+    with st.expander("🕸️ Keyword Usage Analysis", expanded=False):
+        if not st.session_state.get("project_path"):
+            st.warning("⚠️ Project path not set in sidebar. Analysis disabled.")
+            return
+        # Expander bodies run on every rerun even when collapsed: scan only on request
+        if not st.toggle("Analyze project keyword usage", value=False, key="kw_usage_enabled",
+                         help="Scans every .robot file (changed files only after the first scan)."):
+            return
+
+        index = _get_keyword_usage_index(all_keywords)
+        summary = index.summary()
+
+        cols = st.columns(5)
+        cols[0].metric("Files", summary['files'])
+        cols[1].metric("Keywords", summary['keywords'])
+        cols[2].metric("Call Sites", summary['call_sites'])
+        cols[3].metric("Unused", summary['unused'])
+        cols[4].metric("Dead", summary['dead'], help="Not reachable from any test in testsuite/")
+
+        hot_tab, dead_tab, lookup_tab = st.tabs(["🔥 Hot Keywords", "💀 Unused / Dead", "🔎 Callers"])
+
+        with hot_tab:
+            hot = index.hot_keywords(limit=25)
+            if hot:
+                st.dataframe(
+                    [{'Keyword': r['name'], 'Calls': r['calls'], 'Callers': r['callers'], 'Defined In': r['source']} for r in hot],
+                    use_container_width=True, hide_index=True
+                )
+            else:
+                st.caption("No calls to project keywords found.")
+            external = index.external_keywords(limit=10)
+            if external:
+                st.caption("Most-called library keywords: " + ", ".join(f"{name} ({count})" for name, count in external))
+
+        with dead_tab:
+            only_unused = st.checkbox("Only keywords with no call sites at all", value=False, key="kw_usage_only_unused")
+            rows = index.unused_keywords() if only_unused else index.dead_keywords()
+            if rows:
+                st.dataframe(
+                    [{'Keyword': r['name'], 'Calls': r['calls'], 'Defined In': r['source'], 'Line': r['line']} for r in rows],
+                    use_container_width=True, hide_index=True
+                )
+            else:
+                st.success("✅ Every keyword is reachable from the test suites.")
+
+        with lookup_tab:
+            names = sorted(d['name'] for d in index.graph()['definitions'].values())
+            selected = st.selectbox("Keyword:", names, index=None, placeholder="Choose a keyword...", key="kw_usage_lookup")
+            if selected:
+                callers = index.callers_of(selected)
+                callees = index.callees_of(selected)
+                st.markdown(f"**Called from ({len(callers)}):**")
+                for source, caller, line in callers:
+                    where = f"{source}:{line}" if line else source
+                    st.markdown(f"- `{caller or 'Settings'}` — {where}")
+                if callees:
+                    st.markdown(f"**Calls ({len(callees)}):** " + ", ".join(f"`{name}` ×{count}" for name, count in callees))
+
+
 # ======= (โค้ดส่วนที่เหลือของไฟล์ ui_keyword_factory.py) =======
 # (ฟังก์ชัน render_keyword_editor_view และอื่นๆ
 #  ให้คงไว้เหมือนเดิม ไม่ต้องลบครับ)
 # ==========================================================
 
 # ======= EDITOR VIEW =======
+def render_argument_rename(keyword_id, kw, argument_index):
+    """Renames an argument in the signature and in every step that uses it."""
+    arg_names = [arg['name'] for arg in kw.get('args', [])]
+    if not arg_names:
+        return
+    unused = [name for name in arg_names if not argument_index.is_used(name)]
+    if unused:
+        st.caption(f"⚠️ Not used by any step: {', '.join(unused)}")
+
+    with st.popover("✏️ Rename Argument", use_container_width=True):
+        old_name = st.selectbox("Argument", arg_names, key=f"rename_arg_old_{keyword_id}")
+        st.caption(f"Used in {len(argument_index.usages(old_name))} step argument(s)")
+        new_name = st.text_input("New name", placeholder="${new_name}", key=f"rename_arg_new_{keyword_id}").strip()
+        if st.button("Rename", key=f"rename_arg_btn_{keyword_id}", use_container_width=True,
+                     disabled=not new_name or new_name in arg_names):
+            try:
+                kw_manager.rename_argument(keyword_id, old_name, new_name)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                st.rerun()
+
 def render_keyword_editor_view(ws):
     """
     Displays the editor for a single keyword (details, steps, preview).
@@ -232,6 +341,7 @@ def render_keyword_editor_view(ws):
 
     with header_left:
         st.markdown(f"<h3 style='font-size: 1.6rem;'>✏️ Editing: {kw.get('name', '...')}</h3>", unsafe_allow_html=True)
+        render_undo_redo_controls(get_workspace_history('keyword_factory_workspace'), kw_manager.undo, kw_manager.redo, "kw_editor")
         st.caption("Define the keyword's arguments, steps, and documentation.")
 
     with header_right:
@@ -259,14 +369,10 @@ def render_keyword_editor_view(ws):
             st.markdown("---") # เส้นคั่น
 
             # ***** Argument Manager UI with Drag & Drop *****
-            steps = kw.get('steps', [])
-            detected_vars = scan_steps_for_variables(steps)
-            
-            # Initialize args
-            if 'args' not in kw or not isinstance(kw['args'], list):
-                kw['args'] = []
+            argument_index = kw_manager.get_argument_index(keyword_id)
+            detected_vars = argument_index.variables()
             
-            current_ordered_args = kw.get('args', [])
+            current_ordered_args = kw['args'] if isinstance(kw.get('args'), list) else []
             selected_arg_names = {arg['name'] for arg in current_ordered_args}
             
             # Section 1: Unused Variables
@@ -283,9 +389,11 @@ def render_keyword_editor_view(ws):
                     # Select all button
                     if st.button("✅ Select All Unused", use_container_width=True, 
                                 key=f"select_all_args_{keyword_id}"):
-                        for var_name in detected_but_not_selected:
-                            current_ordered_args.append({'name': var_name, 'default': ''})
-                        kw['args'] = current_ordered_args
+                        kw_manager.set_keyword_args(
+                            keyword_id,
+                            current_ordered_args + [{'name': var_name, 'default': ''} for var_name in detected_but_not_selected],
+                            "Add arguments"
+                        )
                         st.rerun()
                     
                     st.markdown("---")
@@ -296,14 +404,16 @@ def render_keyword_editor_view(ws):
                         with col_add:
                             if st.button("➕", key=f"add_arg_{keyword_id}_{var_name}", 
                                        help="Add as argument", use_container_width=True):
-                                current_ordered_args.append({'name': var_name, 'default': ''})
-                                kw['args'] = current_ordered_args
+                                kw_manager.set_keyword_args(
+                                    keyword_id, current_ordered_args + [{'name': var_name, 'default': ''}], "Add argument"
+                                )
                                 st.rerun()
                         with col_name:
                             st.code(var_name, language='robotframework')
             
             # Section 2: Sortable Arguments
             render_sortable_arguments(keyword_id, kw)
+            render_argument_rename(keyword_id, kw, argument_index)
             
             # ***** End Argument Manager UI *****
 
@@ -347,14 +457,15 @@ def render_keyword_editor_view(ws):
                 render_sortable_steps(keyword_id, kw)
             else:
                 # Normal Mode (existing code)
-                indent_level = 0
-                for i, step in enumerate(steps):
-                    render_step_card_compact_for_kw(step, i, keyword_id, steps, indent_level)
-                    
-                    if step.get('keyword') == 'IF Condition':
-                        indent_level += 1
-                    elif step.get('keyword') == 'END':
-                        indent_level = max(0, indent_level - 1)
+                block_plan = plan_control_flow(steps)
+                for step_index, message in block_plan.problems:
+                    st.warning(f"⚠️ Step {step_index + 1}: {message}")
+                render_step_window(
+                    steps,
+                    lambda step, i: render_step_card_compact_for_kw(step, i, keyword_id, steps, block_plan.depths[i]),
+                    f"kw_{keyword_id}",
+                    depths=block_plan.depths
+                )
 
         st.markdown("---")
         col1, col2 = st.columns(2)
@@ -371,12 +482,9 @@ def render_keyword_editor_view(ws):
 
     # --- RIGHT PANEL: PREVIEW & SAVE ---
     with right_preview:
-        # --- 1. Live Preview ---
-        script_code = kw_manager.generate_robot_script_for_keyword(keyword_id)
-
-        st.markdown('<div class="code-preview-container">', unsafe_allow_html=True)
-        st.code(script_code, language="robotframework", line_numbers=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        # --- 1. Live Preview (one preview service per keyword, so switching never shows another keyword as stale) ---
+        version, payload = kw_manager.preview_snapshot(keyword_id)
+        render_code_preview(f'keyword_script_{keyword_id}', version, payload, kw_manager.render_preview_script)
 
         # --- 2. Save to File Options ---
         st.markdown("---")
@@ -434,6 +542,7 @@ def render_keyword_editor_view(ws):
 
                 if st.button("➕ Append Keyword", key="append_kw_btn"):
                     full_path = os.path.join(project_path, selected_file)
+                    script_code = kw_manager.generate_robot_script_for_keyword(keyword_id)
                     success, message = append_robot_content_intelligently(
                         full_path,
                         keywords_code=script_code
@@ -468,6 +577,7 @@ def render_keyword_editor_view(ws):
                 if not new_file_name.endswith(('.robot', '.resource')):
                     st.error("File name must end with .robot or .resource")
                 else:
+                    script_code = kw_manager.generate_robot_script_for_keyword(keyword_id)
                     # (โค้ด full_content = textwrap.dedent(...) เหมือนเดิม)
                     full_content = textwrap.dedent(f"""
 *** Settings ***
@@ -512,7 +622,21 @@ def render_keyword_editor_view(ws):
 
 
 # ======= REUSABLE STEP CARD (ADAPTED FROM ui_crud.py) =======
-def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_level=0): # Added indent_level
+def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_level=0):
+    """Renders one keyword step card as a fragment (edits inside it rerun only the card)."""
+    _kw_step_card_fragment(step['id'], index, keyword_id, indent_level)
+
+@st.fragment
+def _kw_step_card_fragment(step_id, index, keyword_id, indent_level):
+    # Re-resolve by id: on a fragment rerun the arguments are the ones from the last full run
+    kw = kw_manager.get_keyword(keyword_id)
+    steps_list = kw.get('steps', []) if kw else []
+    step = next((s for s in steps_list if s.get('id') == step_id), None)
+    if step is None:
+        return
+    _render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_level)
+
+def _render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_level=0): # Added indent_level
     """
     Displays a compact step card inside the keyword editor.
     (Adapted from ui_crud.py, incorporates Output Vars UI, Suggestions, Indent)
@@ -571,22 +695,12 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
                         st.session_state[f"edit_kw_select_kw_{step['id']}"] = step.get('keyword', '')
                         st.session_state[f"edit_temp_args_kw_{step['id']}"] = step.get('args', {}).copy()
                         st.session_state[f"prev_kw_kw_{step['id']}"] = step.get('keyword', '')
-                    st.rerun()
+                    rerun_card()
 
             with action_cols[3]: # Duplicate
                 if st.button("📋", key=f"copy_kw_{keyword_id}_{step['id']}", help="Duplicate", use_container_width=True):
-                    # Find current step index to insert after
-                    current_index = -1
-                    for i, s in enumerate(steps_list):
-                         if s['id'] == step['id']:
-                              current_index = i
-                              break
-                    if current_index != -1:
-                         new_step = step.copy()
-                         new_step['id'] = str(uuid.uuid4())
-                         # kw['steps'] is the list in the session state
-                         kw['steps'].insert(current_index + 1, new_step)
-                         st.rerun()
+                    kw_manager.duplicate_step(keyword_id, step['id'])
+                    st.rerun()
 
             with action_cols[4]: # Delete
                 if st.button("🗑️", key=f"del_kw_{keyword_id}_{step['id']}", help="Delete", use_container_width=True):
@@ -640,22 +754,9 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
     else: # Edit Mode
         st.markdown("<div class='crud-edit-section'>", unsafe_allow_html=True)
 
-        # Load keywords if not already loaded
-        if 'categorized_keywords' not in ws_state:
-            all_keywords_list = ws_state.get('keywords', [])
-            if all_keywords_list:
-                # Assuming categorize_keywords is imported correctly
-                ws_state['categorized_keywords'] = categorize_keywords(all_keywords_list)
-
-        categorized_keywords = ws_state.get('categorized_keywords', {})
+        categorized_keywords = get_keyword_library(ws_state).categorized
         # --- Add IF/END to selectable keywords ---
-        control_flow_kws = [
-             {'name': 'IF Condition', 'args': [{'name': '${condition}', 'default': ''}], 'doc': 'Starts a conditional block.'},
-             {'name': 'ELSE IF Condition', 'args': [{'name': '${condition}', 'default': ''}], 'doc': 'Starts an else-if block.'},
-             {'name': 'ELSE', 'args': [], 'doc': 'Starts an else block.'},
-             {'name': 'END', 'args': [], 'doc': 'Ends a conditional block.'}
-        ]
-        all_kws = control_flow_kws + [kw for kws in categorized_keywords.values() for kw in kws]
+        all_kws = list(CONTROL_FLOW_KEYWORDS) + [kw for kws in categorized_keywords.values() for kw in kws]
         all_kw_names = [kw['name'] for kw in all_kws]
         # --- End Add IF/END ---
 
@@ -864,7 +965,7 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
                      # Determine correct widget key based on input type
                      widget_key_base = input_key
                      widget_key = widget_key_base # Default for simple inputs
-                     if arg_info.get('name') in ARGUMENT_PRESETS and ARGUMENT_PRESETS[arg_info['name']].get('type') == 'select_or_input':
+                     if (get_preset_registry().preset(arg_info.get('name')) or {}).get('type') == 'select_or_input':
                           if st.session_state.get(f"{widget_key_base}_select") == "📝 Other (custom)":
                                widget_key = f"{widget_key_base}_custom"
                           else:
@@ -902,8 +1003,11 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
                                # Add to main args list if needed
                                kw_args_list_sugg = kw.get('args', [])
                                if not any(a['name'] == suggested_arg_name for a in kw_args_list_sugg):
-                                    kw_args_list_sugg.append({'name': suggested_arg_name, 'default': ''})
-                                    kw['args'] = sorted(kw_args_list_sugg, key=lambda x: x['name'])
+                                    kw_manager.set_keyword_args(
+                                        keyword_id,
+                                        sorted(kw_args_list_sugg + [{'name': suggested_arg_name, 'default': ''}], key=lambda x: x['name']),
+                                        "Add argument"
+                                    )
                                st.rerun()
                 # --- End Suggestion ---
 
@@ -928,8 +1032,8 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
                     else:
                         final_value = st.session_state.get(f"{input_key}_locator_select", current_value)
 
-                elif clean_arg_name in ARGUMENT_PRESETS:
-                    config = ARGUMENT_PRESETS[clean_arg_name]
+                elif get_preset_registry().is_preset(clean_arg_name):
+                    config = get_preset_registry().preset(clean_arg_name)
                     preset_type = config.get('type')
                     if preset_type == "select_or_input":
                         selected = st.session_state.get(f"{input_key}_select")
@@ -941,15 +1045,10 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
                          final_value = 'true' if st.session_state.get(input_key, False) else 'false'
                     else: # select, text etc.
                         final_value = st.session_state.get(input_key, current_value)
-                else: # Pattern or default text
-                    matched = False
-                    for pattern_key, pattern_config in ARGUMENT_PATTERNS.items():
-                        if pattern_key in clean_arg_name.lower():
-                            final_value = st.session_state.get(input_key, current_value)
-                            matched = True
-                            break
-                    if not matched:
-                        final_value = st.session_state.get(f"{input_key}_default_text", current_value)
+                elif get_preset_registry().resolve(clean_arg_name) is not None: # Pattern
+                    final_value = st.session_state.get(input_key, current_value)
+                else: # Default text
+                    final_value = st.session_state.get(f"{input_key}_default_text", current_value)
 
                 # Store the determined value back into the temporary state
                 st.session_state[temp_args_key][clean_arg_name] = final_value if final_value is not None else current_value
@@ -1124,7 +1223,7 @@ def render_step_card_compact_for_kw(step, index, keyword_id, steps_list, indent_
                                 del st.session_state[key]
                            except KeyError:
                                 pass
-                 st.rerun()
+                 rerun_card()
 
 
         st.markdown("</div>", unsafe_allow_html=True) # End crud-edit-section
@@ -4,6 +4,23 @@ Uses streamlit-sortables for intuitive reordering of Arguments and Steps
 """
 import streamlit as st
 from typing import List, Dict, Callable, Any
+from .ui_common import step_window_bounds
+from . import kw_manager
+
+
+def _default_input(keyword_id: str, arg: Dict, input_key: str) -> None:
+    """
+    Default-value input for one argument. The widget is re-synced from the keyword on
+    every render and writes back only from on_change, so an undone edit is never re-applied.
+    """
+    st.session_state[input_key] = arg.get('default', '')
+    st.text_input(
+        "Default",
+        key=input_key,
+        label_visibility="collapsed",
+        placeholder="e.g., ${EMPTY}",
+        on_change=lambda: kw_manager.set_argument_default(keyword_id, arg['name'], st.session_state[input_key])
+    )
 
 
 def render_sortable_arguments(keyword_id: str, kw: Dict) -> None:
@@ -31,13 +48,13 @@ def render_sortable_arguments(keyword_id: str, kw: Dict) -> None:
             with st.popover("⚡", use_container_width=True):
                 st.caption("**Quick Actions:**")
                 if st.button("🔤 A→Z", use_container_width=True, key=f"sort_az_{keyword_id}"):
-                    kw['args'] = sorted(current_args, key=lambda x: x['name'].lower())
+                    kw_manager.set_keyword_args(keyword_id, sorted(current_args, key=lambda x: x['name'].lower()), "Sort arguments")
                     st.rerun()
                 if st.button("🔡 Z→A", use_container_width=True, key=f"sort_za_{keyword_id}"):
-                    kw['args'] = sorted(current_args, key=lambda x: x['name'].lower(), reverse=True)
+                    kw_manager.set_keyword_args(keyword_id, sorted(current_args, key=lambda x: x['name'].lower(), reverse=True), "Sort arguments")
                     st.rerun()
                 if st.button("🔄 Reverse", use_container_width=True, key=f"reverse_{keyword_id}"):
-                    kw['args'] = list(reversed(current_args))
+                    kw_manager.set_keyword_args(keyword_id, list(reversed(current_args)), "Reverse arguments")
                     st.rerun()
     
     if not current_args:
@@ -67,7 +84,7 @@ def render_sortable_arguments(keyword_id: str, kw: Dict) -> None:
                     new_args.append(matching_arg)
             
             if new_args:  # Only update if we have valid args
-                kw['args'] = new_args
+                kw_manager.set_keyword_args(keyword_id, new_args, "Reorder arguments")
                 st.rerun()
     
     st.markdown("")
@@ -86,27 +103,13 @@ def render_sortable_arguments(keyword_id: str, kw: Dict) -> None:
                 st.code(arg['name'], language='robotframework')
             
             with col3:
-                # Use session state directly
                 input_key = f"default_{keyword_id}_{arg['name']}"
-                
-                # Initialize if not exists
-                if input_key not in st.session_state:
-                    st.session_state[input_key] = arg.get('default', '')
-                
-                new_val = st.text_input(
-                    "Default",
-                    key=input_key,
-                    label_visibility="collapsed",
-                    placeholder="e.g., ${EMPTY}"
-                )
-                
-                # Update silently (no rerun)
-                arg['default'] = new_val
+                _default_input(keyword_id, arg, input_key)
             
             with col4:
                 if st.button("🗑️", key=f"del_arg_{keyword_id}_{arg['name']}", 
                            help="Remove argument", use_container_width=True):
-                    kw['args'] = [a for a in current_args if a['name'] != arg['name']]
+                    kw_manager.set_keyword_args(keyword_id, [a for a in current_args if a['name'] != arg['name']], "Remove argument")
                     # Clean up session state
                     if input_key in st.session_state:
                         del st.session_state[input_key]
@@ -146,11 +149,16 @@ def render_sortable_steps(keyword_id: str, kw: Dict) -> None:
     with st.container(border=True):
         st.markdown("**🎯 Drag to Reorder**")
         
+        # Long lists are reordered one page at a time; the page is spliced back in place
+        start, end = step_window_bounds(len(steps), f"sort_{keyword_id}")
+        window = steps[start:end]
+        sort_key = f'steps_sort_{keyword_id}_{start}'
+        
         # Create display list and map to actual step objects
         displays = []
         display_to_step = {}  # Map display → step object
         
-        for idx, step in enumerate(steps):
+        for idx, step in enumerate(window, start):
             kw_name = step.get('keyword', 'Unknown')
             
             # Icon
@@ -189,7 +197,7 @@ def render_sortable_steps(keyword_id: str, kw: Dict) -> None:
             display_to_step[display] = step  # Map display to actual step object
         
         # Sortable
-        sorted_displays = sort_items(displays, key=f'steps_sort_{keyword_id}')
+        sorted_displays = sort_items(displays, key=sort_key)
         
         # Check if changed
         if sorted_displays != displays:
@@ -200,14 +208,14 @@ def render_sortable_steps(keyword_id: str, kw: Dict) -> None:
                     new_steps.append(display_to_step[display])
             
             # Safety check
-            if len(new_steps) == len(steps):
-                kw['steps'] = new_steps
+            if len(new_steps) == len(window):
+                kw_manager.set_step_order(keyword_id, steps[:start] + new_steps + steps[end:])
                 st.rerun()
             else:
-                st.error(f"⚠️ Reorder failed: {len(new_steps)}/{len(steps)} steps. Please refresh.")
+                st.error(f"⚠️ Reorder failed: {len(new_steps)}/{len(window)} steps. Please refresh.")
                 # Reset state
-                if f'steps_sort_{keyword_id}' in st.session_state:
-                    del st.session_state[f'steps_sort_{keyword_id}']
+                if sort_key in st.session_state:
+                    del st.session_state[sort_key]
 
 
 def render_fallback_arguments(keyword_id: str, kw: Dict) -> None:
@@ -233,29 +241,19 @@ def render_fallback_arguments(keyword_id: str, kw: Dict) -> None:
             st.code(arg['name'], language='robotframework')
         
         with col3:
-            new_default = st.text_input(
-                "Default",
-                value=arg.get('default', ''),
-                key=f"fb_default_{keyword_id}_{arg['name']}",
-                label_visibility="collapsed"
-            )
-            arg['default'] = new_default
+            _default_input(keyword_id, arg, f"fb_default_{keyword_id}_{arg['name']}")
         
         with col4:
             subcols = st.columns([1, 1])
             with subcols[0]:
                 if st.button("⏫", key=f"fb_top_{keyword_id}_{idx}",
                            disabled=(idx==0), use_container_width=True):
-                    moved = current_args.pop(idx)
-                    current_args.insert(0, moved)
-                    kw['args'] = current_args
+                    kw_manager.set_keyword_args(keyword_id, [current_args[idx]] + current_args[:idx] + current_args[idx + 1:], "Move argument")
                     st.rerun()
             with subcols[1]:
                 if st.button("⏬", key=f"fb_bot_{keyword_id}_{idx}",
                            disabled=(idx==len(current_args)-1), use_container_width=True):
-                    moved = current_args.pop(idx)
-                    current_args.append(moved)
-                    kw['args'] = current_args
+                    kw_manager.set_keyword_args(keyword_id, current_args[:idx] + current_args[idx + 1:] + [current_args[idx]], "Move argument")
                     st.rerun()
 
 
@@ -5,6 +5,9 @@ from pathlib import Path
 from .file_manager import scan_robot_project
 from .utils import get_file_icon
 from .ui_components import copy_button_component
+from . import workspace_store
+from . import license_checker
+from .session_manager import DEFAULT_SESSION_ARCHIVE, save_session_workspaces, restore_session_workspaces
 
 # =============================================================================
 # 🟢 HELPER FUNCTION TO LOAD HTML
@@ -110,6 +113,10 @@ def render_sidebar():
             with col2:
                 st.metric("📄 Files", len(structure['robot_files']))
 
+        st.markdown("---")
+        render_workspace_persistence()
+        render_profiling_panel()
+
         # === 🟢 NEW: Interactive User Guide Button ===
         st.markdown("---")
         # ปุ่มสำหรับเปิด Dialog ที่อ่านไฟล์ HTML แยกมาแสดง
@@ -123,6 +130,106 @@ def render_sidebar():
             st.caption("Professional dark theme")
             st.caption("Guide/Tip Detail")
 
+_WORKSPACE_LABELS = {
+    'studio_workspace': "Test Studio",
+    'crud_generator_workspace': "CRUD Generator",
+    'keyword_factory_workspace': "Keyword Factory",
+}
+
+def render_workspace_persistence():
+    """Save / restore the workspaces to a local archive, plus JSON export/import."""
+    with st.expander("💾 Workspace Save / Restore", expanded=False):
+        archive_path = st.text_input("Archive file", value=DEFAULT_SESSION_ARCHIVE, key="workspace_archive_path")
+
+        if st.button("💾 Save Workspaces", key="btn_save_workspaces", use_container_width=True):
+            try:
+                size = save_session_workspaces(archive_path)
+                st.success(f"Saved ({size / 1024:,.0f} KB)")
+            except OSError as e:
+                st.error(f"Save failed: {e}")
+
+        if archive_path and os.path.isfile(archive_path):
+            try:
+                with workspace_store.WorkspaceArchive(archive_path) as archive:
+                    available = archive.workspace_names()
+                    created = archive.created
+            except (OSError, ValueError) as e:
+                st.warning(str(e))
+                available = []
+            if available:
+                st.caption(f"Saved: {created}")
+                selected = st.multiselect(
+                    "Restore",
+                    options=available,
+                    default=available,
+                    format_func=lambda name: _WORKSPACE_LABELS.get(name, name),
+                    key="workspace_restore_selection"
+                )
+                if st.button("📥 Restore", key="btn_restore_workspaces", use_container_width=True, disabled=not selected):
+                    try:
+                        # Only the selected workspaces are decoded
+                        restore_session_workspaces(workspace_store.load_workspaces(archive_path, selected))
+                        st.rerun()
+                    except (OSError, ValueError, RuntimeError) as e:
+                        st.error(f"Restore failed: {e}")
+
+        st.markdown("---")
+        workspaces = {name: st.session_state[name] for name in workspace_store.PERSISTED_WORKSPACES
+                      if name in st.session_state}
+        st.download_button(
+            "⬇️ Export JSON",
+            # Serialized only when the download is requested
+            data=lambda: workspace_store.export_workspaces_json(workspaces),
+            file_name="workspaces.json",
+            mime="application/json",
+            key="btn_export_workspaces_json",
+            use_container_width=True
+        )
+        uploaded = st.file_uploader("Import JSON", type=['json'], key="workspace_json_upload")
+        if uploaded is not None and st.button("📥 Import JSON", key="btn_import_workspaces_json", use_container_width=True):
+            try:
+                restore_session_workspaces(workspace_store.import_workspaces_json(uploaded.getvalue().decode('utf-8')))
+                st.rerun()
+            except ValueError as e:
+                st.error(f"Import failed: {e}")
+
+def render_profiling_panel():
+    """Per-rerun timings recorded by modules.profiler (the table shows the previous rerun)."""
+    with st.expander("⏱️ Performance Profiling", expanded=False):
+        # Settings live outside widget state so they survive reruns where the sidebar is not drawn (dialogs)
+        settings = st.session_state.setdefault('profiling_settings', {'enabled': False, 'track_memory': False})
+        settings['enabled'] = st.toggle("Profile reruns", value=settings['enabled'], key="profiling_toggle")
+        settings['track_memory'] = st.checkbox(
+            "Track allocations (tracemalloc, slower)", value=settings['track_memory'],
+            key="profiling_track_memory", disabled=not settings['enabled']
+        )
+        if st.button("📄 cProfile next rerun (.pstats)", key="btn_profile_pstats", width='stretch'):
+            st.session_state.profiling_dump_next = True
+            st.rerun()
+
+        stats = license_checker.LICENSE_STATS
+        st.caption(
+            f"License: {stats['verifications']} verification(s), {stats['cache_hits']} cache hit(s), "
+            f"last lookup {stats['last_lookup_seconds'] * 1000:.2f} ms"
+        )
+
+        report = st.session_state.get('profiling_last_report')
+        if not report:
+            if settings['enabled']:
+                st.caption("Interact with the app to record a rerun.")
+            return
+
+        st.caption(f"Last profiled rerun: **{report['total_ms']:.1f} ms** ({report['created']})")
+        rows = report['sections']
+        if not report['track_memory']:
+            rows = [{k: v for k, v in row.items() if k != 'alloc_kb'} for row in rows]
+        st.dataframe(rows, hide_index=True, width='stretch')
+        if report.get('pstats_path'):
+            st.caption(f"pstats: `{report['pstats_path']}`")
+        if report.get('pstats_top'):
+            with st.popover("cProfile (top by cumulative time)", width='stretch'):
+                st.code(report['pstats_top'], language=None)
+
 def render_folder_tree(structure):
     """Render beautiful collapsible folder tree"""
     root_path = structure['root']
@@ -171,32 +278,6 @@ def render_folder_tree(structure):
             ):
                 st.session_state.expanded_folders[folder_name] = not is_expanded
                 st.rerun()
-            
-            st.markdown("""
-            <style>
-                [data-testid="stSidebar"] button[kind="secondary"][key*="folder_btn_"] {
-                    background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(51, 65, 85, 0.4) 100%) !important;
-                    backdrop-filter: blur(12px);
-                    border: 1px solid rgba(99, 102, 241, 0.3) !important;
-                    border-left: 3px solid #6366f1 !important;
-                    border-radius: 10px !important;
-                    color: #cbd5e1 !important;
-                    text-align: left !important;
-                    padding: 10px 16px !important;
-                    transition: all 0.3s ease !important;
-                    height: auto !important;
-                    min-height: auto !important;
-                    justify-content: flex-start !important;
-                }
-                [data-testid="stSidebar"] button[kind="secondary"][key*="folder_btn_"]:hover {
-                    border-color: rgba(129, 140, 248, 0.5) !important;
-                    box-shadow: 0 4px 16px rgba(99, 102, 241, 0.25) !important;
-                    transform: translateX(2px) !important;
-                    background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(51, 65, 85, 0.4) 100%) !important;
-                    filter: none !important;
-                }
-            </style>
-            """, unsafe_allow_html=True)
         
         with col_copy:
             components.html(
@@ -144,7 +144,7 @@ def csv_creator_dialog():
             </style>
         """, unsafe_allow_html=True)
 
-        st.markdown("#### <i class='fa-solid fa-file-csv'></i> Create or Upload CSV Data", unsafe_allow_html=True)
+        st.markdown("#### <i class='bi bi-filetype-csv'></i> Create or Upload CSV Data", unsafe_allow_html=True)
         
         mode = st.radio(
             "Create From:", ["New File", "Upload Existing File"],
@@ -553,7 +553,7 @@ def render_api_generator_tab():
 
 def render_api_list_view():
     ws_state = st.session_state.studio_workspace
-    st.markdown("<h4 style='font-size: 1.3rem; margin-bottom: 0.5rem;'><i class='fa-solid fa-link'></i> Your API Services</h4>", unsafe_allow_html=True)
+    st.markdown("<h4 style='font-size: 1.3rem; margin-bottom: 0.5rem;'><i class='bi bi-link-45deg'></i> Your API Services</h4>", unsafe_allow_html=True)
     
     services = ws_state.get('api_services', [])
     if not services: st.info("No API services found."); return
@@ -5,31 +5,14 @@ UI Module for the Test Flow Tab
 import streamlit as st
 import uuid
 from .test_flow_manager import categorize_keywords, generate_robot_script_from_timeline
-import json
+from . import test_flow_manager
+from .session_manager import get_workspace_history
+from .ui_common import render_undo_redo_controls, render_step_window, get_preset_registry
+from .styles import inject_styles
 import os
-from pathlib import Path
 from .dialog_commonkw import render_add_step_dialog_base
 from .utils import format_robot_step_line
 
-# ===== เพิ่มส่วนนี้ =====
-def load_argument_presets():
-    """Load argument presets from JSON file"""
-    try:
-        preset_path = Path(__file__).parent.parent / "assets" / "argument_presets.json"
-        with open(preset_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            return data.get('presets', {}), data.get('patterns', {})
-    except FileNotFoundError:
-        st.warning("⚠️ argument_presets.json not found. Using default text inputs.")
-        return {}, {}
-    except json.JSONDecodeError:
-        st.error("❌ Error parsing argument_presets.json. Check JSON syntax.")
-        return {}, {}
-
-# Load presets at module level
-ARGUMENT_PRESETS, ARGUMENT_PATTERNS = load_argument_presets()
-# ===== จบส่วนที่เพิ่ม =====
-
 def render_preset_input(arg_name, config, default_value, step_id):
     """
     Render input based on preset configuration
@@ -196,14 +179,12 @@ def render_argument_input(arg_info, ws_state, step_id):
         )
     
     # Priority 2: Check if argument name matches preset (exact match)
-    if arg_name in ARGUMENT_PRESETS:
-        return render_preset_input(arg_name, ARGUMENT_PRESETS[arg_name], default_value, step_id)
-    
     # Priority 3: Check pattern matching (partial match)
-    arg_lower = arg_name.lower()
-    for pattern_key, pattern_config in ARGUMENT_PATTERNS.items():
-        if pattern_key in arg_lower:
-            return render_pattern_input(arg_name, pattern_config, default_value, step_id)
+    spec = get_preset_registry().resolve(arg_name)
+    if spec is not None and spec.kind == 'preset':
+        return render_preset_input(arg_name, spec.config, default_value, step_id)
+    if spec is not None:
+        return render_pattern_input(arg_name, spec.config, default_value, step_id)
     
     # Priority 4: Default - Text Input
     return st.text_input(
@@ -253,7 +234,7 @@ def render_verify_table_arguments_for_dialog(ws_state, timeline_key, section_nam
     # --- Add its own submission button ---
     if st.button(f"✅ Add Step to {section_name}", type="primary", use_container_width=True, key=f"{dialog_context_id}_submit"):
         new_step = {"id": str(uuid.uuid4()), "keyword": selected_kw['name'], "args": args_data}
-        ws_state.setdefault(timeline_key, []).append(new_step)
+        test_flow_manager.add_timeline_step(ws_state, timeline_key, new_step)
         
         # Cleanup
         st.session_state['show_add_dialog'] = False
@@ -333,7 +314,7 @@ def render_verify_table_arguments_for_edit_mode(ws_state, unique_context_id, cur
                 assertion['id'] = assertion['col_value']
 
             with cols[1]:
-                assertion_preset = ARGUMENT_PRESETS.get('assertion', {})
+                assertion_preset = get_preset_registry().preset('assertion') or {}
                 options = assertion_preset.get('options', ['equal', 'contains', 'should be', 'should not be'])
                 default_index = options.index(assertion['assert_value']) if assertion['assert_value'] in options else 0
                 assertion['assert_value'] = st.selectbox(
@@ -374,400 +355,6 @@ def render_verify_table_arguments_for_edit_mode(ws_state, unique_context_id, cur
 # ===== 🎯 END: NEW SPECIALIZED UI FOR 'Verify Result of data table' KEYWORD =====
 # ===============================================================================
 
-def inject_test_flow_css():
-    """Enhanced CSS with modern, professional design"""
-    st.markdown("""
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.5.1/css/all.min.css">
-    <style>
-        /* Section Expander Styling */
-        .stExpander {
-            background: rgba(30, 41, 59, 0.5);
-            border: 1px solid #374151;
-            border-radius: 12px;
-            overflow: hidden;
-            margin-bottom: 1.5rem;
-        }
-        
-        div[data-testid="stExpander"] > div:last-child {
-            background-color: rgba(15, 23, 42, 0.4);
-            padding: 1.5rem 1rem;
-        }
-
-        /* Card Wrapper - Centers cards */
-        .card-wrapper {
-            display: flex;
-            justify-content: center;
-            width: 100%;
-            flex-direction: column;
-            align-items: center;
-        }
-        
-        /* Modern Step Card - Softer colors */
-        .step-card {
-            width: 96%;
-            max-width: 1200px;
-            margin-bottom: 1rem;
-            position: relative;
-            background: linear-gradient(145deg, #1e293b 0%, #0f172a 100%);
-            border: 1px solid rgba(71, 85, 105, 0.3);
-            border-radius: 12px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.3);
-            transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-            overflow: hidden;
-        }
-        
-        .step-card:hover {
-            border-color: rgba(100, 116, 139, 0.5);
-            transform: translateY(-2px);
-            box-shadow: 0 4px 16px rgba(0, 0, 0, 0.4);
-        }
-        
-        /* Accent Border - Left Side - More subtle */
-        .step-card::before {
-            content: '';
-            position: absolute;
-            left: 0;
-            top: 0;
-            bottom: 0;
-            width: 4px;
-            background: linear-gradient(180deg, #64748b 0%, #475569 100%);
-            opacity: 0.6;
-        }
-        
-        /* Top Accent Line - Removed for cleaner look */
-        .step-card::after {
-            display: none;
-        }
-        
-        /* Header Container - Enhanced depth */
-        .step-header-container {
-            padding: 0.3rem 1rem;
-            background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(15, 23, 42, 0.8) 100%);
-            border-bottom: 1px solid rgba(71, 85, 105, 0.4);
-            position: relative;
-            display: flex;
-            align-items: center;
-            min-height: 52px;
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.4),
-                        0 2px 4px rgba(0, 0, 0, 0.3) inset;
-        }
-
-        /* Header Bottom Accent Line - Subtle 3D effect */
-        .step-header-container::after {
-            content: '';
-            position: absolute;
-            left: 0;
-            bottom: 0;
-            right: 0;
-            height: 1px;
-            background: linear-gradient(90deg, 
-                transparent 0%,
-                rgba(148, 163, 184, 0.3) 50%,
-                transparent 100%);
-        }
-
-        /* Step Number Badge - Enhanced 3D depth */
-        .step-number {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            width: 48px;
-            height: 48px;
-            background: linear-gradient(135deg, #52627a 0%, #3d4c5f 50%, #2d3748 100%);
-            border-radius: 10px;
-            font-size: 1.3rem;
-            font-weight: 700;
-            color: #e2e8f0;
-            box-shadow: 0 4px 8px rgba(0, 0, 0, 0.4),
-                        0 1px 2px rgba(0, 0, 0, 0.3),
-                        0 0 0 1px rgba(148, 163, 184, 0.15),
-                        inset 0 1px 1px rgba(255, 255, 255, 0.1),
-                        inset 0 -2px 4px rgba(0, 0, 0, 0.3);
-            position: relative;
-            border: 1px solid rgba(71, 85, 105, 0.4);
-            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.5);
-        }
-
-        .step-number::after {
-            content: '';
-            position: absolute;
-            inset: 0;
-            border-radius: 10px;
-            background: linear-gradient(135deg, 
-                rgba(255, 255, 255, 0.15) 0%, 
-                transparent 50%, 
-                rgba(0, 0, 0, 0.2) 100%);
-            pointer-events: none;
-        }
-
-        /* Keyword Display */
-        .step-keyword {
-            display: flex;
-            flex-direction: column;
-            justify-content: center;
-            gap: 0.3rem;
-            padding: 0.5rem 0;
-        }
-
-        .step-keyword-label {
-            font-size: 0.85rem;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.08em;
-            color: #94a3b8;
-        }
-
-        .step-keyword-name {
-            font-size: 1.5rem;
-            font-weight: 700;
-            color: #f1f5f9;
-            display: flex;
-            align-items: center;
-            gap: 0.5rem;
-            line-height: 1.3;
-        }
-
-        .step-keyword-name::before {
-            content: '⚡';
-            font-size: 1rem;
-        }
-        
-        /* Action Buttons - Enhanced 3D depth */
-        .stButton > button {
-            border-radius: 8px;
-            border: 1px solid rgba(71, 85, 105, 0.6);
-            background: linear-gradient(135deg, #3d4c5f 0%, #2d3748 50%, #1e293b 100%);
-            color: #cbd5e1;
-            font-weight: 600;
-            transition: all 0.25s cubic-bezier(0.4, 0, 0.2, 1);
-            height: 36px;
-            font-size: 1rem;
-            padding: 0.4rem 0.5rem;
-            box-shadow: 0 3px 6px rgba(0, 0, 0, 0.4),
-                        0 1px 2px rgba(0, 0, 0, 0.3),
-                        inset 0 1px 1px rgba(255, 255, 255, 0.1),
-                        inset 0 -2px 4px rgba(0, 0, 0, 0.2);
-            position: relative;
-            text-shadow: 0 1px 2px rgba(0, 0, 0, 0.3);
-        }
-        
-        .stButton > button::before {
-            content: '';
-            position: absolute;
-            inset: 0;
-            border-radius: 8px;
-            background: linear-gradient(135deg, 
-                rgba(255, 255, 255, 0.1) 0%, 
-                transparent 50%, 
-                rgba(0, 0, 0, 0.15) 100%);
-            pointer-events: none;
-        }
-        
-        .stButton > button:hover {
-            background: linear-gradient(135deg, #4a5a70 0%, #3d4c5f 50%, #334155 100%);
-            border-color: #64748b;
-            color: #ffffff;
-            transform: translateY(-2px);
-            box-shadow: 0 6px 12px rgba(0, 0, 0, 0.5),
-                        0 2px 4px rgba(0, 0, 0, 0.3),
-                        inset 0 1px 2px rgba(255, 255, 255, 0.15),
-                        inset 0 -2px 4px rgba(0, 0, 0, 0.2);
-        }
-        
-        .stButton > button:active {
-            transform: translateY(0px);
-            box-shadow: 0 2px 4px rgba(0, 0, 0, 0.4),
-                        inset 0 2px 4px rgba(0, 0, 0, 0.3);
-        }
-        
-        .stButton > button:disabled {
-            opacity: 0.35;
-            cursor: not-allowed;
-            background: #1e293b;
-            border-color: #334155;
-            color: #64748b;
-            transform: none;
-        }
-        .step-card-toolbar .stButton > button {
-            height: 42px;
-            width: 42px;
-            padding: 0;
-            justify-content: center;
-            font-size: 1.2rem;
-        }
-
-        .step-card-toolbar .stButton > button:hover {
-            /* สไตล์ตอน hover ยังคงเหมือนเดิม */
-        }
-
-        /* Card Body */
-        .step-body {
-            padding: 0.1rem 1.75rem 0.1rem 1.75rem;
-            background: rgba(15, 23, 42, 0.4);
-            border-top: 1px solid rgba(71, 85, 105, 0.2);
-        }
-
-        /* Arguments Section - Remove top spacing */
-        .args-section-title {
-            font-size: 0.85rem;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.1em;
-            color: #94a3b8;
-            margin-bottom: 1rem;
-            margin-top: 0;
-            display: flex;
-            align-items: center;
-            gap: 0.6rem;
-            padding-bottom: 0.6rem;
-            padding-top: 0;
-            border-bottom: 2px solid rgba(71, 85, 105, 0.3);
-        }
-
-        .args-section-title i {
-            color: #64748b;
-            font-size: 1.1rem;
-        }
-        
-        /* Arguments Grid */
-        .args-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(320px, 1fr));
-            gap: 1rem;
-        }
-        
-        @media (max-width: 768px) {
-            .args-grid {
-                grid-template-columns: 1fr;
-            }
-        }
-        
-        /* Argument Card - Plain style */
-        .arg-card {
-            background: linear-gradient(135deg, rgba(30, 41, 59, 0.6) 0%, rgba(15, 23, 42, 0.6) 100%);
-            border: 1px solid rgba(71, 85, 105, 0.3);
-            border-radius: 10px;
-            padding: 1rem;
-            transition: all 0.3s ease;
-            position: relative;
-            overflow: hidden;
-        }
-
-        .arg-card::before {
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 2px;
-            background: linear-gradient(90deg, #64748b 0%, #475569 100%);
-            opacity: 0;
-            transition: opacity 0.3s ease;
-        }
-
-        .arg-card:hover {
-            border-color: rgba(100, 116, 139, 0.5);
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.3);
-        }
-
-        .arg-card:hover::before {
-            opacity: 0.5;
-        }
-        
-        .arg-label {
-            color: #94a3b8;
-            font-size: 0.75rem;
-            font-weight: 700;
-            text-transform: uppercase;
-            letter-spacing: 0.05em;
-            margin-bottom: 0.6rem;
-            display: flex;
-            align-items: center;
-            gap: 0.4rem;
-        }
-
-        .arg-label::before {
-            content: '●';
-            color: #64748b;
-            font-size: 0.5rem;
-        }
-        
-        .arg-value {
-            color: #e2e8f0;
-            font-size: 0.95rem;
-            font-family: 'SF Mono', 'Monaco', 'Cascadia Code', 'Courier New', monospace;
-            background: rgba(30, 41, 59, 0.5);
-            padding: 0.75rem 0.85rem;
-            border-radius: 8px;
-            border: 1px solid rgba(71, 85, 105, 0.2);
-            word-break: break-word;
-            line-height: 1.5;
-            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.2) inset;
-        }
-        
-        /* No Arguments State */
-        .no-args {
-            text-align: center;
-            padding: 2.5rem 1.5rem;
-            color: #64748b;
-            font-style: italic;
-            font-size: 0.95rem;
-            grid-column: 1 / -1;
-            background: rgba(30, 41, 59, 0.3);
-            border-radius: 10px;
-            border: 2px dashed rgba(71, 85, 105, 0.3);
-        }
-        
-        .no-args i {
-            display: block;
-            font-size: 2.5rem;
-            margin-bottom: 0.75rem;
-            opacity: 0.25;
-            color: #475569;
-        }
-        
-        /* Edit Section - Softer background */
-        .edit-section {
-            padding: 1.5rem 2rem;
-            background: rgba(30, 41, 59, 0.3);
-            border-top: 1px solid rgba(71, 85, 105, 0.3);
-        }
-        
-        /* Keyword Info Box - Softer accent */
-        .keyword-info {
-            background: rgba(30, 41, 59, 0.4);
-            border-left: 3px solid #64748b;
-            padding: 1.25rem;
-            border-radius: 10px;
-            margin-bottom: 1.25rem;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.2);
-        }
-        
-        .keyword-info-title {
-            font-weight: 700;
-            color: #cbd5e1;
-            font-size: 1.05rem;
-            margin-bottom: 0.5rem;
-        }
-
-        /* Responsive adjustments */
-        @media (max-width: 1024px) {
-            .step-card {
-                width: 98%;
-            }
-            
-            .step-header-container {
-                padding: 1rem 1.25rem;
-            }
-            
-            .step-body {
-                padding: 0.5rem 0.5rem;
-            }
-        }
-    </style>
-    """, unsafe_allow_html=True)
-
 def render_step_card(step, index, timeline_key, total_steps):
     """Render enhanced step card with fixes for edit/expand and delete confirmation."""
     ws_state = st.session_state.studio_workspace
@@ -845,7 +432,7 @@ def render_step_card(step, index, timeline_key, total_steps):
                 is_first = (index == 0)
                 button_key_up = f"up_{step_id}"
                 if st.button("⬆️", key=button_key_up, help="Move up", use_container_width=True, disabled=is_first):
-                    ws_state[timeline_key].insert(index - 1, ws_state[timeline_key].pop(index))
+                    test_flow_manager.move_timeline_step(ws_state, timeline_key, index, index - 1)
                     st.rerun()
 
             # === Move Down Button ===
@@ -853,7 +440,7 @@ def render_step_card(step, index, timeline_key, total_steps):
                 is_last = (index == total_steps - 1)
                 button_key_down = f"down_{step_id}"
                 if st.button("⬇️", key=button_key_down, help="Move down", use_container_width=True, disabled=is_last):
-                    ws_state[timeline_key].insert(index + 1, ws_state[timeline_key].pop(index))
+                    test_flow_manager.move_timeline_step(ws_state, timeline_key, index, index + 1)
                     st.rerun()
 
             # === Edit/Save Button - FIXED ===
@@ -881,9 +468,7 @@ def render_step_card(step, index, timeline_key, total_steps):
             with action_cols[4]:
                 button_key_copy = f"copy_{step_id}"
                 if st.button("📋", key=button_key_copy, help="Duplicate", use_container_width=True):
-                    new_step = step.copy()
-                    new_step['id'] = str(uuid.uuid4())
-                    ws_state[timeline_key].insert(index + 1, new_step)
+                    test_flow_manager.duplicate_timeline_step(ws_state, timeline_key, index)
                     st.rerun()
 
             # === Delete Button - WITH CONFIRMATION ===
@@ -892,7 +477,7 @@ def render_step_card(step, index, timeline_key, total_steps):
                     # Show confirm button
                     if st.button("⚠️", key=f"del_confirm_{step_id}", help="Click again to confirm delete", use_container_width=True):
                         # Delete the step
-                        ws_state[timeline_key] = [s for s in ws_state[timeline_key] if s.get('id') != step_id]
+                        test_flow_manager.delete_timeline_step(ws_state, timeline_key, step_id)
                         # Clean up states
                         if edit_mode_key in st.session_state:
                             del st.session_state[edit_mode_key]
@@ -921,7 +506,7 @@ def render_step_card(step, index, timeline_key, total_steps):
             st.markdown("<div class='step-body'>", unsafe_allow_html=True)
             valid_args = {k: v for k, v in step.get('args', {}).items() if v or v is False}
             if valid_args:
-                st.markdown("<div class='args-section-title'><i class='fas fa-cog'></i>Arguments</div>", unsafe_allow_html=True)
+                st.markdown("<div class='args-section-title'><i class='bi bi-gear-fill'></i>Arguments</div>", unsafe_allow_html=True)
                 args_html = "<div class='args-grid'>" + "".join([
                     f"<div class='arg-card'><div class='arg-label'>{k}</div>"
                     f"<div class='arg-value'>{str(v).lower() if isinstance(v, bool) else str(v).replace('<', '&lt;').replace('>', '&gt;')}</div></div>"
@@ -929,18 +514,15 @@ def render_step_card(step, index, timeline_key, total_steps):
                 ]) + "</div>"
                 st.markdown(args_html, unsafe_allow_html=True)
             else:
-                st.markdown("<div class='args-grid'><div class='no-args'><i class='fas fa-inbox'></i>No arguments provided</div></div>", unsafe_allow_html=True)
+                st.markdown("<div class='args-grid'><div class='no-args'><i class='bi bi-inbox'></i>No arguments provided</div></div>", unsafe_allow_html=True)
             st.markdown("</div>", unsafe_allow_html=True)
         else:
             # --- Edit Mode ---
             st.markdown("<div class='edit-section'>", unsafe_allow_html=True)
             
             # Load categorized keywords
-            if 'categorized_keywords' not in ws_state and ws_state.get('keywords'):
-                from .test_flow_manager import categorize_keywords
-                ws_state['categorized_keywords'] = categorize_keywords(ws_state['keywords'])
-            
-            categorized_keywords = ws_state.get('categorized_keywords', {})
+            from .keyword_categorizer import get_keyword_library
+            categorized_keywords = get_keyword_library(ws_state).categorized
             all_kws = [kw for kws in categorized_keywords.values() for kw in kws]
             all_kw_names = [kw['name'] for kw in all_kws]
             
@@ -999,11 +581,10 @@ def render_step_card(step, index, timeline_key, total_steps):
             # === Save Button ===
             with col1:
                 if st.button("✅ Save Changes", key=f"save_action_{step_id}", use_container_width=True, type="primary"):
-                    for i_save, s_save in enumerate(ws_state[timeline_key]):
-                        if s_save.get('id') == step_id:
-                            ws_state[timeline_key][i_save]['keyword'] = selected_kw_name
-                            ws_state[timeline_key][i_save]['args'] = st.session_state.get(temp_args_key, {}).copy()
-                            break
+                    test_flow_manager.update_timeline_step(
+                        ws_state, timeline_key, step_id,
+                        selected_kw_name, st.session_state.get(temp_args_key, {}).copy()
+                    )
                     st.session_state[edit_mode_key] = False
                     if temp_args_key in st.session_state:
                         del st.session_state[temp_args_key]
@@ -1041,8 +622,11 @@ def render_timeline_section(title, timeline_key, section_name):
         else:
             st.markdown("<div class='card-wrapper'>", unsafe_allow_html=True)
             
-            for i, step in enumerate(timeline):
-                render_step_card(step, i, timeline_key, len(timeline))
+            render_step_window(
+                timeline,
+                lambda step, i: render_step_card(step, i, timeline_key, len(timeline)),
+                timeline_key
+            )
             
             st.markdown("</div>", unsafe_allow_html=True)
 
@@ -1062,7 +646,7 @@ def render_add_step_dialog():
 
     # Define the callback function for adding steps in Test Flow
     def add_step_to_timeline(context_timeline_key, new_step):
-        ws_state.setdefault(context_timeline_key, []).append(new_step)
+        test_flow_manager.add_timeline_step(ws_state, context_timeline_key, new_step)
 
     # Call the base function with Test Flow specific parameters
     render_add_step_dialog_base(
@@ -1187,13 +771,17 @@ def generate_full_script(ws_state):
     return "\n".join(final_script_parts)
 
 def render_test_flow_tab():
-    inject_test_flow_css()
+    inject_styles('test_flow')
     ws_state = st.session_state.studio_workspace
 
     left_col, right_col = st.columns([0.6, 0.4], gap="large")
 
     with left_col:
         st.markdown("<h4 style='font-size: 1.6rem;'>📈 Test Flow Builder</h4>", unsafe_allow_html=True)
+        render_undo_redo_controls(
+            get_workspace_history('studio_workspace'),
+            lambda: test_flow_manager.undo(ws_state), lambda: test_flow_manager.redo(ws_state), "test_flow"
+        )
         render_timeline_section("🛠️ Setup", "suite_setup", "Setup")
         render_timeline_section("▶️ Test Case", "timeline", "Test Case")
         render_timeline_section("🧹 Teardown", "suite_teardown", "Teardown")
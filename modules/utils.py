@@ -7,6 +7,8 @@ This module should NOT import streamlit.
 import re
 import os
 import csv
+from collections import namedtuple
+from functools import lru_cache
 from pathlib import Path
 
 # ===================================================================
@@ -350,6 +352,8 @@ def format_robot_step_line(step):
         fixed_args = {}
         col_args = {}
         for k, v in args.items():
+            if k == 'assertion_columns':
+                continue
             if k.startswith(('col.', 'assert.', 'expected.')):
                 col_args[k] = v
             else:
@@ -368,8 +372,12 @@ def format_robot_step_line(step):
                   # Append arg=value
                   first_line_parts.append(f"{robot_name}={final_formatted_value}")
 
-        column_lines = []
-        # ... (rest of Verify Result logic formatting col_args) ...
+        column_args = build_table_assertion_args(args.get('assertion_columns', []))
+        column_args += [f"{k}={_format_value_for_robot(v) or '${EMPTY}'}" for k, v in col_args.items()]
+        column_lines = [
+            f"...{kw_padding}{kw_padding.join(column_args[i:i + 3])}"
+            for i in range(0, len(column_args), 3)
+        ]
         final_output = kw_padding.join(first_line_parts)
         if column_lines:
             final_output += "\n" + "\n".join([f"{kw_padding}{line}" for line in column_lines])
@@ -482,6 +490,112 @@ def format_robot_step_line(step):
 # --- END: MODIFIED ---
 
 
+# --- Control-flow block structure (IF / ELSE IF / ELSE / END) ---
+_BLOCK_OPEN, _BLOCK_BRANCH, _BLOCK_ELSE, _BLOCK_END = 1, 2, 3, 4
+CONTROL_FLOW_KINDS = {
+    'IF Condition': _BLOCK_OPEN,
+    'ELSE IF Condition': _BLOCK_BRANCH,
+    'ELSE': _BLOCK_ELSE,
+    'END': _BLOCK_END,
+}
+
+# depths:   indent level of each step (IF / ELSE / END sit at the level of their block)
+# blocks:   (if index, (branch indexes...), end index or None) per IF block
+# problems: (step index, message) for unbalanced or misplaced markers
+BlockPlan = namedtuple('BlockPlan', ['depths', 'blocks', 'problems'])
+
+@lru_cache(maxsize=128)
+def _plan_block_kinds(kinds):
+    depths = []
+    blocks = []
+    problems = []
+    open_blocks = []    # [if index, [branch indexes], has ELSE]
+    for i, kind in enumerate(kinds):
+        depth = len(open_blocks)
+        if kind == _BLOCK_OPEN:
+            open_blocks.append([i, [], False])
+        elif kind in (_BLOCK_BRANCH, _BLOCK_ELSE):
+            if not open_blocks:
+                problems.append((i, "ELSE without a matching IF"))
+            else:
+                depth -= 1
+                block = open_blocks[-1]
+                if block[2]:
+                    problems.append((i, "Branch after ELSE"))
+                block[1].append(i)
+                block[2] = block[2] or kind == _BLOCK_ELSE
+        elif kind == _BLOCK_END:
+            if not open_blocks:
+                problems.append((i, "END without a matching IF"))
+            else:
+                depth -= 1
+                start, branches, _ = open_blocks.pop()
+                blocks.append((start, tuple(branches), i))
+        depths.append(depth)
+    for start, branches, _ in open_blocks:
+        problems.append((start, "IF is missing its END"))
+        blocks.append((start, tuple(branches), None))
+    blocks.sort()
+    return BlockPlan(tuple(depths), tuple(blocks), tuple(problems))
+
+def plan_control_flow(steps):
+    """
+    Block structure of a step list. Only the sequence of control-flow markers
+    matters, so the plan is memoized on it and shared by every keyword (and
+    rerun) with the same structure; editing ordinary steps never re-plans.
+    """
+    kinds = tuple(CONTROL_FLOW_KINDS.get(step.get('keyword'), 0) for step in steps or ())
+    return _plan_block_kinds(kinds)
+
+
+# --- Table verification ('Verify Result of data table') column block ---
+TABLE_ASSERTION_OPERATORS = ['equal', 'should be', 'contains', 'not contains', 'inequal']
+
+def build_table_assertion_args(assertion_columns):
+    """
+    Builds the col./assert./expected. argument triples for 'Verify Result of data table'.
+
+    Args:
+        assertion_columns (list): [{'header_name': ..., 'assertion': ..., 'expected_value': ...}]
+
+    Returns:
+        list: ['col.H=H', 'assert.H=equal', 'expected.H=...', ...] (3 entries per column)
+    """
+    if not assertion_columns:
+        return []
+    column_rows = tuple(
+        (str(col.get('header_name') or ''), str(col.get('assertion') or 'equal'), str(col.get('expected_value') or ''))
+        for col in assertion_columns
+    )
+    return list(_build_table_assertion_block(column_rows))
+
+@lru_cache(maxsize=512)
+def _build_table_assertion_block(column_rows):
+    """
+    Cached builder (one cache entry per distinct column table, i.e. per step).
+    Rows are (header, assertion, expected) tuples; a plain loop is cheapest even cold.
+    """
+    block = []
+    for header, assertion, expected in column_rows:
+        if header:
+            block.append(f"col.{header}={header}")
+            block.append(f"assert.{header}={assertion}")
+            block.append(f"expected.{header}={expected or '${EMPTY}'}")
+    return tuple(block)
+
+def parse_table_header_row(header_row):
+    """
+    Parses a pasted CSV header row (comma or tab separated, quotes allowed)
+    into a de-duplicated list of column names.
+    """
+    if not header_row or not header_row.strip():
+        return []
+    first_line = header_row.strip().splitlines()[0]
+    delimiter = '\t' if '\t' in first_line else ','
+    cells = next(csv.reader([first_line], delimiter=delimiter), [])
+    return list(dict.fromkeys(c.strip() for c in cells if c.strip()))
+
+
 # --- START: MODIFIED (Lowercase bools) ---
 # --- [HELPER] Function for formatting values ---
 def _format_value_for_robot(value):
@@ -642,6 +756,38 @@ def util_get_csv_headers(project_path, csv_filename):
         print(f"Error reading CSV headers from {csv_filename}: {e}")
         return []
 
+def util_iter_csv_rows(project_path, csv_filename):
+    """
+    Streams rows (header first) from a CSV file in the datatest folder.
+    Rows are read lazily through csv.reader, so memory stays bounded
+    regardless of file size.
+
+    Args:
+        project_path (str): The absolute project path
+        csv_filename (str): Name of the CSV file (e.g., 'login_data.csv')
+
+    Yields:
+        list: One list of cell strings per CSV row
+    """
+    if not project_path or not csv_filename:
+        return
+
+    csv_path = os.path.join(
+        project_path,
+        'resources',
+        'datatest',
+        csv_filename
+    )
+
+    if not os.path.exists(csv_path):
+        return
+
+    try:
+        with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+            yield from csv.reader(f)
+    except Exception as e:
+        print(f"Error streaming CSV rows from {csv_filename}: {e}")
+
 def scan_steps_for_variables(steps):
     """
     Scans a list of step dictionaries and extracts potential Robot Framework
@@ -787,19 +933,22 @@ def convert_json_path_to_robot_accessor(json_path):
 # ===== 7. Additional Keyword Factory Utilities (New Section)
 # ===================================================================
 
-def check_argument_usage(steps, arg_name):
+def check_argument_usage(steps, arg_name, index=None):
     """
     Checks if a specific Robot Framework variable is used within the arguments of any step.
 
     Args:
         steps (list): A list of step dictionaries.
         arg_name (str): The variable name to check (e.g., "${username}").
+        index (ArgumentIndex, optional): An index synced with these steps; makes the check a lookup.
 
     Returns:
         bool: True if the variable is found in any step's argument values, False otherwise.
     """
     if not isinstance(steps, list) or not arg_name:
         return False
+    if index is not None:
+        return index.is_used(arg_name)
 
     # Create a regex pattern to find the exact variable, potentially surrounded by other text
     # Need to escape special characters in the variable name itself for the regex
@@ -820,16 +969,19 @@ def check_argument_usage(steps, arg_name):
     return False # Not found in any step
 
 # --- Function to help with Rename Refactoring ---
-def rename_argument_in_steps(steps, old_arg_name, new_arg_name):
+def rename_argument_in_steps(steps, old_arg_name, new_arg_name, index=None):
     """
     Creates a *new* list of steps with occurrences of an old argument name
     replaced with a new argument name within step argument values.
-    This performs a simple string replacement.
+    This performs a simple string replacement. Unchanged steps are shared
+    with the original list; changed steps get new step and args dicts.
 
     Args:
         steps (list): The original list of step dictionaries.
         old_arg_name (str): The old variable name (e.g., "${old_user}").
         new_arg_name (str): The new variable name (e.g., "${username}").
+        index (ArgumentIndex, optional): An index synced with these steps; only the
+              steps it lists for old_arg_name are visited.
 
     Returns:
         list: A new list of step dictionaries with replacements made.
@@ -838,25 +990,126 @@ def rename_argument_in_steps(steps, old_arg_name, new_arg_name):
     if not isinstance(steps, list) or not old_arg_name or not new_arg_name or old_arg_name == new_arg_name:
         return steps # Return original list if inputs invalid or no change
 
-    import copy # Use deepcopy to avoid modifying original step dictionaries indirectly
-    new_steps = copy.deepcopy(steps) # Work on a copy
+    if index is not None:
+        renamed = index.renamed_step_args(steps, old_arg_name, new_arg_name)
+        if not renamed:
+            return steps
+        new_steps = list(steps)
+        for position, step, new_args in renamed:
+            new_steps[position] = {**step, 'args': new_args}
+        return new_steps
+
+    # Copy-on-write: only steps whose args change are copied, the rest are shared
+    new_steps = []
     changed = False
 
-    for step in new_steps:
-        args_dict = step.get('args') # No need for default, deepcopy handled it
-        if not isinstance(args_dict, dict):
-            continue
-
-        for arg_key, arg_value in args_dict.items():
-            if isinstance(arg_value, str) and old_arg_name in arg_value:
-                # Simple string replacement
-                args_dict[arg_key] = arg_value.replace(old_arg_name, new_arg_name)
+    for step in steps:
+        args_dict = step.get('args')
+        if isinstance(args_dict, dict):
+            renamed = {
+                arg_key: arg_value.replace(old_arg_name, new_arg_name)
+                for arg_key, arg_value in args_dict.items()
+                if isinstance(arg_value, str) and old_arg_name in arg_value
+            }
+            if renamed:
+                step = {**step, 'args': {**args_dict, **renamed}}
                 changed = True
+        new_steps.append(step)
 
     # Return the new list only if changes were actually made
     return new_steps if changed else steps
 
 
+# --- Inverted index of argument usage (Keyword Factory editor) ---
+_STEP_VARIABLE_PATTERN = re.compile(r'([$@&]\{[^{}]+\})')
+
+class ArgumentIndex:
+    """
+    Maps each variable used in step arguments to the (step key, arg key) pairs
+    that use it. sync() re-parses only steps whose args changed since the last
+    call, so usage checks and rename lookups do not rescan every step.
+    A step key is the step 'id' (its position for steps without one).
+    Step edits replace the args dict (copy-on-write), so a changed step is
+    detected by identity.
+    """
+
+    def __init__(self):
+        self._steps = {}    # step key -> (args dict, arg count, {arg key: set of variables})
+        self._usages = {}   # variable -> set of (step key, arg key)
+
+    @staticmethod
+    def _step_key(step, position):
+        return step.get('id') or position
+
+    def _unlink(self, step_key, found):
+        for arg_key, names in found.items():
+            for name in names:
+                refs = self._usages.get(name)
+                if refs is not None:
+                    refs.discard((step_key, arg_key))
+                    if not refs:
+                        del self._usages[name]
+
+    def sync(self, steps):
+        """Brings the index up to date with steps; returns self."""
+        seen = set()
+        for position, step in enumerate(steps if isinstance(steps, list) else []):
+            step_key = self._step_key(step, position)
+            seen.add(step_key)
+            args = step.get('args')
+            if not isinstance(args, dict):
+                args = {}
+            cached = self._steps.get(step_key)
+            if cached is not None and cached[0] is args and cached[1] == len(args):
+                continue
+            if cached is not None:
+                self._unlink(step_key, cached[2])
+            found = {}
+            for arg_key, arg_value in args.items():
+                if isinstance(arg_value, str) and '{' in arg_value:
+                    names = set(_STEP_VARIABLE_PATTERN.findall(arg_value))
+                    if names:
+                        found[arg_key] = names
+                        for name in names:
+                            self._usages.setdefault(name, set()).add((step_key, arg_key))
+            self._steps[step_key] = (args, len(args), found)
+
+        for step_key in [k for k in self._steps if k not in seen]:
+            self._unlink(step_key, self._steps.pop(step_key)[2])
+        return self
+
+    def is_used(self, name):
+        return name in self._usages
+
+    def usages(self, name):
+        """Set of (step key, arg key) pairs whose value contains the variable."""
+        return frozenset(self._usages.get(name, ()))
+
+    def variables(self):
+        """Same result as scan_steps_for_variables() for the synced steps."""
+        return sorted(name for name in self._usages if len(name) > 3 and name != '${EMPTY}')
+
+    def renamed_step_args(self, steps, old_name, new_name):
+        """
+        Returns [(position, step, new_args)] for the steps that use old_name,
+        with old_name replaced in the affected argument values.
+        """
+        touched = {}
+        for step_key, arg_key in self._usages.get(old_name, ()):
+            touched.setdefault(step_key, []).append(arg_key)
+        if not touched or old_name == new_name:
+            return []
+
+        renamed = []
+        for position, step in enumerate(steps):
+            arg_keys = touched.get(self._step_key(step, position))
+            if arg_keys:
+                args = step['args']
+                new_args = {**args, **{k: args[k].replace(old_name, new_name) for k in arg_keys}}
+                renamed.append((position, step, new_args))
+        return renamed
+
+
 # --- Function to help with Documentation Generation ---
 def generate_basic_docstring(keyword_name, args_list, steps):
     """
@@ -917,6 +1170,10 @@ def generate_basic_docstring(keyword_name, args_list, steps):
     # We return a single string with newlines for easy use in st.text_area
     return "\n".join(doc_lines[1:]) # Return starting from [Documentation] line
 
+def normalize_keyword_name(name):
+    """Robot Framework matches keyword names ignoring case, spaces and underscores."""
+    return re.sub(r'[\s_]+', '', name or '').casefold()
+
 # --- Function to check if keyword exists in content ---
 def keyword_exists_in_content(file_content, keyword_name):
     """
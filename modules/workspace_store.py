@@ -0,0 +1,206 @@
+# modules/workspace_store.py
+"""
+Workspace Persistence
+Saves the studio / CRUD / Keyword Factory workspaces to a compact binary archive
+and restores them.
+
+Archive layout (.rfws):
+    b'RFWS' | version (1 byte) | codec (1 byte) | header length (4 bytes, big endian)
+    | header (JSON) | zlib-compressed section blobs
+
+The header maps workspace -> top-level key -> (offset, length), so the saved
+workspaces can be listed without decoding any section and a restore decodes
+only the workspaces it selects (each one in full). Sections are encoded with
+msgpack when it is installed, otherwise with JSON.
+This module should NOT import streamlit.
+"""
+import io
+import json
+import os
+import struct
+import zlib
+from datetime import datetime
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+ARCHIVE_MAGIC = b'RFWS'
+ARCHIVE_VERSION = 1
+ARCHIVE_EXTENSION = '.rfws'
+CODEC_MSGPACK = b'M'
+CODEC_JSON = b'J'
+COMPRESSION_LEVEL = 1   # Favour speed: workspaces are mostly repetitive text
+
+PERSISTED_WORKSPACES = ('studio_workspace', 'crud_generator_workspace', 'keyword_factory_workspace')
+
+# Derived or runtime-only entries that are rebuilt after a restore
+TRANSIENT_KEYS = {'keyword_library', 'csv_uploaded_file'}
+
+_DATAFRAME_TAG = '__dataframe__'
+
+# ===================================================================
+# ===== 1. Value Conversion
+# ===================================================================
+
+def _is_dataframe(value):
+    return hasattr(value, 'to_dict') and hasattr(value, 'columns')
+
+def _default(value):
+    """Encoder fallback for non-native values: sets become lists, runtime objects become None."""
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return None
+
+def _section_to_plain(value):
+    """A pandas DataFrame section (e.g. the CSV creator buffer) is stored in 'split' form."""
+    if _is_dataframe(value):
+        split = value.to_dict(orient='split')
+        return {_DATAFRAME_TAG: {'columns': list(split['columns']), 'data': split['data']}}
+    return value
+
+def _section_from_plain(value):
+    if isinstance(value, dict) and len(value) == 1 and _DATAFRAME_TAG in value:
+        import pandas as pd
+        frame = value[_DATAFRAME_TAG]
+        return pd.DataFrame(frame['data'], columns=frame['columns'])
+    return value
+
+def _encode(value, codec):
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(value, use_bin_type=True, default=_default)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+def _decode(data, codec):
+    if codec == CODEC_MSGPACK:
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("This workspace archive needs 'msgpack' (pip install msgpack).")
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    return json.loads(data.decode('utf-8'))
+
+# ===================================================================
+# ===== 2. Binary Archive
+# ===================================================================
+
+def save_workspaces(file_path, workspaces):
+    """
+    Writes {workspace_name: workspace_dict} to file_path (atomically).
+
+    Returns:
+        int: Size of the archive in bytes.
+    """
+    codec = CODEC_MSGPACK if MSGPACK_AVAILABLE else CODEC_JSON
+    toc = {}
+    body = io.BytesIO()
+    for name, ws in workspaces.items():
+        sections = toc[name] = {}
+        for key, value in (ws or {}).items():
+            if key in TRANSIENT_KEYS:
+                continue
+            blob = zlib.compress(_encode(_section_to_plain(value), codec), COMPRESSION_LEVEL)
+            sections[key] = [body.tell(), len(blob)]
+            body.write(blob)
+
+    header = json.dumps({
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'workspaces': toc,
+    }, ensure_ascii=False).encode('utf-8')
+
+    folder = os.path.dirname(file_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(ARCHIVE_MAGIC + bytes([ARCHIVE_VERSION]) + codec + struct.pack('>I', len(header)))
+        f.write(header)
+        f.write(body.getbuffer())
+        size = f.tell()
+    os.replace(tmp_path, file_path)
+    return size
+
+
+class WorkspaceArchive:
+    """Read side of an .rfws archive; only the header is parsed on open."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = open(file_path, 'rb')
+        try:
+            preamble = self._file.read(10)
+            if len(preamble) < 10 or preamble[:4] != ARCHIVE_MAGIC:
+                raise ValueError(f"'{os.path.basename(file_path)}' is not a workspace archive.")
+            if preamble[4] > ARCHIVE_VERSION:
+                raise ValueError("Workspace archive was written by a newer version.")
+            self.codec = preamble[5:6]
+            header_len = struct.unpack('>I', preamble[6:10])[0]
+            header = json.loads(self._file.read(header_len).decode('utf-8'))
+        except Exception:
+            self._file.close()
+            raise
+        self.created = header.get('created')
+        self.toc = header.get('workspaces', {})
+        self._data_start = 10 + header_len
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def workspace_names(self):
+        return list(self.toc)
+
+    def read_section(self, name, key):
+        offset, length = self.toc[name][key]
+        self._file.seek(self._data_start + offset)
+        return _section_from_plain(_decode(zlib.decompress(self._file.read(length)), self.codec))
+
+    def read_workspace(self, name):
+        """Decodes every section of one workspace."""
+        return {key: self.read_section(name, key) for key in self.toc.get(name, {})}
+
+
+def load_workspaces(file_path, names=None):
+    """Returns {workspace_name: workspace_dict} for the requested (default: all) workspaces."""
+    with WorkspaceArchive(file_path) as archive:
+        names = archive.workspace_names() if names is None else [n for n in names if n in archive.toc]
+        return {name: archive.read_workspace(name) for name in names}
+
+# ===================================================================
+# ===== 3. JSON Export / Import
+# ===================================================================
+
+def export_workspaces_json(workspaces):
+    """Human-readable export of the same data the archive stores."""
+    payload = {
+        name: {k: _section_to_plain(v) for k, v in (ws or {}).items() if k not in TRANSIENT_KEYS}
+        for name, ws in workspaces.items()
+    }
+    return json.dumps({'format': 'rfws-json', 'version': ARCHIVE_VERSION, 'workspaces': payload},
+                      ensure_ascii=False, indent=1, default=_default)
+
+def import_workspaces_json(text):
+    """
+    Parses an export_workspaces_json() document.
+
+    Raises:
+        ValueError: The text is not a workspace export (json.JSONDecodeError is a ValueError).
+    """
+    data = json.loads(text)
+    if not isinstance(data, dict) or data.get('format') != 'rfws-json':
+        raise ValueError("Not a workspace JSON export.")
+    workspaces = data.get('workspaces', {})
+    if not isinstance(workspaces, dict):
+        raise ValueError("'workspaces' must be an object of workspace name -> workspace.")
+    for name, ws in workspaces.items():
+        if not isinstance(ws, dict):
+            raise ValueError(f"Workspace '{name}' must be an object, got {type(ws).__name__}.")
+    return {
+        name: {k: _section_from_plain(v) for k, v in ws.items()}
+        for name, ws in workspaces.items()
+    }